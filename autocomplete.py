@@ -0,0 +1,86 @@
+# autocomplete.py
+
+from tkinter import ttk
+
+from search_index import SearchIndex
+
+MAX_SHOWN = 50  # entries in the dropdown; type to narrow it down
+_NAVIGATION_KEYS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'Left', 'Right', 'Home', 'End',
+                    'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R'}
+
+
+def label(key, name):
+    return f"{name} ({key})"
+
+
+class AutocompleteCombobox(ttk.Combobox):
+    """
+    Combobox over (id, name) rows that only ever holds max_shown entries: the first rows, or
+    the rows with a word starting with each typed term (a SearchIndex, built on first use).
+    Selections map back to ids through a dictionary; get_id() is None unless the text is
+    exactly one of the entries.
+    """
+
+    def __init__(self, master, max_shown=MAX_SHOWN, **kw):
+        super().__init__(master, postcommand=self._refill, **kw)
+        self.max_shown = max_shown
+        self._rows = []
+        self._ids = {}      # label -> id
+        self._labels = {}   # str(id) -> label
+        self._index = None
+        self.bind("<KeyRelease>", self._on_key, add='+')
+        self.bind("<Return>", lambda e: self._accept(), add='+')
+        self.bind("<KP_Enter>", lambda e: self._accept(), add='+')
+
+    def set_rows(self, rows):
+        """Replaces the choices with rows of (id, name, ...) in display order; the selection is kept if still a choice."""
+        selected = self.get_id()
+        self._rows = rows
+        self._ids = {}
+        self._labels = {}
+        for r in rows:
+            text = label(r[0], r[1])
+            self._ids[text] = r[0]
+            self._labels[str(r[0])] = text
+        self._index = None
+        self['values'] = [label(r[0], r[1]) for r in rows[:self.max_shown]]
+        if selected is None or not self.set_id(selected):
+            self.set('')
+
+    def get_id(self):
+        return self._ids.get(self.get())
+
+    def set_id(self, key):
+        """Shows the entry for key; returns False (and clears the text) if key is not a choice."""
+        text = self._labels.get(str(key), '')
+        self.set(text)
+        return bool(text)
+
+    def select_first(self):
+        if self._rows:
+            self.set(label(self._rows[0][0], self._rows[0][1]))
+
+    def matches(self, text):
+        """Labels of up to max_shown rows matching text; the first rows when text is empty or a full entry."""
+        if not text.strip() or text in self._ids:
+            return [label(r[0], r[1]) for r in self._rows[:self.max_shown]]
+        if self._index is None:
+            self._index = SearchIndex(self._rows)
+        return [self._labels[str(key)] for key in self._index.search(text, self.max_shown)]
+
+    def _refill(self):
+        self['values'] = self.matches(self.get())
+
+    def _on_key(self, event):
+        if event.keysym not in _NAVIGATION_KEYS:
+            self._refill()
+
+    def _accept(self):
+        # Enter on a partial text picks the best match, as if it had been chosen from the list
+        if self.get() in self._ids:
+            return
+        found = self.matches(self.get())
+        if found:
+            self.set(found[0])
+            self.icursor('end')
+            self.event_generate("<<ComboboxSelected>>")
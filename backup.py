@@ -0,0 +1,360 @@
+# backup.py
+
+import configparser
+import datetime
+import decimal
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import mysql.connector
+
+try:
+    import zstandard
+except ImportError:  # zstd output is optional; gzip is always available
+    zstandard = None
+
+DEFAULT_WORKERS = 4
+FETCH_SIZE = 1000
+MAX_STATEMENT_BYTES = 1024 * 1024  # split extended INSERTs like mysqldump's net_buffer_length
+EXTENSIONS = {'gzip': '.sql.gz', 'zstd': '.sql.zst', 'none': '.sql'}
+
+_ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r', '\0': '\\0', '\x1a': '\\Z'})
+
+HEADER = """CREATE DATABASE  IF NOT EXISTS `{db}` /*!40100 DEFAULT CHARACTER SET {charset} COLLATE {collation} */;
+USE `{db}`;
+-- Schedule Plus backup
+--
+-- Host: {host}    Database: {db}
+-- ------------------------------------------------------
+-- Server version\t{version}
+
+/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;
+/*!40101 SET @OLD_CHARACTER_SET_RESULTS=@@CHARACTER_SET_RESULTS */;
+/*!40101 SET @OLD_COLLATION_CONNECTION=@@COLLATION_CONNECTION */;
+/*!50503 SET NAMES utf8mb4 */;
+/*!40103 SET @OLD_TIME_ZONE=@@TIME_ZONE */;
+/*!40103 SET TIME_ZONE='+00:00' */;
+/*!40014 SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0 */;
+/*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;
+/*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
+/*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
+"""
+
+FOOTER = """/*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
+
+/*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
+/*!40014 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS */;
+/*!40014 SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS */;
+/*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
+/*!40101 SET CHARACTER_SET_RESULTS=@OLD_CHARACTER_SET_RESULTS */;
+/*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
+/*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
+
+-- Dump completed on {finished}
+"""
+
+
+def sql_literal(value):
+    """Formats a Python value returned by mysql.connector as a MySQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + value.hex() if value else "''"
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time, datetime.timedelta)):
+        return f"'{value}'"
+    if isinstance(value, set):
+        value = ",".join(sorted(value))
+    return "'" + str(value).translate(_ESCAPES) + "'"
+
+
+def load_backup_settings(config_file='config.ini'):
+    """Reads the optional [backup] section of config.ini (compression, workers)."""
+    cfg = configparser.ConfigParser()
+    if os.path.exists(config_file):
+        cfg.read(config_file)
+    sec = cfg['backup'] if 'backup' in cfg else {}
+    return {
+        'compression': sec.get('compression', 'gzip'),
+        'workers': int(sec.get('workers', DEFAULT_WORKERS)),
+    }
+
+
+def open_dump_file(path, compression):
+    """Opens a text stream that compresses as it is written."""
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd backups need the zstandard package (pip install zstandard)")
+        raw = open(path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(raw), encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+class BackupProgress:
+    """Counters shared by the worker threads; snapshot() is safe to call from the Tk thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.rows_total = 0
+        self.rows_done = 0
+        self.bytes_written = 0
+        self.tables_total = 0
+        self.tables_done = 0
+        self.current = set()
+
+    def table_started(self, table):
+        with self._lock:
+            self.current.add(table)
+
+    def table_finished(self, table):
+        with self._lock:
+            self.current.discard(table)
+            self.tables_done += 1
+
+    def add(self, rows=0, nbytes=0):
+        with self._lock:
+            self.rows_done += rows
+            self.bytes_written += nbytes
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            return {
+                'rows_done': self.rows_done,
+                'rows_total': max(self.rows_total, self.rows_done),
+                'tables_done': self.tables_done,
+                'tables_total': self.tables_total,
+                'current': sorted(self.current),
+                'elapsed': elapsed,
+                'mb_per_sec': self.bytes_written / elapsed / (1024 * 1024),
+                'rows_per_sec': self.rows_done / elapsed,
+            }
+
+
+class DatabaseBackup:
+    """
+    Dumps every table of the configured database to Dump<YYYYMMDD>/<db>_<table>.sql.gz,
+    the same one-file-per-table layout as the Data/Dump* folders but compressed.
+
+    Tables are dumped in parallel, one connection per worker. All workers open their
+    transactions WITH CONSISTENT SNAPSHOT while a brief FLUSH TABLES WITH READ LOCK is
+    held, so every file reflects the same instant. Without the RELOAD privilege the lock
+    is skipped and each table is still read from its own consistent snapshot.
+    """
+
+    def __init__(self, db_config, target_dir, compression='gzip', workers=DEFAULT_WORKERS):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression '{compression}'")
+        self.db_config = db_config
+        self.target_dir = target_dir
+        self.compression = compression
+        self.workers = workers
+        self.progress = BackupProgress()
+        self.dump_dir = None
+        self.globally_consistent = False
+        self._cancelled = threading.Event()
+        self._errors = []
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        """Performs the backup on the calling thread and returns the dump directory."""
+        stamp = datetime.datetime.now()
+        self.dump_dir = os.path.join(self.target_dir, f"Dump{stamp:%Y%m%d}")
+        if os.path.exists(self.dump_dir):
+            self.dump_dir += f"-{stamp:%H%M%S}"
+        os.makedirs(self.dump_dir)
+        coordinator = mysql.connector.connect(**self.db_config)
+        conns = []
+        try:
+            cur = coordinator.cursor(buffered=True)
+            tables, info = self._inspect(cur)
+            self.progress.tables_total = len(tables)
+            self.progress.rows_total = sum(t[1] for t in tables)
+
+            conns = [mysql.connector.connect(**self.db_config) for _ in range(min(self.workers, len(tables)) or 1)]
+            try:
+                cur.execute("FLUSH TABLES WITH READ LOCK")
+                self.globally_consistent = True
+            except mysql.connector.Error:
+                self.globally_consistent = False
+            try:
+                for conn in conns:
+                    conn.start_transaction(consistent_snapshot=True, isolation_level='REPEATABLE READ', readonly=True)
+            finally:
+                if self.globally_consistent:
+                    cur.execute("UNLOCK TABLES")
+
+            jobs = queue.Queue()
+            for name, _ in sorted(tables, key=lambda t: -t[1]):  # biggest first keeps the workers balanced
+                jobs.put(name)
+            threads = [threading.Thread(target=self._worker, args=(conn, jobs, info), daemon=True,
+                                        name=f"backup-worker-{n}") for n, conn in enumerate(conns)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if self._errors:
+                raise self._errors[0]
+            if self._cancelled.is_set():
+                raise RuntimeError("Backup cancelled")
+            return self.dump_dir
+        except BaseException:
+            shutil.rmtree(self.dump_dir, ignore_errors=True)
+            raise
+        finally:
+            for conn in conns + [coordinator]:
+                try:
+                    conn.close()
+                except mysql.connector.Error:
+                    pass
+
+    def _inspect(self, cur):
+        db = self.db_config['database']
+        cur.execute("SELECT TABLE_NAME, COALESCE(TABLE_ROWS, 0) FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA=%s AND TABLE_TYPE='BASE TABLE'", (db,))
+        tables = [(r[0], int(r[1])) for r in cur.fetchall()]
+        cur.execute("SELECT DEFAULT_CHARACTER_SET_NAME, DEFAULT_COLLATION_NAME FROM information_schema.SCHEMATA "
+                    "WHERE SCHEMA_NAME=%s", (db,))
+        charset, collation = cur.fetchone() or ('utf8mb4', 'utf8mb4_0900_ai_ci')
+        cur.execute("SELECT VERSION()")
+        info = {'db': db, 'host': self.db_config.get('host', ''), 'version': cur.fetchone()[0],
+                'charset': charset, 'collation': collation}
+        return tables, info
+
+    def _worker(self, conn, jobs, info):
+        while not self._cancelled.is_set():
+            try:
+                table = jobs.get_nowait()
+            except queue.Empty:
+                return
+            self.progress.table_started(table)
+            try:
+                self._dump_table(conn, table, info)
+            except BaseException as e:
+                self._errors.append(e)
+                self._cancelled.set()
+                return
+            self.progress.table_finished(table)
+
+    def _dump_table(self, conn, table, info):
+        path = os.path.join(self.dump_dir, f"{info['db']}_{table}{EXTENSIONS[self.compression]}")
+        meta = conn.cursor(buffered=True)
+        meta.execute(f"SHOW CREATE TABLE `{table}`")
+        create = meta.fetchone()[1]
+        meta.execute("SHOW TRIGGERS WHERE `Table`=%s", (table,))
+        triggers = [r[0] for r in meta.fetchall()]
+        trigger_ddl = []
+        for name in triggers:
+            meta.execute(f"SHOW CREATE TRIGGER `{name}`")
+            trigger_ddl.append(meta.fetchone()[2])
+        meta.close()
+
+        with open_dump_file(path + ".part", self.compression) as out:
+            def write(text):
+                out.write(text)
+                self.progress.add(nbytes=len(text))
+
+            write(HEADER.format(**info))
+            write(f"\n--\n-- Table structure for table `{table}`\n--\n\n")
+            write(f"DROP TABLE IF EXISTS `{table}`;\n")
+            write("/*!40101 SET @saved_cs_client     = @@character_set_client */;\n")
+            write("/*!50503 SET character_set_client = utf8mb4 */;\n")
+            write(create + ";\n")
+            write("/*!40101 SET character_set_client = @saved_cs_client */;\n")
+            write(f"\n--\n-- Dumping data for table `{table}`\n--\n\n")
+            write(f"LOCK TABLES `{table}` WRITE;\n")
+            write(f"/*!40000 ALTER TABLE `{table}` DISABLE KEYS */;\n")
+
+            cur = conn.cursor()  # unbuffered: rows stream off the socket FETCH_SIZE at a time
+            cur.execute(f"SELECT * FROM `{table}`")
+            prefix = f"INSERT INTO `{table}` VALUES "
+            statement, size = [], 0
+            while True:
+                rows = cur.fetchmany(FETCH_SIZE)
+                if not rows or self._cancelled.is_set():
+                    break
+                for row in rows:
+                    values = "(" + ",".join(sql_literal(v) for v in row) + ")"
+                    if statement and size + len(values) > MAX_STATEMENT_BYTES:
+                        write(prefix + ",".join(statement) + ";\n")
+                        statement, size = [], 0
+                    statement.append(values)
+                    size += len(values) + 1
+                self.progress.add(rows=len(rows))
+            if self._cancelled.is_set():
+                cur.fetchall()
+                cur.close()
+                return
+            cur.close()
+            if statement:
+                write(prefix + ",".join(statement) + ";\n")
+            write(f"/*!40000 ALTER TABLE `{table}` ENABLE KEYS */;\n")
+            write("UNLOCK TABLES;\n")
+            for ddl in trigger_ddl:
+                write(f"\nDELIMITER ;;\n{ddl} ;;\nDELIMITER ;\n")
+            write(FOOTER.format(finished=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        os.replace(path + ".part", path)
+
+
+class BackupDialog(tk.Toplevel):
+    """Runs a DatabaseBackup on a background thread with a progress bar and throughput stats."""
+
+    POLL_MS = 200
+
+    def __init__(self, master, job, on_finished):
+        super().__init__(master)
+        self.title("Backing Up Database")
+        self.resizable(False, False)
+        self.transient(master)
+        self.job = job
+        self.on_finished = on_finished
+        self.result = None
+        self.error = None
+        frm = ttk.Frame(self, padding=15)
+        frm.pack(fill='both', expand=True)
+        self.bar = ttk.Progressbar(frm, length=420, mode='determinate')
+        self.bar.pack(fill='x', pady=(0, 8))
+        self.stats = ttk.Label(frm, text="Opening snapshot...")
+        self.stats.pack(anchor='w')
+        self.current = ttk.Label(frm, text="")
+        self.current.pack(anchor='w', pady=(0, 8))
+        ttk.Button(frm, text="Cancel", command=self.job.cancel).pack(anchor='e')
+        self.protocol("WM_DELETE_WINDOW", self.job.cancel)
+        self._thread = threading.Thread(target=self._run, name="backup", daemon=True)
+        self._thread.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def _run(self):
+        try:
+            self.result = self.job.run()
+        except BaseException as e:
+            self.error = e
+
+    def _poll(self):
+        s = self.job.progress.snapshot()
+        self.bar.configure(maximum=max(s['rows_total'], 1), value=s['rows_done'])
+        self.stats.configure(text=f"Tables {s['tables_done']}/{s['tables_total']}   "
+                                  f"{s['rows_done']:,} rows   {s['rows_per_sec']:,.0f} rows/s   "
+                                  f"{s['mb_per_sec']:.1f} MB/s")
+        self.current.configure(text=("Dumping: " + ", ".join(s['current'])) if s['current'] else "")
+        if self._thread.is_alive():
+            self.after(self.POLL_MS, self._poll)
+            return
+        s['globally_consistent'] = self.job.globally_consistent
+        self.destroy()
+        self.on_finished(self.result, self.error, s)
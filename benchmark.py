@@ -0,0 +1,519 @@
+# benchmark.py
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import mysql.connector
+
+from db_pool import DatabasePool, load_db_config, load_pool_settings
+from migrations import MigrationRunner
+from restore import TableDump, iter_statements, open_dump
+
+DEFAULT_TEMPLATE = os.path.join("Data", "Dump20250630")
+DEFAULT_LOGS = 1_000_000
+DEFAULT_REPEAT = 5
+BATCH_SIZE = 5000
+REGRESSION_THRESHOLD = 1.2  # flag cases more than 20% slower than the baseline
+PREPARED_ROUNDS = 50  # executions per statement when comparing prepared and plain
+
+_COLUMN = re.compile(r"^\s*`(\w+)` ", re.M)
+_TOKEN = re.compile(r"'((?:[^'\\]|\\.|'')*)'|(NULL)|(-?\d+(?:\.\d+)?)|([(),])")
+
+
+def parse_insert(statement):
+    """Yields the value tuples of an extended INSERT ... VALUES (...),(...) statement."""
+    row, in_row = [], False
+    for text, null, number, punct in _TOKEN.findall(statement[statement.index(' VALUES ') + 8:]):
+        if punct == '(':
+            row, in_row = [], True
+        elif punct == ')':
+            in_row = False
+            yield tuple(row)
+        elif not in_row or punct == ',':
+            continue
+        elif null:
+            row.append(None)
+        elif number:
+            row.append(float(number) if '.' in number else int(number))
+        else:
+            row.append(re.sub(r"\\(.)", r"\1", text).replace("''", "'"))
+
+
+class DistributionTemplate:
+    """Row counts and value distributions of a real dump, used to shape the synthetic data."""
+
+    def __init__(self, dump_dir):
+        self.tables = {}
+        for name in sorted(os.listdir(dump_dir)):
+            if name.endswith(('.sql', '.sql.gz', '.sql.zst')):
+                path = os.path.join(dump_dir, name)
+                self.tables[TableDump(path).table] = self._read(path)
+
+    @staticmethod
+    def _read(path):
+        columns, rows = [], []
+        with open_dump(path) as f:
+            for statement in iter_statements(f):
+                if statement.startswith('CREATE TABLE'):
+                    columns = _COLUMN.findall(statement)
+                elif statement.startswith('INSERT'):
+                    rows.extend(dict(zip(columns, r)) for r in parse_insert(statement))
+        return rows
+
+    def rows(self, table):
+        return self.tables.get(table, [])
+
+    def values(self, table, column, default):
+        """Non-empty values of a column, for random.choice(); default when the dump has none."""
+        found = [r[column] for r in self.rows(table) if r.get(column) not in (None, '')]
+        return found or list(default)
+
+    def children_per_parent(self, table, parent_column, parents):
+        """How many rows of table each parent row has (including parents with none)."""
+        counts = Counter(r[parent_column] for r in self.rows(table))
+        return [counts.get(p, 0) for p in parents] or [1]
+
+    def logs_per_task(self):
+        return sorted(Counter(r['task_id'] for r in self.rows('time_log')).values()) or [1]
+
+    def logs_per_employee_day(self):
+        logs = self.rows('time_log')
+        days = {(r['log_date'], r['employ_id']) for r in logs}
+        return len(logs) / len(days) if days else 2.0
+
+
+class SyntheticData:
+    """
+    Generates clients, project managers, projects, tasks, employees and time logs shaped like
+    the template dump. Reference tables grow with the square root of the time-log scale (a
+    firm with 100x the logs has ~10x the clients and staff), children per parent and the
+    per-task log skew are resampled from the template, and the date range is sized so each
+    employee logs as densely per working day as in the template.
+    """
+
+    def __init__(self, template, logs, seed=1):
+        self.template = template
+        self.logs = logs
+        self.random = random.Random(seed)
+        template_logs = max(len(template.rows('time_log')), 1)
+        self.scale = max(1, round(math.sqrt(logs / template_logs)))
+
+    def clients(self):
+        n = max(len(self.template.rows('client')), 1) * self.scale
+        states = self.template.values('client', 'state', ['New York'])
+        cities = self.template.values('client', 'city', ['New York City'])
+        return [(f"C{i:05d}", f"Client {i}", f"{i} Main Street", self.random.choice(states),
+                 self.random.choice(cities), f"{10000 + i % 90000}", None) for i in range(1, n + 1)]
+
+    def project_managers(self, clients):
+        per_client = self.template.children_per_parent(
+            'project_manager', 'client_id', [r['client_id'] for r in self.template.rows('client')])
+        rows = []
+        for c in clients:
+            for _ in range(self.random.choice(per_client)):
+                rows.append((len(rows) + 1, c[0], f"Manager {len(rows) + 1}", None))
+        return rows
+
+    def projects(self, clients):
+        per_client = self.template.children_per_parent(
+            'project', 'client_id', [r['client_id'] for r in self.template.rows('client')])
+        types = self.template.values('project', 'project_type', ['Estimatic'])
+        statuses = self.template.values('project', 'project_status', ['In Progress'])
+        rows = []
+        for c in clients:
+            for _ in range(max(self.random.choice(per_client), 1)):
+                n = len(rows) + 1
+                rows.append((f"P{n:06d}", c[0], f"Project {n}", None,
+                             self.random.choice(types), self.random.choice(statuses), None))
+        return rows
+
+    def tasks(self, projects):
+        per_project = self.template.children_per_parent(
+            'task', 'project_no', [r['project_no'] for r in self.template.rows('project')])
+        rates = self.template.values('task', 'hourly_rate', [0.0])
+        billable = self.template.values('task', 'billable', ['Yes'])
+        statuses = self.template.values('task', 'task_status', ['Pending'])
+        rows = []
+        for p in projects:
+            for _ in range(max(self.random.choice(per_project), 1)):
+                n = len(rows) + 1
+                rows.append((n, p[1], p[0], f"Task {n}", self.random.choice(billable),
+                             self.random.choice(rates), None, self.random.choice(statuses), None))
+        return rows
+
+    def employees(self):
+        n = max(len(self.template.rows('employ')), 1) * self.scale
+        rates = self.template.values('employ', 'hourly_rate', [0.0])
+        return [(f"E{i:04d}", f"Employee {i}", f"555{i:07d}", f"employee{i}@example.com",
+                 self.random.choice(rates)) for i in range(1, n + 1)]
+
+    def working_days(self, employees):
+        per_day = self.template.logs_per_employee_day() * max(len(employees), 1)
+        end = max((r['log_date'] for r in self.template.rows('time_log')), default=date.today().isoformat())
+        day = datetime.strptime(end, '%Y-%m-%d').date()
+        days = []
+        while len(days) < max(math.ceil(self.logs / per_day), 1):
+            if day.weekday() < 5:
+                days.append(day.isoformat())
+            day -= timedelta(days=1)
+        return days
+
+    def time_logs(self, tasks, employees, batch_size=BATCH_SIZE):
+        """Yields batches of time_log rows; tasks get logs with the template's per-task skew."""
+        skew = self.template.logs_per_task()
+        weights = [self.random.choice(skew) for _ in tasks]
+        days = self.working_days(employees)
+        hours = self.template.values('time_log', 'hours', [1.0])
+        notes = self.template.values('time_log', 'notes', [None])
+        notes_ratio = sum(1 for r in self.template.rows('time_log') if r.get('notes')) / max(
+            len(self.template.rows('time_log')), 1)
+        remaining = self.logs
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            batch = []
+            for t in self.random.choices(tasks, weights=weights, k=n):
+                batch.append((self.random.choice(days), t[1], t[2], t[0], self.random.choice(employees)[0],
+                              self.random.choice(hours),
+                              self.random.choice(notes) if self.random.random() < notes_ratio else None))
+            remaining -= n
+            yield batch
+
+
+INSERTS = {
+    'client': "INSERT INTO client VALUES (%s,%s,%s,%s,%s,%s,%s)",
+    'project_manager': "INSERT INTO project_manager(pm_id,client_id,manager_name,notes) VALUES (%s,%s,%s,%s)",
+    'project': "INSERT INTO project(project_no,client_id,project_name,client_project_manager,project_type,"
+               "project_status,notes) VALUES (%s,%s,%s,%s,%s,%s,%s)",
+    'task': "INSERT INTO task(task_id,client_id,project_no,task_name,billable,hourly_rate,lumpsum,task_status,notes) "
+            "VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+    'employ': "INSERT INTO employ(employ_id,employ_name,employ_contact_number,employ_email_address,hourly_rate) "
+              "VALUES (%s,%s,%s,%s,%s)",
+    'time_log': "INSERT INTO time_log(log_date,client_id,project_no,task_id,employ_id,hours,notes) "
+                "VALUES (%s,%s,%s,%s,%s,%s,%s)",
+}
+
+
+def generate(db_config, data, log=print):
+    """Recreates the benchmark database at the latest schema and loads the synthetic data into it."""
+    server = {k: v for k, v in db_config.items() if k != 'database'}
+    conn = mysql.connector.connect(**server)
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{db_config['database']}`")
+    cur.execute(f"CREATE DATABASE `{db_config['database']}`")
+    conn.close()
+
+    conn = mysql.connector.connect(**db_config)
+    MigrationRunner(conn).run()
+    cur = conn.cursor()
+    cur.execute("SET FOREIGN_KEY_CHECKS=0, UNIQUE_CHECKS=0")
+    clients = data.clients()
+    projects = data.projects(clients)
+    tasks = data.tasks(projects)
+    employees = data.employees()
+    stats = {}
+    for table, rows in (('client', clients), ('project_manager', data.project_managers(clients)),
+                        ('project', projects), ('task', tasks), ('employ', employees)):
+        for i in range(0, len(rows), BATCH_SIZE):
+            cur.executemany(INSERTS[table], rows[i:i + BATCH_SIZE])
+        conn.commit()
+        stats[table] = len(rows)
+        log(f"  {table}: {len(rows):,} rows")
+
+    started, loaded = time.monotonic(), 0
+    for batch in data.time_logs(tasks, employees):
+        cur.executemany(INSERTS['time_log'], batch)
+        conn.commit()
+        loaded += len(batch)
+        if loaded % (BATCH_SIZE * 40) == 0:
+            log(f"  time_log: {loaded:,} rows, {loaded / (time.monotonic() - started):,.0f} rows/s")
+    elapsed = time.monotonic() - started
+    stats['time_log'] = loaded
+    stats['time_log_rows_per_sec'] = round(loaded / max(elapsed, 1e-6))
+    log(f"  time_log: {loaded:,} rows in {elapsed:.1f}s")
+    conn.close()
+    return stats
+
+
+def dataset_stats(db_config):
+    conn = mysql.connector.connect(**db_config)
+    cur = conn.cursor()
+    stats = {}
+    for table in ('client', 'project_manager', 'project', 'task', 'employ', 'subconsultant', 'time_log'):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        stats[table] = cur.fetchone()[0]
+    conn.close()
+    return stats
+
+
+def busiest(db_config):
+    """Picks the date, project, task and client with the most logs, the worst cases for each view."""
+    conn = mysql.connector.connect(**db_config)
+    cur = conn.cursor()
+    cur.execute("SELECT log_date FROM time_log_daily GROUP BY log_date ORDER BY SUM(log_count) DESC LIMIT 1")
+    log_date = cur.fetchone()[0].isoformat()
+    cur.execute("SELECT task_id, project_no FROM time_log_daily GROUP BY task_id, project_no "
+                "ORDER BY SUM(log_count) DESC LIMIT 1")
+    task_id, task_project_no = cur.fetchone()
+    cur.execute("SELECT client_id FROM project WHERE project_no=%s", (task_project_no,))
+    task_client_id = cur.fetchone()[0]
+    cur.execute("SELECT project_no FROM time_log_daily GROUP BY project_no ORDER BY SUM(log_count) DESC LIMIT 1")
+    project_no = cur.fetchone()[0]
+    cur.execute("SELECT client_id FROM project WHERE project_no=%s", (project_no,))
+    client_id = cur.fetchone()[0]
+    cur.execute("SELECT MIN(log_date), MAX(log_date) FROM time_log_daily")
+    first, last = cur.fetchone()
+    cur.execute("SELECT MAX(log_id) FROM time_log WHERE log_date=%s", (log_date,))
+    log_id = cur.fetchone()[0]
+    cur.execute("SELECT employ_id FROM time_log_daily WHERE log_date=%s AND employ_id<>'' GROUP BY employ_id "
+                "ORDER BY SUM(log_count) DESC LIMIT 1", (log_date,))
+    employ_id = cur.fetchone()[0]
+    conn.close()
+    return {'date': log_date, 'project_no': project_no, 'task_id': task_id, 'client_id': client_id,
+            'first_date': first.isoformat(), 'last_date': last.isoformat(), 'log_id': log_id,
+            'task_project_no': task_project_no, 'task_client_id': task_client_id, 'employ_id': employ_id}
+
+
+def prepared_benchmark(db_config, picks, rounds=PREPARED_ROUNDS, log=print):
+    """
+    Times every registered statement executed as plain text and as a prepared statement on
+    the same session, fetching all rows each time, so the difference is what parsing and
+    planning the text cost per call.
+    """
+    import lookup_cache  # registers the lookup statements
+    import prepared
+    from week_grid import week_start
+
+    monday = week_start(date.fromisoformat(picks['date']))
+    params = {
+        'time_logs_for_date': (picks['date'],),
+        'time_log_by_id': (picks['log_id'],),
+        'view_logs_by_date': (picks['date'],),
+        'project_report': (picks['project_no'],),
+        'task_rate': (picks['task_id'],),
+        'task_logs_in_range': (picks['task_id'], picks['first_date'], picks['last_date']),
+        'task_totals_in_range': (picks['task_id'], picks['first_date'], picks['last_date']),
+        'employ_week_logs': (picks['employ_id'], monday, monday + timedelta(days=6)),
+    }
+    conn = mysql.connector.connect(**db_config)
+    plain = conn.cursor()
+    results = {}
+    for name in prepared.names():
+        sql, args = prepared.sql(name), params.get(name, ())
+        cursor = prepared.prepared_cursor(conn, name)
+        timings = {'plain': [], 'prepared': []}
+        for _ in range(rounds):
+            for kind, cur in (('plain', plain), ('prepared', cursor)):
+                started = time.perf_counter()
+                cur.execute(sql, args)
+                cur.fetchall()
+                timings[kind].append((time.perf_counter() - started) * 1000)
+        plain_ms = statistics.median(timings['plain'])
+        prepared_ms = statistics.median(timings['prepared'])
+        results[name] = {'plain_median_ms': round(plain_ms, 3), 'prepared_median_ms': round(prepared_ms, 3),
+                         'saved_pct': round((1 - prepared_ms / plain_ms) * 100, 1) if plain_ms else 0.0}
+        log(f"  {name}: plain {plain_ms:.2f} ms, prepared {prepared_ms:.2f} ms")
+    conn.close()
+    return results
+
+
+class UiBenchmark:
+    """
+    Times the managers' real methods against the benchmark database, from the call until
+    every background query it queued has been rendered, i.e. what the user waits for.
+    Results include QueryExecutor's polling interval, as in the application.
+    """
+
+    def __init__(self, db_config, repeat=DEFAULT_REPEAT, log=print):
+        import tkinter as tk
+        from tkinter import ttk
+        from lookup_cache import LookupCache
+        from query_worker import QueryExecutor
+
+        self.tk, self.ttk, self.LookupCache = tk, ttk, LookupCache
+        self.repeat = repeat
+        self.log = log
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.pool = DatabasePool(db_config, **load_pool_settings('config.ini'))
+        self.executor = QueryExecutor(self.root, self.pool)
+        self.lookups = LookupCache(self.pool)
+        self.results = {}
+
+    def settle(self, timeout=600):
+        deadline = time.monotonic() + timeout
+        self.root.update()
+        while self.executor.pending():
+            if time.monotonic() > deadline:
+                raise TimeoutError("background queries did not finish")
+            time.sleep(0.0005)
+            self.root.update()
+        self.root.update_idletasks()
+
+    def measure(self, name, action, after=None, manager=None):
+        timings, error = [], None
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            result = action()
+            self.settle()
+            timings.append((time.perf_counter() - started) * 1000)
+            target = result if manager is None else manager
+            if str(target.status_bar.cget('foreground')) == 'red':
+                error = target.status_var.get()
+            if after is not None:
+                after(result)
+        timings.sort()
+        self.results[name] = {
+            'runs': len(timings),
+            'min_ms': round(timings[0], 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(timings[min(len(timings) - 1, math.ceil(len(timings) * 0.95) - 1)], 2),
+            'max_ms': round(timings[-1], 2),
+        }
+        if error:
+            self.results[name]['error'] = error
+        self.log(f"  {name}: median {self.results[name]['median_ms']:.1f} ms{'  ERROR ' + error if error else ''}")
+
+    def start(self, manager_class):
+        """Builds a manager with a cold lookup cache, as when its tab is first opened."""
+        frame = self.ttk.Frame(self.root)
+        return manager_class(frame, db_pool=self.pool, executor=self.executor, lookups=self.LookupCache(self.pool))
+
+    def stop(self, manager):
+        manager.conn.close()
+        manager.master.destroy()
+
+    def run(self, picks):
+        from main_manager import ClientManager
+        from timelog import TimeLogManager
+        from employ_subconsultant import EmploySubconsultantManager
+
+        for cls in (ClientManager, TimeLogManager, EmploySubconsultantManager):
+            self.measure(f"startup.{cls.__name__}", lambda: self.start(cls), after=self.stop)
+
+        frame = self.ttk.Frame(self.root)
+        cm = ClientManager(frame, db_pool=self.pool, executor=self.executor, lookups=self.lookups)
+        tm = TimeLogManager(self.ttk.Frame(self.root), db_pool=self.pool, executor=self.executor,
+                            lookups=self.lookups)
+        em = EmploySubconsultantManager(self.ttk.Frame(self.root), db_pool=self.pool, executor=self.executor,
+                                        lookups=self.lookups)
+        for manager in (cm, em):  # time every sub-tab, not just the ones opened at startup
+            for page in manager.notebook.tabs():
+                manager.tabs.build(page)
+        self.settle()
+        cid, pno, tid = picks['client_id'], picks['project_no'], picks['task_id']
+        cases = [
+            (cm, "populate_client_list", cm.populate_client_list),
+            (cm, "populate_client_dropdown", cm.populate_client_dropdown),
+            (cm, "populate_pm_client_dropdown", cm.populate_pm_client_dropdown),
+            (cm, "populate_project_manager_list", cm.populate_project_manager_list),
+            (cm, "populate_project_manager_list(client)", lambda: cm.populate_project_manager_list(cid)),
+            (cm, "populate_project_manager_dropdown(client)", lambda: cm.populate_project_manager_dropdown(cid)),
+            (cm, "populate_project_list", cm.populate_project_list),
+            (cm, "populate_project_list(client)", lambda: cm.populate_project_list(cid)),
+            (cm, "populate_task_client_dropdown", cm.populate_task_client_dropdown),
+            (cm, "populate_task_project_dropdown(client)", lambda: cm.populate_task_project_dropdown(cid)),
+            (cm, "populate_task_list", cm.populate_task_list),
+            (cm, "populate_task_list(project)", lambda: cm.populate_task_list(pno)),
+            (tm, "populate_dropdowns", tm.populate_dropdowns),
+            (tm, "populate_time_log_list(date)", lambda: tm.populate_time_log_list(for_date=picks['date'])),
+            (tm, "populate_time_log_list(all)", tm.populate_time_log_list),
+            (tm, "populate_project_dropdown(client)", lambda: tm.populate_project_dropdown(cid, tm.project_combobox)),
+            (tm, "populate_task_dropdown(project)", lambda: tm.populate_task_dropdown(pno, tm.task_combobox)),
+            (tm, "view_logs_by_date", lambda: (tm.filter_date_entry.set_date(picks['date']), tm.view_logs_by_date())),
+            (tm, "generate_project_report", lambda: (tm.report_client_combobox.set_id(cid),
+                                                     tm._on_report_client_selected(),
+                                                     tm.report_project_combobox.set_id(pno),
+                                                     tm.generate_project_report())),
+            (tm, "view_task_data", lambda: (tm.task_data_client_cb.set_id(picks['task_client_id']),
+                                            tm._on_task_data_client_selected(),
+                                            tm.task_data_project_cb.set_id(picks['task_project_no']),
+                                            tm._on_task_data_project_selected(),
+                                            tm.task_data_task_cb.set_id(tid),
+                                            tm.task_start_date_entry.set_date(picks['first_date']),
+                                            tm.task_end_date_entry.set_date(picks['last_date']),
+                                            tm.view_task_data())),
+            (em, "populate_employ_list", em.populate_employ_list),
+            (em, "populate_subconsultant_list", em.populate_subconsultant_list),
+        ]
+        for manager, name, action in cases:
+            self.measure(f"{type(manager).__name__}.{name}", action, manager=manager)
+        for manager in (cm, tm, em):
+            self.stop(manager)
+        self.executor.shutdown()
+        self.pool.close()
+        self.root.destroy()
+        return self.results
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Returns (name, baseline_ms, current_ms) for every case slower than threshold x its baseline median."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before and current['median_ms'] > before['median_ms'] * threshold:
+            regressions.append((name, before['median_ms'], current['median_ms']))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the hot paths against a large synthetic database.")
+    parser.add_argument("--database", help="benchmark database (default: <configured database>_bench)")
+    parser.add_argument("--logs", type=int, default=DEFAULT_LOGS, help="time_log rows to generate")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE, help="dump directory the data is modelled on")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reuse", action="store_true", help="benchmark the existing data instead of regenerating it")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per case")
+    parser.add_argument("--output", default="benchmark.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--skip-ui", action="store_true", help="only time the prepared statements")
+    args = parser.parse_args()
+
+    db_config = load_db_config('config.ini')
+    if not db_config:
+        raise SystemExit("Database config file not found or invalid")
+    database = args.database or f"{db_config['database']}_bench"
+    if database == db_config['database']:
+        raise SystemExit("The benchmark recreates its database; point --database at a scratch database")
+    db_config = dict(db_config, database=database)
+
+    report = {'revision': git_revision(), 'started': datetime.now().isoformat(timespec='seconds'),
+              'database': database}
+    if not args.reuse:
+        print(f"Generating {args.logs:,} time logs into {database} from {args.template}...")
+        data = SyntheticData(DistributionTemplate(args.template), args.logs, args.seed)
+        report['load'] = generate(db_config, data)
+    report['dataset'] = dataset_stats(db_config)
+    report['picks'] = busiest(db_config)
+    print("Timing prepared statements...")
+    report['prepared'] = prepared_benchmark(db_config, report['picks'])
+    report['results'] = {}
+    if not args.skip_ui:
+        print("Timing hot paths...")
+        report['results'] = UiBenchmark(db_config, args.repeat).run(report['picks'])
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.baseline:
+        regressions = compare(report['results'], args.baseline)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.1f} ms -> {after:.1f} ms")
+        raise SystemExit(1 if regressions else 0)
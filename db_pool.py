@@ -0,0 +1,234 @@
+# db_pool.py
+
+import configparser
+import os
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import pooling
+
+from query_stats import STATS, TimedCursor
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 60
+DEFAULT_RECONNECT_ATTEMPTS = 3
+DEFAULT_CHECKOUT_TIMEOUT = 10
+DEFAULT_QUERY_WORKERS = 2
+# Sessions that can be checked out at the same moment besides the query workers': on the Tk
+# thread a manager's TkSession and a LookupCache load; in the background the journal flusher
+# and check_health(). KILL QUERY has a connection of its own (see QueryExecutor).
+TK_THREAD_SESSIONS = 2
+BACKGROUND_SESSIONS = 2
+SPARE_SESSIONS = 1
+
+
+def required_pool_size(query_workers=DEFAULT_QUERY_WORKERS):
+    """The smallest pool in which no borrower waits for a session while the others are busy."""
+    return TK_THREAD_SESSIONS + query_workers + BACKGROUND_SESSIONS + SPARE_SESSIONS
+
+
+def load_db_config(config_file):
+    """Reads the [mysql] section of config.ini, or returns None if it is missing or incomplete."""
+    cfg = configparser.ConfigParser()
+    if not os.path.exists(config_file): return None
+    cfg.read(config_file)
+    if 'mysql' not in cfg: return None
+    sec = cfg['mysql']
+    for k in ('host', 'user', 'password', 'database'):
+        if k not in sec: return None
+    return {k: sec[k] for k in ('host', 'user', 'password', 'database')}
+
+
+def load_pool_settings(config_file):
+    """Reads the optional [pool] section of config.ini, falling back to the defaults."""
+    cfg = configparser.ConfigParser()
+    if os.path.exists(config_file):
+        cfg.read(config_file)
+    sec = cfg['pool'] if 'pool' in cfg else {}
+    return {
+        'pool_size': int(sec['pool_size']) if 'pool_size' in sec else None,
+        'health_check_interval': int(sec.get('health_check_interval', DEFAULT_HEALTH_CHECK_INTERVAL)),
+        'reconnect_attempts': int(sec.get('reconnect_attempts', DEFAULT_RECONNECT_ATTEMPTS)),
+        'query_workers': int(sec.get('query_workers', DEFAULT_QUERY_WORKERS)),
+    }
+
+
+class DatabasePool:
+    """
+    Application-wide MySQL connection pool shared by all managers.
+    Connections are health-checked on checkout and reconnected transparently,
+    so the server only ever sees pool_size sessions per desktop; a smaller pool_size
+    than required_pool_size() is raised to it. Sessions are not
+    reset between checkouts, so their prepared statements (see prepared.py) stay
+    allocated; release() rolls back instead to end any open transaction.
+    """
+
+    def __init__(self, db_config, pool_size=None,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 reconnect_attempts=DEFAULT_RECONNECT_ATTEMPTS, query_workers=DEFAULT_QUERY_WORKERS,
+                 pool_name="schedule_plus"):
+        self.db_config = db_config
+        self.pool_size = max(pool_size or 0, required_pool_size(query_workers))
+        self.query_workers = query_workers
+        self.health_check_interval = health_check_interval
+        self.reconnect_attempts = reconnect_attempts
+        self._pool = pooling.MySQLConnectionPool(pool_name=pool_name, pool_size=self.pool_size,
+                                                 pool_reset_session=False, **db_config)
+        self._lock = threading.Lock()
+        self._leased = []
+        self._last_checked = {}
+
+    @classmethod
+    def from_config(cls, config_file='config.ini'):
+        """Builds a pool from config.ini, or returns None if the database config is invalid."""
+        db_config = load_db_config(config_file)
+        if not db_config:
+            return None
+        return cls(db_config, **load_pool_settings(config_file))
+
+    def get_connection(self, timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        """Checks a healthy connection out of the pool, waiting up to timeout seconds for a free one."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                conn = self._pool.get_connection()
+                break
+            except mysql.connector.errors.PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+        self._ensure_alive(conn)
+        with self._lock:
+            self._leased.append(conn)
+        return conn
+
+    def release(self, conn):
+        """Returns a connection obtained from get_connection() to the pool."""
+        with self._lock:
+            if conn in self._leased:
+                self._leased.remove(conn)
+            self._last_checked[self._key(conn)] = time.monotonic()
+        self._release_checked(conn)
+
+    @staticmethod
+    def _release_checked(conn):
+        try:
+            conn.rollback()
+        except mysql.connector.Error:
+            pass
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def connect(self):
+        """Opens a session outside the pool, for work that must not wait for a pooled one."""
+        return mysql.connector.connect(**self.db_config)
+
+    def check_health(self):
+        """
+        Checks the idle sessions out one at a time, which pings those unused for
+        health_check_interval and reconnects any the server has dropped. Sessions in use
+        are never touched. A dead server makes this block for the reconnect attempts, so
+        call it off the Tk thread.
+        """
+        for _ in range(self.pool_size):
+            try:
+                conn = self._pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                return  # every remaining session is in use
+            try:
+                self._ensure_alive(conn)
+            except mysql.connector.Error:
+                pass
+            finally:
+                # Back at the end of the queue, so the next checkout here is another idle session
+                self._release_checked(conn)
+
+    @staticmethod
+    def _key(conn):
+        # Pooled wrappers are recreated on every checkout; track the underlying session instead.
+        return id(getattr(conn, '_cnx', conn))
+
+    def _ensure_alive(self, conn):
+        now = time.monotonic()
+        last = self._last_checked.get(self._key(conn))
+        if last is not None and now - last < self.health_check_interval:
+            return
+        conn.ping(reconnect=True, attempts=self.reconnect_attempts, delay=1)
+        self._last_checked[self._key(conn)] = now
+
+    def close(self):
+        """Releases every leased connection and closes the pooled sessions."""
+        with self._lock:
+            leased, self._leased = list(self._leased), []
+        for conn in leased:
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+        try:
+            self._pool._remove_connections()
+        except (AttributeError, mysql.connector.Error):
+            pass
+
+
+class SessionCursor(TimedCursor):
+    """TimedCursor over the connection a TkSession has leased, leasing one on first use."""
+
+    def __init__(self, session, stats=STATS):
+        super().__init__(None, stats)
+        self.session = session
+
+    @property
+    def _cursor(self):
+        return self.session.lease()[1]
+
+    @property
+    def connection(self):
+        return self.session.lease()[0]
+
+
+class TkSession:
+    """
+    Connection for the queries a manager runs in its Tk event handlers. A pooled session
+    is leased on first use and returned once Tk is idle again, so managers do not pin a
+    session each and a pooled session is only ever used by one thread at a time. Whatever
+    the handler left uncommitted is rolled back then.
+    """
+
+    def __init__(self, db_pool, widget):
+        self.db_pool = db_pool
+        self.widget = widget.winfo_toplevel()  # outlives a manager's frame
+        self._leased = None  # (connection, cursor)
+        self._cursor = SessionCursor(self)
+
+    def lease(self):
+        if self._leased is None:
+            conn = self.db_pool.get_connection()
+            self._leased = (conn, conn.cursor())
+            self.widget.after_idle(self.close)
+        return self._leased
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        if self._leased is not None:
+            self._leased[0].commit()
+
+    def rollback(self):
+        if self._leased is not None:
+            self._leased[0].rollback()
+
+    def close(self):
+        """Returns the leased session, if any, to the pool."""
+        if self._leased is None:
+            return
+        self._cursor._finish()
+        (conn, cursor), self._leased = self._leased, None
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+        self.db_pool.release(conn)
@@ -1,89 +1,74 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import mysql.connector
-import configparser
-import os
+from db_pool import DatabasePool, TkSession
+from migrations import ensure_schema
+from query_worker import QueryExecutor
+from lookup_cache import LookupCache
+from pagination import KeysetPager, PagerBar, load_page, load_page_size
+from tree_model import TreeModel
+from lazy_tabs import LazyTabs, load_prefetch_tabs
+from query_stats import SlowQueryLabel
+from search_index import SearchBox
 
 class EmploySubconsultantManager:
-    def __init__(self, master, status_callback=None):
+    def __init__(self, master, status_callback=None, db_pool=None, executor=None, lookups=None):
         self.master = master
         self.status_var = tk.StringVar()
         self.status_bar = ttk.Label(master, textvariable=self.status_var, relief=tk.SUNKEN, anchor='w', padding=(5, 2))
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-        self.db_config = self.load_db_config('config.ini')
-        if not self.db_config:
-            self.show_status_message("Configuration Error: Database config file not found or invalid", error=True)
-            master.after(5000, master.destroy)
-            return
+        self.slow_query_label = SlowQueryLabel(master, prefix=f"{__name__}.")
+        self.slow_query_label.pack(side=tk.BOTTOM, fill=tk.X)
 
         try:
-            self.conn = mysql.connector.connect(**self.db_config)
+            self.db_pool = db_pool or DatabasePool.from_config('config.ini')
+            if not self.db_pool:
+                self.show_status_message("Configuration Error: Database config file not found or invalid", error=True)
+                master.after(5000, master.destroy)
+                return
+            if db_pool is None:
+                ensure_schema(self.db_pool)  # MainApplication migrates once at startup otherwise
+            self.conn = TkSession(self.db_pool, master)
             self.cursor = self.conn.cursor()
         except mysql.connector.Error as err:
             self.show_status_message(f"Database Connection Error: {err}", error=True)
             master.after(5000, master.destroy)
             return
+        self.executor = executor or QueryExecutor(master, self.db_pool)
+        self.lookups = lookups or LookupCache(self.db_pool)
 
-        self.create_tables()
         self.create_styles()
 
+        page_size = load_page_size('config.ini')
+        self.employ_pager = KeysetPager(
+            "SELECT employ_id, employ_name, employ_contact_number, employ_email_address, hourly_rate FROM employ",
+            [("employ_name", 1), ("employ_id", 0)], page_size)
+        self.subconsultant_pager = KeysetPager(
+            "SELECT subconsultant_id, subconsultant_name, subconsultant_contact_number, subconsultant_email_address, hourly_rate FROM subconsultant",
+            [("subconsultant_name", 1), ("subconsultant_id", 0)], page_size)
+
         self.notebook = ttk.Notebook(master)
         self.employ_tab = ttk.Frame(self.notebook)
         self.subconsultant_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.employ_tab, text='Employ')
-        self.notebook.add(self.subconsultant_tab, text='Subconsultant')
+        # Each sub-tab is built and populated when first selected
+        self.tabs = LazyTabs(self.notebook, load_prefetch_tabs('config.ini'))
+        self.tabs.add(self.employ_tab, 'Employ', self.build_employ_tab)
+        self.tabs.add(self.subconsultant_tab, 'Subconsultant', self.build_subconsultant_tab)
         self.notebook.pack(expand=True, fill='both', padx=10, pady=10)
+        self.tabs.start()
 
+    def build_employ_tab(self):
         self.create_employ_widgets()
-        self.create_subconsultant_widgets()
-
         self.populate_employ_list()
-        self.populate_subconsultant_list()
 
-    def load_db_config(self, config_file):
-        cfg = configparser.ConfigParser()
-        if not os.path.exists(config_file):
-            return None
-        cfg.read(config_file)
-        if 'mysql' not in cfg:
-            return None
-        sec = cfg['mysql']
-        for k in ('host','user','password','database'):
-            if k not in sec:
-                return None
-        return {k: sec[k] for k in ('host','user','password','database')}
+    def build_subconsultant_tab(self):
+        self.create_subconsultant_widgets()
+        self.populate_subconsultant_list()
 
     def show_status_message(self, message, error=False):
         self.status_var.set(message)
         self.status_bar.configure(foreground='red' if error else 'green')
 
-    def create_tables(self):
-        try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS employ (
-                    employ_id VARCHAR(50) PRIMARY KEY,
-                    employ_name VARCHAR(255) NOT NULL,
-                    employ_contact_number VARCHAR(20) NOT NULL,
-                    employ_email_address VARCHAR(255) NOT NULL
-                )
-            """)
-            self.cursor.execute("SHOW COLUMNS FROM employ LIKE 'hourly_rate'")
-            if not self.cursor.fetchone():
-                self.cursor.execute("ALTER TABLE employ ADD COLUMN hourly_rate DECIMAL(10,2) NOT NULL DEFAULT 0")
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS subconsultant (
-                    subconsultant_id VARCHAR(50) PRIMARY KEY,
-                    subconsultant_name VARCHAR(255) NOT NULL,
-                    subconsultant_contact_number VARCHAR(20) NOT NULL,
-                    subconsultant_email_address VARCHAR(255) NOT NULL,
-                    hourly_rate DECIMAL(10,2) NOT NULL
-                )
-            """)
-            self.conn.commit()
-        except mysql.connector.Error as err:
-            self.show_status_message(f"Error creating or modifying tables: {err}", error=True)
-
     def create_styles(self):
         self.master.option_add('*Font', ('Segoe UI', 10))
         style = ttk.Style()
@@ -125,6 +110,11 @@ class EmploySubconsultantManager:
         tv_frm = ttk.LabelFrame(parent, text="Employ List", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
         cols = ("Employ ID", "Name", "Contact Number", "Email Address", "Hourly Rate")
+        self.employ_pager_bar = PagerBar(tv_frm, self.employ_pager, self.load_employ_page)
+        self.employ_pager_bar.pack(side='bottom', fill='x', pady=(5, 0))
+        self.employ_search = SearchBox(tv_frm, self.employ_pager, self.load_employ_page,
+                                       lambda ready, failed: self.lookups.search_index('employ', self.executor, ready, failed), "employ_id", self.populate_employ_list)
+        self.employ_search.pack(side='top', fill='x', pady=(0, 5))
         self.employ_tree = ttk.Treeview(tv_frm, columns=cols, show="headings")
         widths = [100, 180, 130, 180, 100]
         for c, w in zip(cols, widths):
@@ -132,19 +122,27 @@ class EmploySubconsultantManager:
             self.employ_tree.column(c, width=w, anchor='center' if c == "Employ ID" else 'w')
         self.employ_tree.pack(side='left', fill='both', expand=True)
         self.employ_tree.bind("<<TreeviewSelect>>", lambda e: self.on_employ_select())
+        self.employ_model = TreeModel(self.employ_tree, pager=self.employ_pager, format_row=self._format_person_row)
         scrollbar = ttk.Scrollbar(tv_frm, orient='vertical', command=self.employ_tree.yview)
         scrollbar.pack(side='right', fill='y')
         self.employ_tree.configure(yscrollcommand=scrollbar.set)
 
     def populate_employ_list(self):
-        for item in self.employ_tree.get_children():
-            self.employ_tree.delete(item)
-        try:
-            self.cursor.execute("SELECT employ_id, employ_name, employ_contact_number, employ_email_address, hourly_rate FROM employ ORDER BY employ_name")
-            for row in self.cursor.fetchall():
-                self.employ_tree.insert("", tk.END, values=(row[0], row[1], row[2], row[3], f"{row[4]:.2f}"))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error loading employs: {e}", error=True)
+        if not self.tabs.is_built(self.employ_tab): return
+        self.employ_search.clear()
+        self.employ_pager.reset()
+        self.load_employ_page('first')
+
+    def load_employ_page(self, direction):
+        load_page(self.executor, 'employ_list', self.employ_pager, direction, self._render_employ_list,
+                  lambda e: self.show_status_message(f"Error loading employs: {e}", error=True),
+                  tree=self.employ_tree, bar=self.employ_pager_bar)
+
+    def _render_employ_list(self, rows):
+        self.employ_model.load(rows)
+
+    def _format_person_row(self, row):
+        return (row[0], row[1], row[2], row[3], f"{row[4]:.2f}")
 
     def add_employ(self):
         eid = self.employ_id_entry.get().strip()
@@ -166,9 +164,11 @@ class EmploySubconsultantManager:
                 (eid, name, contact, email, rate_val)
             )
             self.conn.commit()
+            self.lookups.invalidate('employ')
+            self.lookups.update_index('employ', eid, eid, name)
             self.show_status_message(f"Employ '{name}' added")
             self.clear_employ_input()
-            self.populate_employ_list()
+            self.employ_model.refresh(self.cursor, "employ_id", eid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding employ: {e}", error=True)
 
@@ -195,9 +195,11 @@ class EmploySubconsultantManager:
                 (name, contact, email, rate_val, eid)
             )
             self.conn.commit()
+            self.lookups.invalidate('employ')
+            self.lookups.update_index('employ', eid, eid, name)
             self.show_status_message(f"Employ '{name}' updated")
             self.clear_employ_input()
-            self.populate_employ_list()
+            self.employ_model.refresh(self.cursor, "employ_id", eid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating employ: {e}", error=True)
 
@@ -211,9 +213,11 @@ class EmploySubconsultantManager:
         try:
             self.cursor.execute("DELETE FROM employ WHERE employ_id=%s", (eid,))
             self.conn.commit()
+            self.lookups.invalidate('employ')
+            self.lookups.update_index('employ', eid)
             self.show_status_message("Employ deleted")
             self.clear_employ_input()
-            self.populate_employ_list()
+            self.employ_model.remove(eid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting employ: {e}", error=True)
 
@@ -265,6 +269,12 @@ class EmploySubconsultantManager:
         tv_frm = ttk.LabelFrame(parent, text="Subconsultant List", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
         cols = ("Subconsultant ID", "Name", "Contact Number", "Email Address", "Hourly Rate")
+        self.subconsultant_pager_bar = PagerBar(tv_frm, self.subconsultant_pager, self.load_subconsultant_page)
+        self.subconsultant_pager_bar.pack(side='bottom', fill='x', pady=(5, 0))
+        self.subconsultant_search = SearchBox(tv_frm, self.subconsultant_pager, self.load_subconsultant_page,
+                                              lambda ready, failed: self.lookups.search_index('subconsultant', self.executor, ready, failed), "subconsultant_id",
+                                              self.populate_subconsultant_list)
+        self.subconsultant_search.pack(side='top', fill='x', pady=(0, 5))
         self.subconsultant_tree = ttk.Treeview(tv_frm, columns=cols, show="headings")
         widths = [120, 180, 130, 180, 100]
         for c, w in zip(cols, widths):
@@ -272,19 +282,24 @@ class EmploySubconsultantManager:
             self.subconsultant_tree.column(c, width=w, anchor='center' if 'ID' in c else 'w')
         self.subconsultant_tree.pack(side='left', fill='both', expand=True)
         self.subconsultant_tree.bind("<<TreeviewSelect>>", lambda e: self.on_subconsultant_select())
+        self.subconsultant_model = TreeModel(self.subconsultant_tree, pager=self.subconsultant_pager, format_row=self._format_person_row)
         scrollbar = ttk.Scrollbar(tv_frm, orient='vertical', command=self.subconsultant_tree.yview)
         scrollbar.pack(side='right', fill='y')
         self.subconsultant_tree.configure(yscrollcommand=scrollbar.set)
 
     def populate_subconsultant_list(self):
-        for item in self.subconsultant_tree.get_children():
-            self.subconsultant_tree.delete(item)
-        try:
-            self.cursor.execute("SELECT subconsultant_id, subconsultant_name, subconsultant_contact_number, subconsultant_email_address, hourly_rate FROM subconsultant ORDER BY subconsultant_name")
-            for row in self.cursor.fetchall():
-                self.subconsultant_tree.insert("", tk.END, values=(row[0], row[1], row[2], row[3], f"{row[4]:.2f}"))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error loading subconsultants: {e}", error=True)
+        if not self.tabs.is_built(self.subconsultant_tab): return
+        self.subconsultant_search.clear()
+        self.subconsultant_pager.reset()
+        self.load_subconsultant_page('first')
+
+    def load_subconsultant_page(self, direction):
+        load_page(self.executor, 'subconsultant_list', self.subconsultant_pager, direction, self._render_subconsultant_list,
+                  lambda e: self.show_status_message(f"Error loading subconsultants: {e}", error=True),
+                  tree=self.subconsultant_tree, bar=self.subconsultant_pager_bar)
+
+    def _render_subconsultant_list(self, rows):
+        self.subconsultant_model.load(rows)
 
     def add_subconsultant(self):
         sid = self.subconsultant_id_entry.get().strip()
@@ -306,9 +321,11 @@ class EmploySubconsultantManager:
                 (sid, name, contact, email, rate_val)
             )
             self.conn.commit()
+            self.lookups.invalidate('subconsultant')
+            self.lookups.update_index('subconsultant', sid, sid, name)
             self.show_status_message(f"Subconsultant '{name}' added")
             self.clear_subconsultant_input()
-            self.populate_subconsultant_list()
+            self.subconsultant_model.refresh(self.cursor, "subconsultant_id", sid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding subconsultant: {e}", error=True)
 
@@ -335,9 +352,11 @@ class EmploySubconsultantManager:
                 (name, contact, email, rate_val, sid)
             )
             self.conn.commit()
+            self.lookups.invalidate('subconsultant')
+            self.lookups.update_index('subconsultant', sid, sid, name)
             self.show_status_message(f"Subconsultant '{name}' updated")
             self.clear_subconsultant_input()
-            self.populate_subconsultant_list()
+            self.subconsultant_model.refresh(self.cursor, "subconsultant_id", sid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating subconsultant: {e}", error=True)
 
@@ -351,9 +370,11 @@ class EmploySubconsultantManager:
         try:
             self.cursor.execute("DELETE FROM subconsultant WHERE subconsultant_id=%s", (sid,))
             self.conn.commit()
+            self.lookups.invalidate('subconsultant')
+            self.lookups.update_index('subconsultant', sid)
             self.show_status_message("Subconsultant deleted")
             self.clear_subconsultant_input()
-            self.populate_subconsultant_list()
+            self.subconsultant_model.remove(sid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting subconsultant: {e}", error=True)
 
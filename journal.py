@@ -0,0 +1,226 @@
+# journal.py
+
+import itertools
+import json
+import os
+import threading
+from tkinter import ttk
+
+import mysql.connector
+
+from query_stats import instrument
+from timelog_import import INSERT_TIME_LOG, new_log_ref
+
+JOURNAL_PATH = "time_log_journal.jsonl"
+BATCH_SIZE = 100
+RETRY_SECONDS = (1, 2, 5, 15, 30, 60)  # wait after each consecutive failed flush; the last one repeats
+REFRESH_MS = 250
+# log_ref is unique, so replaying an entry the server already has changes nothing.
+FLUSH_TIME_LOGS = INSERT_TIME_LOG + " ON DUPLICATE KEY UPDATE log_ref=log_ref"
+FIELDS = ('log_ref', 'log_date', 'client_id', 'project_no', 'task_id', 'employ_id', 'hours', 'notes')
+
+
+class TimeLogJournal:
+    """
+    Write-behind queue for new time logs. add() appends the entry to a local JSON-lines
+    file and fsyncs it before returning, so an acknowledged entry survives a dropped
+    connection or a crash. A background thread inserts the pending entries batch_size at a
+    time, one transaction per batch, then appends a 'done' record for them. An entry whose
+    batch committed just before a crash is replayed on the next start and skipped by the
+    server, since every entry carries its own log_ref.
+    """
+
+    def __init__(self, db_pool, path=JOURNAL_PATH, batch_size=BATCH_SIZE):
+        self.db_pool = db_pool
+        self.path = path
+        self.batch_size = batch_size
+        self.last_error = None  # why the last flush failed, until one succeeds
+        self._lock = threading.Lock()  # guards the file and the queues
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending = self._recover()  # log_ref -> entry, oldest first
+        self._flushed = []
+        self._rejected = []
+        self._file = open(path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name="time-log-journal", daemon=True)
+        self._thread.start()
+        if self._pending:
+            self._wake.set()
+
+    def _recover(self):
+        """Reads the entries earlier sessions left unsent and rewrites the file with only those."""
+        pending = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line of a crash mid-write; that entry was never acknowledged
+                    if record['op'] == 'add':
+                        pending[record['entry']['log_ref']] = record['entry']
+                    else:
+                        for ref in record['log_refs']:
+                            pending.pop(ref, None)
+        except FileNotFoundError:
+            pass
+        self._rewrite(pending.values())
+        return pending
+
+    def _rewrite(self, entries):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps({'op': 'add', 'entry': entry}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def add(self, log_date, client_id, project_no, task_id, employ_id, hours, notes=None):
+        """Durably queues a new time log and returns its log_ref; raises OSError if it could not be written."""
+        entry = dict(zip(FIELDS, (new_log_ref(log_date, task_id, employ_id),
+                                  log_date, client_id, project_no, task_id, employ_id, hours, notes)))
+        with self._lock:
+            self._write({'op': 'add', 'entry': entry})
+            self._pending[entry['log_ref']] = entry
+        self._wake.set()
+        return entry['log_ref']
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self):
+        """Returns the entries written and the (entry, error) pairs refused since the last call."""
+        with self._lock:
+            flushed, self._flushed = self._flushed, []
+            rejected, self._rejected = self._rejected, []
+        return flushed, rejected
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            self._wake.wait(RETRY_SECONDS[min(failures, len(RETRY_SECONDS)) - 1] if failures else None)
+            self._wake.clear()
+            try:
+                self.flush()
+                failures, self.last_error = 0, None
+            except (mysql.connector.Error, OSError) as e:
+                # Server unreachable (or the journal unwritable): keep the entries and try again later
+                failures += 1
+                self.last_error = str(e)
+
+    def flush(self):
+        """Sends every pending entry; raises mysql.connector.Error while the server cannot be reached."""
+        while not self._stop.is_set():
+            with self._lock:
+                batch = list(itertools.islice(self._pending.values(), self.batch_size))
+            if not batch:
+                return
+            conn = self.db_pool.get_connection()
+            try:
+                cursor = instrument(conn.cursor(), connection=conn)
+                try:
+                    cursor.executemany(FLUSH_TIME_LOGS, [tuple(e[f] for f in FIELDS) for e in batch])
+                    conn.commit()
+                except (mysql.connector.IntegrityError, mysql.connector.DataError):
+                    # A row the server refuses (e.g. its task was deleted meanwhile) must not hold back the rest
+                    conn.rollback()
+                    batch = self._insert_singly(conn, cursor, batch)
+                finally:
+                    cursor.close()
+            finally:
+                self.db_pool.release(conn)
+            self._mark_done(batch)
+
+    def _insert_singly(self, conn, cursor, batch):
+        written = []
+        for entry in batch:
+            try:
+                cursor.execute(FLUSH_TIME_LOGS, tuple(entry[f] for f in FIELDS))
+                conn.commit()
+                written.append(entry)
+            except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+                conn.rollback()
+                with self._lock:
+                    self._write({'op': 'rejected', 'log_refs': [entry['log_ref']], 'entry': entry, 'error': str(e)})
+                    del self._pending[entry['log_ref']]
+                    self._rejected.append((entry, str(e)))
+        return written
+
+    def _mark_done(self, batch):
+        with self._lock:
+            if batch:
+                self._write({'op': 'done', 'log_refs': [e['log_ref'] for e in batch]})
+            for entry in batch:
+                del self._pending[entry['log_ref']]
+            self._flushed.extend(batch)
+            if not self._pending:
+                # Nothing left to replay; start the file afresh instead of letting it grow
+                self._file.close()
+                self._rewrite(())
+                self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self, timeout=5):
+        """Stops the flusher after its current batch; unsent entries stay in the file for the next start."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Still inside a batch (e.g. waiting on the server): it may yet write its 'done' record,
+            # so the file stays open for it and closes with the process
+            return
+        with self._lock:
+            self._file.close()
+
+
+_journal = None
+
+
+def open_journal(db_pool, path=JOURNAL_PATH):
+    """Returns the application's journal, opening it (and replaying what it holds) on first use."""
+    global _journal
+    if _journal is None:
+        _journal = TimeLogJournal(db_pool, path)
+    return _journal
+
+
+class JournalLabel(ttk.Label):
+    """
+    Status-bar label counting the time logs waiting to reach the server. Entries the
+    journal wrote or the server refused are handed to on_flushed(entries) and
+    on_rejected([(entry, error)]) on the Tk thread.
+    """
+
+    def __init__(self, master, journal, on_flushed=None, on_rejected=None, **kwargs):
+        super().__init__(master, anchor='e', foreground='#808080', padding=(5, 0), **kwargs)
+        self.journal = journal
+        self.on_flushed = on_flushed
+        self.on_rejected = on_rejected
+        self._job = self.after(REFRESH_MS, self._refresh)
+
+    def _refresh(self):
+        flushed, rejected = self.journal.drain()
+        if flushed and self.on_flushed:
+            self.on_flushed(flushed)
+        if rejected and self.on_rejected:
+            self.on_rejected(rejected)
+        count, error = self.journal.pending(), self.journal.last_error
+        if not count:
+            self.configure(text="")
+        elif error:
+            self.configure(text=f"{count} time log entr{'ies' if count != 1 else 'y'} saved locally, "
+                                f"waiting for the database: {error}", foreground='#cc6600')
+        else:
+            self.configure(text=f"Sending {count} time log entr{'ies' if count != 1 else 'y'}...",
+                           foreground='#808080')
+        self._job = self.after(REFRESH_MS, self._refresh)
+
+    def destroy(self):
+        self.after_cancel(self._job)
+        super().destroy()
@@ -0,0 +1,63 @@
+# lazy_tabs.py
+
+import configparser
+import os
+
+PREFETCH_DELAY_MS = 500   # after the visible page is up
+PREFETCH_STEP_MS = 50     # between the pages built in the background
+
+
+def load_prefetch_tabs(config_file='config.ini'):
+    """Reads prefetch_tabs from the optional [ui] section of config.ini (off by default)."""
+    cfg = configparser.ConfigParser()
+    if os.path.exists(config_file):
+        cfg.read(config_file)
+    try:
+        return cfg.getboolean('ui', 'prefetch_tabs', fallback=False)
+    except ValueError:
+        return False
+
+
+class LazyTabs:
+    """
+    Builds the pages of a ttk.Notebook on first selection, so opening a manager only
+    creates and queries the page that is visible. With prefetch, the remaining pages are
+    then built one at a time from the idle loop. Populate methods call is_built() and skip
+    pages that do not exist yet; building a page loads its data anyway.
+    """
+
+    def __init__(self, notebook, prefetch=False):
+        self.notebook = notebook
+        self.prefetch = prefetch
+        self._builders = {}
+        self._built = set()
+        notebook.bind("<<NotebookTabChanged>>", lambda e: self.build(notebook.select()), add='+')
+
+    def add(self, frame, text, build):
+        """Adds frame as a page; build() creates its widgets and loads its data on first selection."""
+        self.notebook.add(frame, text=text)
+        self._builders[str(frame)] = build
+
+    def is_built(self, frame):
+        return str(frame) in self._built
+
+    def build(self, frame):
+        name = str(frame)
+        if name in self._built or name not in self._builders:
+            return
+        self._built.add(name)
+        self._builders[name]()
+
+    def start(self):
+        """Builds the selected page now and, with prefetch, schedules the others."""
+        self.build(self.notebook.select())
+        if self.prefetch:
+            self.notebook.after(PREFETCH_DELAY_MS, self._prefetch_next)
+
+    def _prefetch_next(self):
+        pending = [name for name in self._builders if name not in self._built]
+        if not pending or not self.notebook.winfo_exists():
+            return
+        self.build(pending[0])
+        if len(pending) > 1:
+            self.notebook.after(PREFETCH_STEP_MS, lambda: self.notebook.after_idle(self._prefetch_next))
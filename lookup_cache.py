@@ -0,0 +1,153 @@
+# lookup_cache.py
+
+import prepared
+from query_stats import instrument
+from search_index import SearchIndex
+
+# Reference tables behind the dropdowns. Rows are (id, name) or (id, name, parent_id), in display order.
+LOOKUPS = {
+    'client': "SELECT client_id, client_name FROM client ORDER BY client_name",
+    'employ': "SELECT employ_id, employ_name FROM employ ORDER BY employ_name",
+    'project': "SELECT project_no, project_name, client_id FROM project ORDER BY project_name",
+    'task': "SELECT task_id, task_name, project_no FROM task ORDER BY task_name",
+    'project_manager': "SELECT pm_id, manager_name, client_id FROM project_manager ORDER BY manager_name",
+    'subconsultant': "SELECT subconsultant_id, subconsultant_name FROM subconsultant ORDER BY subconsultant_name",
+}
+for _table, _sql in LOOKUPS.items():
+    prepared.register(f"lookup_{_table}", _sql)
+
+# Tables whose rows a delete on the key table removes through ON DELETE CASCADE.
+CASCADES = {
+    'client': ('project', 'project_manager', 'task'),
+    'project': ('task',),
+}
+
+
+class LookupCache:
+    """
+    In-memory copy of the small reference tables used by the dropdowns, shared by every
+    manager. A table is read once (or prefetched) and again only after invalidate() is
+    called for it, so refreshing a dropdown costs no query. Each table is indexed by id
+    for name lookups and by parent id for the client -> project -> task hierarchy, and on
+    demand by the words of its ids and names for the list search boxes; those indexes are
+    built on a worker thread. Used from the Tk thread only.
+    """
+
+    def __init__(self, db_pool):
+        self.db_pool = db_pool
+        self._rows = {}
+        self._names = {}
+        self._children = {}
+        self._generations = {}
+        self._indexes = {}
+        self._building = {}  # table -> (on_ready, on_error) of the latest search waiting for its index
+
+    def rows(self, table, parent=None):
+        """Returns the cached rows of table, optionally only those whose parent id equals parent."""
+        if table not in self._rows:
+            self._store(table, self._load(table))
+        if parent is None:
+            return self._rows[table]
+        return self._children[table].get(str(parent), [])
+
+    def name(self, table, key, default=None):
+        """Returns the display name for an id of table, or default if there is no such row."""
+        if table not in self._rows:
+            self._store(table, self._load(table))
+        return self._names[table].get(str(key), default)
+
+    def invalidate(self, *tables, cascade=False):
+        """Drops the cached copy of tables after they were written; cascade also drops their dependents."""
+        for table in tables:
+            self._rows.pop(table, None)
+            self._generations[table] = self._generations.get(table, 0) + 1
+            if cascade:
+                # Rows the delete removed are unknown here, so those indexes are rebuilt on next use
+                for dependent in CASCADES.get(table, ()):
+                    self._indexes.pop(dependent, None)
+                self.invalidate(*CASCADES.get(table, ()), cascade=True)
+
+    def search_index(self, table, executor, on_ready, on_error):
+        """
+        The SearchIndex over table's ids and names, or None while executor builds it (and
+        reads the table, if it is not cached); on_ready(index) or on_error(exc) follows.
+        """
+        index = self._indexes.get(table)
+        if index is not None:
+            return index
+        building = table in self._building
+        self._building[table] = (on_ready, on_error)
+        if building:
+            return None  # resubmitting would cancel a build that is nearly done
+        generation = self._generations.get(table, 0)
+        cached = self._rows.get(table)
+
+        def work(cursor):
+            rows = cached if cached is not None else prepared.fetch_all(cursor, f"lookup_{table}")
+            return rows, SearchIndex(rows)
+
+        def done(result):
+            ready, error = self._building.pop(table)
+            if self._generations.get(table, 0) != generation:
+                # Written while building, and update_index() had nothing to apply it to: start over
+                self.search_index(table, executor, ready, error)
+                return
+            rows, index = result
+            if table not in self._rows:
+                self._store(table, rows)
+            self._indexes[table] = index
+            ready(index)
+
+        def failed(e):
+            _, error = self._building.pop(table)
+            error(e)
+
+        executor.submit(('search_index', table), work, done, failed)
+        return None
+
+    def update_index(self, table, key, *texts):
+        """Applies a written row (id and name) to table's search index if it is built; no texts removes it."""
+        index = self._indexes.get(table)
+        if index is None:
+            return
+        if texts:
+            index.add(key, *texts)
+        else:
+            index.remove(key)
+
+    def prefetch(self, executor, on_error):
+        """Loads every lookup table on a worker thread so the first clicks are already served from memory."""
+        generations = dict(self._generations)
+
+        def work(cursor):
+            result = {}
+            for table in LOOKUPS:
+                result[table] = prepared.fetch_all(cursor, f"lookup_{table}")
+            return result
+
+        def done(result):
+            for table, rows in result.items():
+                # Skip tables written (or already loaded) while the prefetch was running
+                if table not in self._rows and self._generations.get(table, 0) == generations.get(table, 0):
+                    self._store(table, rows)
+
+        executor.submit('lookup_prefetch', work, done, on_error)
+
+    def _store(self, table, rows):
+        self._rows[table] = rows
+        self._names[table] = {str(r[0]): r[1] for r in rows}
+        children = {}
+        for r in rows:
+            if len(r) > 2:
+                children.setdefault(str(r[2]), []).append(r)
+        self._children[table] = children
+
+    def _load(self, table):
+        conn = self.db_pool.get_connection()
+        try:
+            cursor = instrument(conn.cursor(), connection=conn)
+            rows = prepared.fetch_all(cursor, f"lookup_{table}")
+            cursor.close()
+            return rows
+        finally:
+            self.db_pool.release(conn)
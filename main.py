@@ -1,14 +1,61 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import configparser
+from contextlib import contextmanager
+import importlib
+import json
 import os
-import subprocess
-import platform
+import sys
+import threading
+
+from db_pool import DatabasePool, load_db_config
+from query_worker import QueryExecutor
+from migrations import ensure_schema
+from lookup_cache import LookupCache
+from journal import open_journal
+from query_stats import DiagnosticsWindow
+
+_IMPORTS_DONE = time.perf_counter()
+
+# The manager modules (and timelog's tkcalendar/babel) are imported when their tab is first opened.
+MANAGER_TABS = [
+    # (module, class, attribute, frame attribute, display name)
+    ('main_manager', 'ClientManager', 'client_manager', 'client_project_frame', "Client & Project"),
+    ('timelog', 'TimeLogManager', 'timelog_manager', 'timelog_frame', "Time Log"),
+    ('employ_subconsultant', 'EmploySubconsultantManager', 'employ_subconsultant_manager',
+     'employ_subconsultant_frame', "Employ & Subconsultant"),
+]
+PROFILE_LOG = "startup_profile.jsonl"
 
-# Import the actual manager classes from their files
-from main_manager import ClientManager
-from timelog import TimeLogManager
-from employ_subconsultant import EmploySubconsultantManager
+
+class StartupProfile:
+    """Wall-clock breakdown of startup (imports, constructors, first paint); records nothing unless enabled."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.phases = []
+        if enabled:
+            self.phases.append(("core imports", (_IMPORTS_DONE - _PROCESS_START) * 1000))
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, (time.perf_counter() - started) * 1000))
+
+    def report(self, first_paint_ms):
+        for name, ms in self.phases:
+            print(f"{ms:9.1f} ms  {name}")
+        print(f"{first_paint_ms:9.1f} ms  time to first paint (since process start)")
+        with open(PROFILE_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'first_paint_ms': round(first_paint_ms, 1),
+                                'phases': {name: round(ms, 1) for name, ms in self.phases}}) + "\n")
+        print(f"Appended to {PROFILE_LOG}")
 
 
 class MainApplication:
@@ -16,14 +63,46 @@ class MainApplication:
     Centralized GUI application integrating all management systems.
     """
 
-    def __init__(self, master):
+    def __init__(self, master, profile=None):
         self.master = master
+        self.profile = profile or StartupProfile(False)
+        self.first_paint_ms = None
         master.title("The Schedule Plus")
         master.geometry("1200x800")  # Adjusted height after removing status bar
         master.configure(bg="#ffffff")
 
         self.create_styles()
         self.create_menu()
+        self.diagnostics_window = None
+
+        # --- Shared Database Pool and Background Query Workers ---
+        self.db_pool = None
+        self.executor = None
+        self.lookups = None
+        self.journal = None
+        with self.profile.phase("connection pool"):
+            try:
+                self.db_pool = DatabasePool.from_config('config.ini')
+                if self.db_pool is None:
+                    self.show_status_message("Database config file not found or invalid", error=True)
+            except Exception as e:
+                self.show_status_message(f"Could not open the database connection pool: {e}", error=True)
+        if self.db_pool:
+            with self.profile.phase("schema check"):
+                try:
+                    ensure_schema(self.db_pool)
+                except Exception as e:
+                    self.show_status_message(f"Could not bring the database schema up to date: {e}", error=True)
+            self.executor = QueryExecutor(master, self.db_pool)
+            self.lookups = LookupCache(self.db_pool)
+            self.lookups.prefetch(self.executor, lambda e: self.show_status_message(
+                f"Could not load the lookup tables: {e}", error=True))
+            try:
+                self.journal = open_journal(self.db_pool)  # sends entries a previous session left unsent
+            except OSError as e:
+                self.show_status_message(f"Could not open the time log journal: {e}", error=True)
+            self.master.after(self.db_pool.health_check_interval * 1000, self.check_pool_health)
+        master.protocol("WM_DELETE_WINDOW", self.exit_application)
 
         # --- Main Notebook (Tabs) ---
         self.main_notebook = ttk.Notebook(master)
@@ -44,7 +123,24 @@ class MainApplication:
         self.employ_subconsultant_manager = None
 
         self.main_notebook.bind("<<NotebookTabChanged>>", self.on_tab_selected)
-        self.load_client_manager()  # Load the first tab by default
+        self.load_manager(0)  # Load the first tab by default
+        self._map_binding = master.bind("<Map>", self._on_first_map, add='+')
+
+    def _on_first_map(self, event):
+        if event.widget is not self.master:
+            return
+        self.master.unbind("<Map>", self._map_binding)
+        self.master.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        """Runs once the main window has been mapped and drawn."""
+        self.first_paint_ms = (time.perf_counter() - _PROCESS_START) * 1000
+        if self.profile.enabled:
+            # Include the tabs not opened at startup, then report and quit
+            for index in range(1, len(MANAGER_TABS)):
+                self.load_manager(index)
+            self.profile.report(self.first_paint_ms)
+            self.exit_application()
 
     def create_menu(self):
         """Creates the main application menu bar."""
@@ -54,41 +150,55 @@ class MainApplication:
         file_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Backup Database...", command=self.backup_database)
+        file_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.master.quit)
+        file_menu.add_command(label="Exit", command=self.exit_application)
+
+    def show_diagnostics(self):
+        """Opens (or raises) the query latency window."""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.refresh()
+            self.diagnostics_window.lift()
+        else:
+            self.diagnostics_window = DiagnosticsWindow(self.master)
 
     def on_tab_selected(self, event):
         """Handles the lazy loading of managers when a tab is selected."""
         selected_tab = self.main_notebook.index(self.main_notebook.select())
-        if selected_tab == 0 and self.client_manager is None:
-            self.load_client_manager()
-        elif selected_tab == 1 and self.timelog_manager is None:
-            self.load_timelog_manager()
-        elif selected_tab == 2 and self.employ_subconsultant_manager is None:
-            self.load_employ_subconsultant_manager()
-
-    def load_client_manager(self):
-        try:
-            self.client_manager = ClientManager(self.client_project_frame, self.show_status_message)
-        except Exception as e:
-            self.handle_load_error("Client & Project", e)
-
-    def load_timelog_manager(self):
-        try:
-            self.timelog_manager = TimeLogManager(self.timelog_frame, self.show_status_message)
-        except Exception as e:
-            self.handle_load_error("Time Log", e)
+        if getattr(self, MANAGER_TABS[selected_tab][2]) is None:
+            self.load_manager(selected_tab)
 
-    def load_employ_subconsultant_manager(self):
+    def load_manager(self, index):
+        """Imports a tab's module on first use and builds its manager on the shared services."""
+        module_name, class_name, attribute, frame, display_name = MANAGER_TABS[index]
         try:
-            self.employ_subconsultant_manager = EmploySubconsultantManager(self.employ_subconsultant_frame,
-                                                                           self.show_status_message)
+            with self.profile.phase(f"import {module_name}"):
+                manager_class = getattr(importlib.import_module(module_name), class_name)
+            with self.profile.phase(f"{class_name}()"):
+                manager = manager_class(getattr(self, frame), self.show_status_message, db_pool=self.db_pool,
+                                        executor=self.executor, lookups=self.lookups)
+            setattr(self, attribute, manager)
         except Exception as e:
-            self.handle_load_error("Employ & Subconsultant", e)
+            self.handle_load_error(display_name, e)
 
     def handle_load_error(self, module_name, error):
         self.show_status_message(f"Could not load the {module_name} module: {error}", error=True)
 
+    def check_pool_health(self):
+        """Periodically pings the idle pooled sessions so dropped ones reconnect before use."""
+        threading.Thread(target=self.db_pool.check_health, name="pool-health", daemon=True).start()
+        self.master.after(self.db_pool.health_check_interval * 1000, self.check_pool_health)
+
+    def exit_application(self):
+        """Returns all pooled sessions to the server before quitting."""
+        if self.journal:
+            self.journal.close()
+        if self.executor:
+            self.executor.shutdown()
+        if self.db_pool:
+            self.db_pool.close()
+        self.master.quit()
+
     def create_styles(self):
         """Configures ttk styles for a consistent look and feel."""
         style = ttk.Style()
@@ -121,42 +231,33 @@ class MainApplication:
             print(f"STATUS: {message}")
 
     def backup_database(self):
-        """Performs a database backup using mysqldump."""
-        config = configparser.ConfigParser()
-        try:
-            config.read('config.ini')
-            db_config = config['mysql']
-            user, password, database, host = db_config['user'], db_config['password'], db_config['database'], db_config[
-                'host']
-        except Exception as e:
-            self.show_status_message(f"Could not read database info from config.ini: {e}", error=True)
+        """Backs the database up with the built-in parallel, compressed dump engine."""
+        db_config = load_db_config('config.ini')
+        if not db_config:
+            self.show_status_message("Could not read database info from config.ini", error=True)
             return
-
-        backup_path = filedialog.asksaveasfilename(defaultextension=".sql", filetypes=[("SQL Backup", "*.sql")],
-                                                   title="Save Database Backup")
-        if not backup_path:
+        target_dir = filedialog.askdirectory(title="Choose Backup Folder")
+        if not target_dir:
             self.show_status_message("Backup cancelled.")
             return
-
+        from backup import DatabaseBackup, BackupDialog, load_backup_settings  # only needed for backups
         try:
-            command = ['mysqldump', f'--user={user}', f'--password={password}', f'--host={host}', '--protocol=tcp',
-                       '--single-transaction', database]
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                process = subprocess.run(command, stdout=f, stderr=subprocess.PIPE, text=True, check=False)
-
-            if process.returncode == 0:
-                self.show_status_message(f"Database backed up to {os.path.basename(backup_path)}")
-                messagebox.showinfo("Backup Successful", f"Backup saved to:\n{backup_path}")
-            else:
-                self.handle_backup_error(process.stderr)
-
-        except FileNotFoundError:
-            error_msg = "Error: 'mysqldump' not found. Ensure MySQL client tools are installed and in your system's PATH."
-            if platform.system() == "Darwin":
-                error_msg += "\n\nOn macOS, you may need to add it to your path, e.g., in ~/.zshrc:\nexport PATH=$PATH:/usr/local/mysql/bin"
-            self.show_status_message(error_msg, error=True)
-        except Exception as e:
+            job = DatabaseBackup(db_config, target_dir, **load_backup_settings('config.ini'))
+        except ValueError as e:
             self.handle_backup_error(str(e))
+            return
+        BackupDialog(self.master, job, self._backup_finished)
+
+    def _backup_finished(self, dump_dir, error, stats):
+        if error is not None:
+            self.handle_backup_error(str(error))
+            return
+        self.show_status_message(f"Database backed up to {os.path.basename(dump_dir)}")
+        note = "" if stats['globally_consistent'] else (
+            "\n\nThe account lacks the RELOAD privilege, so each table was read from its own snapshot.")
+        summary = (f"Backup saved to:\n{dump_dir}\n\n{stats['tables_done']} tables, {stats['rows_done']:,} rows "
+                   f"in {stats['elapsed']:.1f}s ({stats['mb_per_sec']:.1f} MB/s)")
+        messagebox.showinfo("Backup Successful", summary + note)
 
     def handle_backup_error(self, error_text):
         error_msg = f"Backup failed: {error_text.strip()}"
@@ -164,6 +265,9 @@ class MainApplication:
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = MainApplication(root)
+    profile = StartupProfile('--profile-startup' in sys.argv)
+    with profile.phase("Tk root"):
+        root = tk.Tk()
+    with profile.phase("MainApplication() total"):
+        app = MainApplication(root, profile)
     root.mainloop()
\ No newline at end of file
@@ -3,37 +3,45 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import mysql.connector
-import configparser
-import os
 import string
+from db_pool import DatabasePool, TkSession
+from migrations import ensure_schema
+from query_worker import QueryExecutor
+from lookup_cache import LookupCache
+from pagination import KeysetPager, PagerBar, load_page, load_page_size
+from tree_model import TreeModel
+from lazy_tabs import LazyTabs, load_prefetch_tabs
+from query_stats import SlowQueryLabel
+from search_index import SearchBox
+from autocomplete import AutocompleteCombobox
 
 class ClientManager:
-    def __init__(self, master, status_callback=None):
+    def __init__(self, master, status_callback=None, db_pool=None, executor=None, lookups=None):
         self.master = master
         # Status bar
         self.status_var = tk.StringVar()
         self.status_bar = ttk.Label(master, textvariable=self.status_var, relief=tk.SUNKEN, anchor='w', padding=(5,2))
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.slow_query_label = SlowQueryLabel(master, prefix=f"{__name__}.")
+        self.slow_query_label.pack(side=tk.BOTTOM, fill=tk.X)
 
-        # Database connection
-        self.db_config = self.load_db_config('config.ini')
-        if not self.db_config:
-            self.show_status_message("Configuration Error: Database config file not found or invalid", error=True)
-            master.after(5000, master.destroy)
-            return
+        # Database connection (shared pool when embedded in MainApplication)
         try:
-            self.conn = mysql.connector.connect(**self.db_config)
+            self.db_pool = db_pool or DatabasePool.from_config('config.ini')
+            if not self.db_pool:
+                self.show_status_message("Configuration Error: Database config file not found or invalid", error=True)
+                master.after(5000, master.destroy)
+                return
+            if db_pool is None:
+                ensure_schema(self.db_pool)  # MainApplication migrates once at startup otherwise
+            self.conn = TkSession(self.db_pool, master)
             self.cursor = self.conn.cursor()
         except mysql.connector.Error as err:
             self.show_status_message(f"Database Connection Error: {err}", error=True)
             master.after(5000, master.destroy)
             return
-
-        # Ensure tables exist and schema updated
-        self.create_client_table()
-        self.create_project_table()
-        self.create_task_table_with_schema_update()
-        self.create_project_manager_table()
+        self.executor = executor or QueryExecutor(master, self.db_pool)
+        self.lookups = lookups or LookupCache(self.db_pool)
 
         # Constants
         self.states = [
@@ -54,6 +62,17 @@ class ClientManager:
         self.task_statuses = ["Completed","In Progress","Not Done"]
         self.billable_options = ["Yes","No"]
 
+        # Keyset pagers for the list views (ORDER BY keys, last one unique)
+        page_size = load_page_size('config.ini')
+        self.client_pager = KeysetPager("SELECT client_id,client_name,state,city FROM client",
+                                        [("client_name",1),("client_id",0)], page_size)
+        self.pm_pager = KeysetPager("SELECT pm_id,client_id,manager_name FROM project_manager",
+                                    [("client_id",1),("manager_name",2),("pm_id",0)], page_size)
+        self.project_pager = KeysetPager("SELECT project_no,client_id,project_name,client_project_manager,project_type,project_status,notes FROM project",
+                                         [("project_no",0)], page_size)
+        self.task_pager = KeysetPager("SELECT task_id,client_id,project_no,task_name,billable,hourly_rate,lumpsum,task_status,notes FROM task",
+                                      [("task_id",0)], page_size)
+
         # GUI setup
         self.create_styles()
         self.notebook = ttk.Notebook(master)
@@ -61,39 +80,24 @@ class ClientManager:
         self.project_manager_tab = ttk.Frame(self.notebook)
         self.project_tab = ttk.Frame(self.notebook)
         self.task_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.client_tab, text='Clients')
-        self.notebook.add(self.project_manager_tab, text='Project Managers')
-        self.notebook.add(self.project_tab, text='Projects')
-        self.notebook.add(self.task_tab, text='Tasks')
+        # Each sub-tab is built and populated when first selected
+        self.tabs = LazyTabs(self.notebook, load_prefetch_tabs('config.ini'))
+        self.tabs.add(self.client_tab, 'Clients', self.build_client_tab)
+        self.tabs.add(self.project_manager_tab, 'Project Managers',
+                      lambda: self.create_project_manager_widgets(self.project_manager_tab))
+        self.tabs.add(self.project_tab, 'Projects', lambda: self.create_project_widgets(self.project_tab))
+        self.tabs.add(self.task_tab, 'Tasks', lambda: self.create_task_widgets(self.task_tab))
         self.notebook.pack(expand=True, fill='both', padx=10, pady=10)
+        self.tabs.start()
 
-        # Build tabs
+    def build_client_tab(self):
         self.create_client_widgets(self.client_tab)
-        self.create_project_manager_widgets(self.project_manager_tab)
-        self.create_project_widgets(self.project_tab)
-        self.create_task_widgets(self.task_tab)
-
-        # Initial population
         self.populate_client_list()
-        self.populate_client_dropdown()
-        self.populate_project_manager_list()
-        self.populate_project_list()
-        self.populate_task_list()
 
     def show_status_message(self, message, error=False):
         self.status_var.set(message)
         self.status_bar.configure(foreground='red' if error else 'green')
 
-    def load_db_config(self, config_file):
-        cfg = configparser.ConfigParser()
-        if not os.path.exists(config_file): return None
-        cfg.read(config_file)
-        if 'mysql' not in cfg: return None
-        sec = cfg['mysql']
-        for k in ('host','user','password','database'):
-            if k not in sec: return None
-        return {k: sec[k] for k in ('host','user','password','database')}
-
     def create_styles(self):
         self.master.option_add('*Font',('Segoe UI',10))
         style = ttk.Style()
@@ -115,88 +119,6 @@ class ClientManager:
         style.map('Treeview',background=[('selected',accent)],foreground=[('selected','white')])
         style.configure('total.Treeview',background='#e6f3ff',font=('Segoe UI',10,'bold'))
 
-    # Table creation
-    def create_client_table(self):
-        try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS client (
-                    client_id VARCHAR(255) PRIMARY KEY,
-                    client_name VARCHAR(255) NOT NULL,
-                    client_address VARCHAR(255),
-                    state VARCHAR(50),
-                    city VARCHAR(100),
-                    zip_code VARCHAR(10),
-                    notes TEXT DEFAULT NULL
-                )
-            """)
-            self.conn.commit()
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error creating client table: {e}", error=True)
-
-    def create_project_manager_table(self):
-        try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_manager (
-                    pm_id INT AUTO_INCREMENT PRIMARY KEY,
-                    client_id VARCHAR(255) NOT NULL,
-                    manager_name VARCHAR(255) NOT NULL,
-                    notes TEXT DEFAULT NULL,
-                    FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE
-                )
-            """)
-            self.conn.commit()
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error creating project_manager table: {e}", error=True)
-
-    def create_project_table(self):
-        try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project (
-                    project_no VARCHAR(255) PRIMARY KEY,
-                    client_id VARCHAR(255) NOT NULL,
-                    project_name VARCHAR(255) NOT NULL,
-                    client_project_manager VARCHAR(255),
-                    project_type VARCHAR(20),
-                    project_status VARCHAR(20),
-                    notes TEXT DEFAULT NULL,
-                    FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE
-                )
-            """)
-            self.conn.commit()
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error creating project table: {e}", error=True)
-
-    def create_task_table_with_schema_update(self):
-        try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS task (
-                    task_id INT AUTO_INCREMENT PRIMARY KEY,
-                    client_id VARCHAR(255) NOT NULL,
-                    project_no VARCHAR(255) NOT NULL,
-                    task_name VARCHAR(255) NOT NULL,
-                    billable ENUM('Yes','No') NOT NULL,
-                    hourly_rate DECIMAL(10,2) DEFAULT NULL,
-                    lumpsum DECIMAL(10,2) DEFAULT NULL,
-                    task_status VARCHAR(20),
-                    notes TEXT DEFAULT NULL,
-                    FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE,
-                    FOREIGN KEY(project_no) REFERENCES project(project_no) ON DELETE CASCADE
-                )
-            """)
-            self.conn.commit()
-            # Ensure columns exist
-            self.cursor.execute("SHOW COLUMNS FROM task")
-            cols = [c[0].lower() for c in self.cursor.fetchall()]
-            alters=[]
-            if 'hourly_rate' not in cols: alters.append("ADD COLUMN hourly_rate DECIMAL(10,2) DEFAULT NULL")
-            if 'lumpsum' not in cols: alters.append("ADD COLUMN lumpsum DECIMAL(10,2) DEFAULT NULL")
-            if 'notes' not in cols: alters.append("ADD COLUMN notes TEXT DEFAULT NULL")
-            if alters:
-                self.cursor.execute(f"ALTER TABLE task {', '.join(alters)}")
-                self.conn.commit()
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error creating/updating task table: {e}", error=True)
-
     # Client tab
     def create_client_widgets(self, parent):
         parent.configure(style='TFrame')
@@ -238,6 +160,13 @@ class ClientManager:
         for c,width in zip(cols,(80,200,120,150)):
             self.client_list.heading(c,text=c if c!="ID" else "Client ID")
             self.client_list.column(c,width=width,anchor='center' if c=="ID" else 'w')
+        self.client_model = TreeModel(self.client_list, pager=self.client_pager, striped=True)
+        self.client_pager_bar = PagerBar(tv_frm, self.client_pager, self.load_client_page)
+        self.client_pager_bar.pack(side='bottom', fill='x', pady=(5,0))
+        self.client_search = SearchBox(tv_frm, self.client_pager, self.load_client_page,
+                                       lambda ready, failed: self.lookups.search_index('client', self.executor, ready, failed), "client_id",
+                                       self.populate_client_list, notes_column="notes")
+        self.client_search.pack(side='top', fill='x', pady=(0,5))
         self.client_list.pack(expand=True, fill='both')
         self.client_list.bind("<<TreeviewSelect>>", lambda e: self.load_client_details())
         # Tag colors
@@ -272,13 +201,13 @@ class ClientManager:
                 (cid,name,address,state,city,zipcode or None,notes or None)
             )
             self.conn.commit()
+            self.lookups.invalidate('client')
+            self.lookups.update_index('client', cid, cid, name)
             self.show_status_message(f"Client '{name}' added.")
             self.clear_client_input_fields()
-            # Auto-refresh lists and dropdowns
-            self.populate_client_list()
+            # Auto-refresh: apply the new row in place, then dropdowns
+            self.client_model.refresh(self.cursor, "client_id", cid)
             self.populate_client_dropdown()
-            self.populate_project_manager_list()
-            self.populate_task_list()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding client: {e}", True)
 
@@ -305,13 +234,13 @@ class ClientManager:
                 (name,address,state,city,zipcode or None,notes or None,cid)
             )
             self.conn.commit()
+            self.lookups.invalidate('client')
+            self.lookups.update_index('client', cid, cid, name)
             self.show_status_message(f"Client '{name}' updated.")
             self.clear_client_input_fields()
             # Auto-refresh
-            self.populate_client_list()
+            self.client_model.refresh(self.cursor, "client_id", cid)
             self.populate_client_dropdown()
-            self.populate_project_manager_list()
-            self.populate_task_list()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating client: {e}", True)
 
@@ -326,12 +255,15 @@ class ClientManager:
             self.cursor.execute("DELETE FROM project_manager WHERE client_id=%s",(cid,))
             self.cursor.execute("DELETE FROM client WHERE client_id=%s",(cid,))
             self.conn.commit()
+            self.lookups.invalidate('client', cascade=True)
+            self.lookups.update_index('client', cid)
             self.show_status_message(f"Client '{cid}' deleted.")
             self.clear_client_input_fields()
-            # Auto-refresh
-            self.populate_client_list()
+            # Auto-refresh; the delete cascades, so the dependent lists reload in full
+            self.client_model.remove(cid)
             self.populate_client_dropdown()
             self.populate_project_manager_list()
+            self.populate_project_list()
             self.populate_task_list()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting client: {e}", True)
@@ -365,22 +297,24 @@ class ClientManager:
         self.notes_text.delete('1.0',tk.END)
 
     def populate_client_list(self):
-        for i in self.client_list.get_children():
-            self.client_list.delete(i)
-        try:
-            self.cursor.execute("SELECT client_id,client_name,state,city FROM client ORDER BY client_name")
-            for idx, row in enumerate(self.cursor.fetchall()):
-                tag = 'evenrow' if idx%2==0 else 'oddrow'
-                self.client_list.insert('',tk.END,values=row,tags=(tag,))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error fetching clients: {e}", True)
+        if not self.tabs.is_built(self.client_tab): return
+        self.client_search.clear()
+        self.client_pager.reset()
+        self.load_client_page('first')
+
+    def load_client_page(self, direction):
+        load_page(self.executor, 'client_list', self.client_pager, direction, self._render_client_list,
+                  lambda e: self.show_status_message(f"Error fetching clients: {e}", True),
+                  tree=self.client_list, bar=self.client_pager_bar)
+
+    def _render_client_list(self, rows):
+        self.client_model.load(rows)
 
     def populate_client_dropdown(self):
+        if not self.tabs.is_built(self.project_tab): return
         try:
-            self.cursor.execute("SELECT client_id,client_name FROM client ORDER BY client_name")
-            vals = [f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            self.client_combo['values'] = vals
-            if vals and not self.client_combo.get(): self.client_combo.set(vals[0])
+            self.client_combo.set_rows(self.lookups.rows('client'))
+            if self.client_combo.get_id() is None: self.client_combo.select_first()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error populating client dropdown: {e}", True)
 
@@ -391,9 +325,9 @@ class ClientManager:
         frm.grid(row=0, column=0, padx=15, pady=15, sticky="ew")
         frm.columnconfigure(1, weight=1)
         ttk.Label(frm, text="Client:").grid(row=0, column=0, padx=8, pady=8, sticky="w")
-        self.pm_client_combo = ttk.Combobox(frm, state="readonly")
+        self.pm_client_combo = AutocompleteCombobox(frm)
         self.pm_client_combo.grid(row=0, column=1, padx=8, pady=8, sticky="ew")
-        self.pm_client_combo.bind("<<ComboboxSelected>>", lambda e: self.populate_project_manager_list(self._extract_id(self.pm_client_combo.get())))
+        self.pm_client_combo.bind("<<ComboboxSelected>>", lambda e: self.populate_project_manager_list(self.pm_client_combo.get_id()))
         ttk.Label(frm, text="Manager Name:").grid(row=1, column=0, padx=8, pady=8, sticky="w")
         self.manager_name_entry = ttk.Entry(frm, width=30)
         self.manager_name_entry.grid(row=1, column=1, padx=8, pady=8, sticky="ew")
@@ -416,6 +350,13 @@ class ClientManager:
         for c,width in zip(cols,(70,80,200)):
             self.project_manager_list.heading(c,text=c)
             self.project_manager_list.column(c,width=width,anchor='center' if "ID" in c else 'w')
+        self.pm_model = TreeModel(self.project_manager_list, pager=self.pm_pager, striped=True)
+        self.pm_pager_bar = PagerBar(tv_frm, self.pm_pager, self.load_project_manager_page)
+        self.pm_pager_bar.pack(side='bottom', fill='x', pady=(5,0))
+        self.pm_search = SearchBox(tv_frm, self.pm_pager, self.load_project_manager_page,
+                                   lambda ready, failed: self.lookups.search_index('project_manager', self.executor, ready, failed), "pm_id",
+                                   self.populate_project_manager_list, notes_column="notes")
+        self.pm_search.pack(side='top', fill='x', pady=(0,5))
         self.project_manager_list.pack(expand=True, fill='both')
         self.project_manager_list.bind("<<TreeviewSelect>>", lambda e: self.load_project_manager_details())
         self.project_manager_list.tag_configure('evenrow',background=self.row_even_color)
@@ -425,17 +366,16 @@ class ClientManager:
         self.populate_pm_client_dropdown()
 
     def populate_pm_client_dropdown(self):
+        if not self.tabs.is_built(self.project_manager_tab): return
         try:
-            self.cursor.execute("SELECT client_id,client_name FROM client ORDER BY client_name")
-            vals=[f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            self.pm_client_combo['values']=vals
-            if vals and not self.pm_client_combo.get(): self.pm_client_combo.set(vals[0])
-            self.populate_project_manager_list(self._extract_id(self.pm_client_combo.get()))
+            self.pm_client_combo.set_rows(self.lookups.rows('client'))
+            if self.pm_client_combo.get_id() is None: self.pm_client_combo.select_first()
+            self.populate_project_manager_list(self.pm_client_combo.get_id())
         except mysql.connector.Error as e:
             self.show_status_message(f"Error populating PM client dropdown: {e}", True)
 
     def add_project_manager(self):
-        cid = self._extract_id(self.pm_client_combo.get())
+        cid = self.pm_client_combo.get_id()
         name = self.manager_name_entry.get().strip()
         notes = self.pm_notes_text.get('1.0',tk.END).strip()
         if not cid or not name:
@@ -443,11 +383,14 @@ class ClientManager:
         try:
             self.cursor.execute("INSERT INTO project_manager(client_id,manager_name,notes) VALUES(%s,%s,%s)",
                                 (cid,name,notes or None))
+            pm_id = self.cursor.lastrowid
             self.conn.commit()
+            self.lookups.invalidate('project_manager')
+            self.lookups.update_index('project_manager', pm_id, pm_id, name)
             self.show_status_message("Project manager added")
             self.clear_pm_input_fields()
             # Auto-refresh
-            self.populate_project_manager_list(cid)
+            self._refresh_project_manager(cid, pm_id)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding manager: {e}", True)
 
@@ -455,7 +398,7 @@ class ClientManager:
         sel=self.project_manager_list.selection()
         if not sel: return self.show_status_message("Select a manager",True)
         pm_id = self.project_manager_list.item(sel[0])['values'][0]
-        cid = self._extract_id(self.pm_client_combo.get())
+        cid = self.pm_client_combo.get_id()
         name = self.manager_name_entry.get().strip()
         notes = self.pm_notes_text.get('1.0',tk.END).strip()
         if not cid or not name:
@@ -464,10 +407,12 @@ class ClientManager:
             self.cursor.execute("UPDATE project_manager SET client_id=%s,manager_name=%s,notes=%s WHERE pm_id=%s",
                                 (cid,name,notes or None,pm_id))
             self.conn.commit()
+            self.lookups.invalidate('project_manager')
+            self.lookups.update_index('project_manager', pm_id, pm_id, name)
             self.show_status_message("Project manager updated")
             self.clear_pm_input_fields()
             # Auto-refresh
-            self.populate_project_manager_list(cid)
+            self._refresh_project_manager(cid, pm_id)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating manager: {e}", True)
 
@@ -479,13 +424,22 @@ class ClientManager:
         try:
             self.cursor.execute("DELETE FROM project_manager WHERE pm_id=%s",(pm_id,))
             self.conn.commit()
+            self.lookups.invalidate('project_manager')
+            self.lookups.update_index('project_manager', pm_id)
             self.show_status_message("Project manager deleted")
             self.clear_pm_input_fields()
-            # Auto-refresh: refresh all
-            self.populate_pm_client_dropdown()
+            # Auto-refresh
+            self.pm_model.remove(pm_id)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting manager: {e}", True)
 
+    def _refresh_project_manager(self, client_id, pm_id):
+        # Apply the row in place when the list already shows this client (or every client)
+        if self.pm_pager.params in ((), (client_id,)):
+            self.pm_model.refresh(self.cursor, "pm_id", pm_id)
+        else:
+            self.populate_project_manager_list(client_id)
+
     def load_project_manager_details(self):
         sel = self.project_manager_list.selection()
         if not sel: return
@@ -495,7 +449,7 @@ class ClientManager:
         try:
             self.cursor.execute("SELECT notes FROM project_manager WHERE pm_id=%s",(pm_id,))
             notes = self.cursor.fetchone()[0] or ""
-            self.pm_client_combo.set(f"{self._fetch_client_name(cid)} ({cid})")
+            self.pm_client_combo.set_id(cid)
             self.manager_name_entry.delete(0,tk.END); self.manager_name_entry.insert(0,name)
             self.pm_notes_text.delete('1.0',tk.END); self.pm_notes_text.insert('1.0',notes)
         except mysql.connector.Error as e:
@@ -507,26 +461,21 @@ class ClientManager:
         self.pm_notes_text.delete('1.0',tk.END)
 
     def populate_project_manager_list(self, client_id=None):
-        for i in self.project_manager_list.get_children():
-            self.project_manager_list.delete(i)
-        try:
-            if client_id:
-                self.cursor.execute("SELECT pm_id,client_id,manager_name FROM project_manager WHERE client_id=%s ORDER BY manager_name",(client_id,))
-            else:
-                self.cursor.execute("SELECT pm_id,client_id,manager_name FROM project_manager ORDER BY client_id")
-            for idx,row in enumerate(self.cursor.fetchall()):
-                tag='evenrow' if idx%2==0 else 'oddrow'
-                self.project_manager_list.insert('',tk.END,values=row,tags=(tag,))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error fetching managers: {e}",True)
+        if not self.tabs.is_built(self.project_manager_tab): return
+        self.pm_search.clear()
+        if client_id:
+            self.pm_pager.reset("client_id=%s",(client_id,))
+        else:
+            self.pm_pager.reset()
+        self.load_project_manager_page('first')
 
-    def _fetch_client_name(self, client_id):
-        try:
-            self.cursor.execute("SELECT client_name FROM client WHERE client_id=%s",(client_id,))
-            r=self.cursor.fetchone()
-            return r[0] if r else client_id
-        except:
-            return client_id
+    def load_project_manager_page(self, direction):
+        load_page(self.executor, 'project_manager_list', self.pm_pager, direction, self._render_project_manager_list,
+                  lambda e: self.show_status_message(f"Error fetching managers: {e}",True),
+                  tree=self.project_manager_list, bar=self.pm_pager_bar)
+
+    def _render_project_manager_list(self, rows):
+        self.pm_model.load(rows)
 
     # Project tab
     def create_project_widgets(self, parent):
@@ -536,7 +485,7 @@ class ClientManager:
         frm.columnconfigure(1, weight=1)
         # Fields
         ttk.Label(frm, text="Client:").grid(row=0, column=0, padx=8, pady=8, sticky="w")
-        self.client_combo = ttk.Combobox(frm, state="readonly")
+        self.client_combo = AutocompleteCombobox(frm)
         self.client_combo.grid(row=0, column=1, padx=8, pady=8, sticky="ew")
         self.client_combo.bind("<<ComboboxSelected>>", lambda e: self.on_project_client_selected())
         ttk.Label(frm, text="Project No (unique):").grid(row=1, column=0, padx=8, pady=8, sticky="w")
@@ -574,6 +523,13 @@ class ClientManager:
         for c in cols:
             self.project_list.heading(c, text=c)
             self.project_list.column(c, width=widths[c], anchor='center' if "ID" in c or c=="Project No" else 'w')
+        self.project_model = TreeModel(self.project_list, pager=self.project_pager, striped=True)
+        self.project_pager_bar = PagerBar(tv_frm, self.project_pager, self.load_project_page)
+        self.project_pager_bar.pack(side='bottom', fill='x', pady=(5,0))
+        self.project_search = SearchBox(tv_frm, self.project_pager, self.load_project_page,
+                                        lambda ready, failed: self.lookups.search_index('project', self.executor, ready, failed), "project_no",
+                                        self.populate_project_list, notes_column="notes")
+        self.project_search.pack(side='top', fill='x', pady=(0,5))
         self.project_list.pack(expand=True, fill='both')
         self.project_list.bind("<<TreeviewSelect>>", lambda e: self.load_project_details())
         self.project_list.tag_configure('evenrow',background=self.row_even_color)
@@ -581,22 +537,21 @@ class ClientManager:
 
         # Populate dropdowns
         self.populate_client_dropdown()
-        self.populate_pm_client_dropdown()
         self.populate_project_manager_dropdown()
         self.populate_project_list()
 
     def on_project_client_selected(self):
-        cid = self._extract_id(self.client_combo.get())
+        cid = self.client_combo.get_id()
         # Refresh project manager dropdown and project list
         self.populate_project_manager_dropdown(cid)
         self.populate_project_list(cid)
 
     def populate_project_manager_dropdown(self, client_id=None):
+        if not self.tabs.is_built(self.project_tab): return
         vals=[]
         if client_id:
             try:
-                self.cursor.execute("SELECT manager_name FROM project_manager WHERE client_id=%s ORDER BY manager_name",(client_id,))
-                vals=[r[0] for r in self.cursor.fetchall()]
+                vals=[r[1] for r in self.lookups.rows('project_manager', client_id)]
             except mysql.connector.Error as e:
                 self.show_status_message(f"Error loading PMs: {e}",True)
         self.project_manager_combo['values']=vals
@@ -604,7 +559,7 @@ class ClientManager:
         self.project_manager_combo.set('')
 
     def add_project(self):
-        cid = self._extract_id(self.client_combo.get())
+        cid = self.client_combo.get_id()
         pno = self.project_no_entry.get().strip()
         pname = self.project_name_entry.get().strip()
         pmgr = self.project_manager_combo.get().strip()
@@ -623,9 +578,11 @@ class ClientManager:
                 (pno,cid,pname,pmgr or None,ptype or None,pstat or None,notes or None)
             )
             self.conn.commit()
+            self.lookups.invalidate('project')
+            self.lookups.update_index('project', pno, pno, pname)
             self.show_status_message("Project added")
             # Auto-refresh lists and dropdowns
-            self.populate_project_list(cid)
+            self._refresh_project(cid, pno)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding project: {e}",True)
 
@@ -633,7 +590,7 @@ class ClientManager:
         sel=self.project_list.selection()
         if not sel: return self.show_status_message("Select a project",True)
         old_pno=self.project_list.item(sel[0])['values'][0]
-        cid = self._extract_id(self.client_combo.get())
+        cid = self.client_combo.get_id()
         pno = self.project_no_entry.get().strip()
         pname = self.project_name_entry.get().strip()
         pmgr = self.project_manager_combo.get().strip()
@@ -646,8 +603,10 @@ class ClientManager:
             self.cursor.execute("UPDATE project SET client_id=%s,project_name=%s,client_project_manager=%s,project_type=%s,project_status=%s,notes=%s WHERE project_no=%s",
                                 (cid,pname,pmgr or None,ptype or None,pstat or None,notes or None,old_pno))
             self.conn.commit()
+            self.lookups.invalidate('project')
+            self.lookups.update_index('project', old_pno, old_pno, pname)
             self.show_status_message("Project updated")
-            self.populate_project_list(cid)
+            self._refresh_project(cid, old_pno)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating project: {e}",True)
 
@@ -659,11 +618,19 @@ class ClientManager:
         try:
             self.cursor.execute("DELETE FROM project WHERE project_no=%s",(pno,))
             self.conn.commit()
+            self.lookups.invalidate('project', cascade=True)
+            self.lookups.update_index('project', pno)
             self.show_status_message("Project deleted")
-            self.populate_project_list()
+            self.project_model.remove(pno)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting project: {e}",True)
 
+    def _refresh_project(self, client_id, project_no):
+        if self.project_pager.params in ((), (client_id,)):
+            self.project_model.refresh(self.cursor, "project_no", project_no)
+        else:
+            self.populate_project_list(client_id)
+
     def load_project_details(self):
         sel=self.project_list.selection()
         if not sel: return
@@ -671,7 +638,7 @@ class ClientManager:
         pno, cid, pname, pmgr, ptype, pstat, notes = vals
         self.project_no_entry.delete(0,tk.END); self.project_no_entry.insert(0,pno)
         self.project_name_entry.delete(0,tk.END); self.project_name_entry.insert(0,pname)
-        self.client_combo.set(f"{self._fetch_client_name(cid)} ({cid})")
+        self.client_combo.set_id(cid)
         self.populate_project_manager_dropdown(cid)
         self.project_manager_combo.set(pmgr or '')
         self.project_type_combo.set(ptype or '')
@@ -679,18 +646,21 @@ class ClientManager:
         self.project_notes_text.delete('1.0',tk.END); self.project_notes_text.insert('1.0',notes or '')
 
     def populate_project_list(self, client_id=None):
-        for i in self.project_list.get_children():
-            self.project_list.delete(i)
-        try:
-            if client_id:
-                self.cursor.execute("SELECT project_no,client_id,project_name,client_project_manager,project_type,project_status,notes FROM project WHERE client_id=%s ORDER BY project_no",(client_id,))
-            else:
-                self.cursor.execute("SELECT project_no,client_id,project_name,client_project_manager,project_type,project_status,notes FROM project ORDER BY project_no")
-            for idx,row in enumerate(self.cursor.fetchall()):
-                tag='evenrow' if idx%2==0 else 'oddrow'
-                self.project_list.insert('',tk.END,values=row,tags=(tag,))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error fetching projects: {e}",True)
+        if not self.tabs.is_built(self.project_tab): return
+        self.project_search.clear()
+        if client_id:
+            self.project_pager.reset("client_id=%s",(client_id,))
+        else:
+            self.project_pager.reset()
+        self.load_project_page('first')
+
+    def load_project_page(self, direction):
+        load_page(self.executor, 'project_list', self.project_pager, direction, self._render_project_list,
+                  lambda e: self.show_status_message(f"Error fetching projects: {e}",True),
+                  tree=self.project_list, bar=self.project_pager_bar)
+
+    def _render_project_list(self, rows):
+        self.project_model.load(rows)
 
     # Task tab (auto-refresh added)
     def create_task_widgets(self, parent):
@@ -700,13 +670,13 @@ class ClientManager:
         frm.columnconfigure(1, weight=1)
         # Fields
         ttk.Label(frm, text="Client:").grid(row=0, column=0, padx=8, pady=8, sticky="w")
-        self.task_client_combo = ttk.Combobox(frm, state="readonly")
+        self.task_client_combo = AutocompleteCombobox(frm)
         self.task_client_combo.grid(row=0, column=1, padx=8, pady=8, sticky="ew")
         self.task_client_combo.bind("<<ComboboxSelected>>", lambda e: self.on_task_client_selected())
         ttk.Label(frm, text="Project:").grid(row=1, column=0, padx=8, pady=8, sticky="w")
-        self.task_project_combo = ttk.Combobox(frm, state="readonly")
+        self.task_project_combo = AutocompleteCombobox(frm)
         self.task_project_combo.grid(row=1, column=1, padx=8, pady=8, sticky="ew")
-        self.task_project_combo.bind("<<ComboboxSelected>>", lambda e: self.populate_task_list(self._extract_id(self.task_project_combo.get())))
+        self.task_project_combo.bind("<<ComboboxSelected>>", lambda e: self.populate_task_list(self.task_project_combo.get_id()))
         ttk.Label(frm, text="Task Name:").grid(row=2, column=0, padx=8, pady=8, sticky="w")
         self.task_name_entry = ttk.Entry(frm, width=30)
         self.task_name_entry.grid(row=2, column=1, padx=8, pady=8, sticky="ew")
@@ -754,33 +724,46 @@ class ClientManager:
             self.task_list.heading(c,text=c)
             anchor='center' if c in ("Task ID","Client ID","Project No") else 'w'
             self.task_list.column(c,width=widths[c],anchor=anchor)
+        self.task_model=TreeModel(self.task_list,pager=self.task_pager,striped=True)
+        self.task_pager_bar=PagerBar(tv_frm,self.task_pager,self.load_task_page)
+        self.task_pager_bar.pack(side='bottom',fill='x',pady=(5,0))
+        self.task_search=SearchBox(tv_frm,self.task_pager,self.load_task_page,
+                                   lambda ready, failed: self.lookups.search_index('task', self.executor, ready, failed),"task_id",
+                                   self.populate_task_list,notes_column="notes")
+        self.task_search.pack(side='top',fill='x',pady=(0,5))
         self.task_list.pack(expand=True,fill="both")
         self.task_list.tag_configure('evenrow',background=self.row_even_color)
         self.task_list.tag_configure('oddrow',background=self.row_odd_color)
         self.task_list.bind("<<TreeviewSelect>>",lambda e:self.load_task_details())
 
         # Initial dropdowns and list
-        self.populate_client_dropdown()
-        self.populate_pm_client_dropdown()
-        self.populate_project_manager_dropdown(self._extract_id(self.client_combo.get()))
         self.populate_task_client_dropdown()
         self.populate_task_list()
 
     def on_task_client_selected(self):
-        cid = self._extract_id(self.task_client_combo.get())
+        cid = self.task_client_combo.get_id()
         # Refresh projects and tasks
-        self.populate_project_list(cid)
+        self.populate_task_project_dropdown(cid)
         self.populate_task_client_dropdown()  # repopulate client
 
     def populate_task_client_dropdown(self):
+        if not self.tabs.is_built(self.task_tab): return
         try:
-            self.cursor.execute("SELECT client_id,client_name FROM client ORDER BY client_name")
-            vals=[f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            self.task_client_combo['values']=vals
-            if vals and not self.task_client_combo.get(): self.task_client_combo.set(vals[0])
+            self.task_client_combo.set_rows(self.lookups.rows('client'))
+            if self.task_client_combo.get_id() is None: self.task_client_combo.select_first()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error populating task client dropdown: {e}",True)
 
+    def populate_task_project_dropdown(self, client_id=None):
+        if not self.tabs.is_built(self.task_tab): return
+        rows=[]
+        if client_id:
+            try:
+                rows=self.lookups.rows('project', client_id)
+            except mysql.connector.Error as e:
+                self.show_status_message(f"Error loading projects: {e}",True)
+        self.task_project_combo.set_rows(rows)
+
     def on_billable_changed(self):
         sel=self.billable_combo.get()
         for w in (self.hourly_rate_label,self.hourly_rate_entry,self.lumpsum_label,self.lumpsum_entry):
@@ -790,8 +773,8 @@ class ClientManager:
             self.lumpsum_label.grid();self.lumpsum_entry.grid()
 
     def add_task(self):
-        cid = self._extract_id(self.task_client_combo.get())
-        pno = self._extract_id(self.task_project_combo.get())
+        cid = self.task_client_combo.get_id()
+        pno = self.task_project_combo.get_id()
         tname = self.task_name_entry.get().strip()
         bill = self.billable_combo.get()
         hrate = self.hourly_rate_entry.get().strip()
@@ -814,10 +797,13 @@ class ClientManager:
                 "VALUES(%s,%s,%s,%s,%s,%s,%s,%s)",
                 (cid,pno,tname,bill,hrate_f or None,lump_f or None,tstat or None,notes or None)
             )
+            tid = self.cursor.lastrowid
             self.conn.commit()
+            self.lookups.invalidate('task')
+            self.lookups.update_index('task', tid, tid, tname)
             self.show_status_message("Task added")
             # Auto-refresh
-            self.populate_task_list(pno)
+            self._refresh_task(pno, tid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding task: {e}",True)
 
@@ -825,8 +811,8 @@ class ClientManager:
         sel=self.task_list.selection()
         if not sel: return self.show_status_message("Select a task",True)
         tid=self.task_list.item(sel[0])['values'][0]
-        cid = self._extract_id(self.task_client_combo.get())
-        pno = self._extract_id(self.task_project_combo.get())
+        cid = self.task_client_combo.get_id()
+        pno = self.task_project_combo.get_id()
         tname = self.task_name_entry.get().strip()
         bill = self.billable_combo.get()
         hrate = self.hourly_rate_entry.get().strip()
@@ -849,8 +835,10 @@ class ClientManager:
                 (cid,pno,tname,bill,hrate_f or None,lump_f or None,tstat or None,notes or None,tid)
             )
             self.conn.commit()
+            self.lookups.invalidate('task')
+            self.lookups.update_index('task', tid, tid, tname)
             self.show_status_message("Task updated")
-            self.populate_task_list(pno)
+            self._refresh_task(pno, tid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error updating task: {e}",True)
 
@@ -862,19 +850,27 @@ class ClientManager:
         try:
             self.cursor.execute("DELETE FROM task WHERE task_id=%s",(tid,))
             self.conn.commit()
+            self.lookups.invalidate('task')
+            self.lookups.update_index('task', tid)
             self.show_status_message("Task deleted")
-            self.populate_task_list()
+            self.task_model.remove(tid)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting task: {e}",True)
 
+    def _refresh_task(self, project_no, task_id):
+        if self.task_pager.params in ((), (project_no,)):
+            self.task_model.refresh(self.cursor, "task_id", task_id)
+        else:
+            self.populate_task_list(project_no)
+
     def load_task_details(self):
         sel=self.task_list.selection()
         if not sel: return
         vals=self.task_list.item(sel[0])['values']
         tid, cid, pno, tname, bill, hrate, lump, tstat, notes = vals
-        self.task_client_combo.set(f"{self._fetch_client_name(cid)} ({cid})")
-        self.populate_project_list(cid)
-        self.task_project_combo.set(f"{self._fetch_project_name(pno)} ({pno})")
+        self.task_client_combo.set_id(cid)
+        self.populate_task_project_dropdown(cid)
+        self.task_project_combo.set_id(pno)
         self.task_name_entry.delete(0,tk.END); self.task_name_entry.insert(0,tname)
         self.billable_combo.set(bill); self.on_billable_changed()
         self.hourly_rate_entry.delete(0,tk.END); self.hourly_rate_entry.insert(0,hrate or "")
@@ -883,31 +879,21 @@ class ClientManager:
         self.task_notes_text.delete('1.0',tk.END); self.task_notes_text.insert('1.0',notes or "")
 
     def populate_task_list(self, project_no=None):
-        for i in self.task_list.get_children():
-            self.task_list.delete(i)
-        try:
-            if project_no:
-                self.cursor.execute("SELECT task_id,client_id,project_no,task_name,billable,hourly_rate,lumpsum,task_status,notes FROM task WHERE project_no=%s ORDER BY task_id",(project_no,))
-            else:
-                self.cursor.execute("SELECT task_id,client_id,project_no,task_name,billable,hourly_rate,lumpsum,task_status,notes FROM task ORDER BY task_id")
-            for idx,row in enumerate(self.cursor.fetchall()):
-                tag='evenrow' if idx%2==0 else 'oddrow'
-                self.task_list.insert('',tk.END,values=row,tags=(tag,))
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error fetching tasks: {e}",True)
-
-    def _extract_id(self, text):
-        if '(' in text and text.endswith(')'):
-            return text.split('(')[-1][:-1]
-        return None
-
-    def _fetch_project_name(self, project_no):
-        try:
-            self.cursor.execute("SELECT project_name FROM project WHERE project_no=%s",(project_no,))
-            r=self.cursor.fetchone()
-            return r[0] if r else project_no
-        except:
-            return project_no
+        if not self.tabs.is_built(self.task_tab): return
+        self.task_search.clear()
+        if project_no:
+            self.task_pager.reset("project_no=%s",(project_no,))
+        else:
+            self.task_pager.reset()
+        self.load_task_page('first')
+
+    def load_task_page(self, direction):
+        load_page(self.executor, 'task_list', self.task_pager, direction, self._render_task_list,
+                  lambda e: self.show_status_message(f"Error fetching tasks: {e}",True),
+                  tree=self.task_list, bar=self.task_pager_bar)
+
+    def _render_task_list(self, rows):
+        self.task_model.load(rows)
 
 if __name__=="__main__":
     root=tk.Tk()
@@ -0,0 +1,375 @@
+# migrations.py
+
+from datetime import date, timedelta
+
+import mysql.connector
+from mysql.connector import errorcode
+
+import queries
+
+LOCK_NAME = "schedule_plus_migrations"
+LOCK_TIMEOUT = 30
+
+
+def add_missing_columns(table, columns):
+    """Migration step that adds any of (name, definition) columns the table does not have yet."""
+    def step(cursor):
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        existing = {c[0].lower() for c in cursor.fetchall()}
+        alters = [f"ADD COLUMN {name} {ddl}" for name, ddl in columns if name not in existing]
+        if alters:
+            cursor.execute(f"ALTER TABLE {table} {', '.join(alters)}")
+    return step
+
+
+def add_missing_indexes(table, indexes, kind="INDEX"):
+    """Migration step that creates any of (name, columns) indexes the table does not have yet."""
+    def step(cursor):
+        cursor.execute(f"SHOW INDEX FROM {table}")
+        existing = {r[2].lower() for r in cursor.fetchall()}
+        alters = [f"ADD {kind} {name} ({columns})" for name, columns in indexes if name.lower() not in existing]
+        if alters:
+            cursor.execute(f"ALTER TABLE {table} {', '.join(alters)}")
+    return step
+
+
+def surrogate_time_log_key(cursor):
+    """
+    Moves time_log off its VARCHAR(512) primary key: the string becomes the unique log_ref
+    column and log_id a BIGINT AUTO_INCREMENT. Every secondary index stores the primary key,
+    so they all shrink, and edits no longer rewrite the key and relocate the row.
+    One statement, so the table is never left without a primary key, and the old key
+    loses PRIMARY before it becomes nullable (MySQL refuses a NULL primary key column).
+    """
+    cursor.execute("SHOW COLUMNS FROM time_log")
+    if 'log_ref' in {c[0].lower() for c in cursor.fetchall()}:
+        return
+    cursor.execute("""
+        ALTER TABLE time_log
+            DROP PRIMARY KEY,
+            CHANGE log_id log_ref VARCHAR(512) NULL,
+            ADD COLUMN log_id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST,
+            ADD UNIQUE KEY uq_time_log_ref (log_ref)
+    """)
+
+
+# time_log_daily holds one row per (date, project, task, employee) with the summed hours and
+# hours x task rate, kept current by triggers so reports read days instead of individual logs.
+# Missing ids are stored as '' / 0 because they are part of the primary key.
+_DAILY_KEY = "log_date, project_no, task_id, employ_id"
+_DAILY_ADD = """
+    INSERT INTO time_log_daily({key}, hours, amount, log_count)
+    VALUES (NEW.log_date, IFNULL(NEW.project_no, ''), IFNULL(NEW.task_id, 0), IFNULL(NEW.employ_id, ''), NEW.hours,
+            NEW.hours * IFNULL((SELECT hourly_rate FROM task WHERE task_id=NEW.task_id), 0), 1)
+    ON DUPLICATE KEY UPDATE hours=hours+VALUES(hours), amount=amount+VALUES(amount), log_count=log_count+1;
+""".format(key=_DAILY_KEY)
+_DAILY_SUBTRACT = """
+    UPDATE time_log_daily
+    SET hours=hours-OLD.hours,
+        amount=amount-OLD.hours*IFNULL((SELECT hourly_rate FROM task WHERE task_id=OLD.task_id), 0),
+        log_count=log_count-1
+    WHERE log_date=OLD.log_date AND project_no=IFNULL(OLD.project_no, '')
+      AND task_id=IFNULL(OLD.task_id, 0) AND employ_id=IFNULL(OLD.employ_id, '');
+    DELETE FROM time_log_daily
+    WHERE log_date=OLD.log_date AND project_no=IFNULL(OLD.project_no, '')
+      AND task_id=IFNULL(OLD.task_id, 0) AND employ_id=IFNULL(OLD.employ_id, '') AND log_count<=0;
+"""
+
+
+# time_log's foreign keys are ON DELETE SET NULL, and foreign key actions do not fire
+# triggers: deleting an employee, task or project would leave its logs' hours in the rollup
+# under the old key. These null the references with an ordinary UPDATE first, so the
+# time_log triggers move the hours. A client delete cascades to its projects and tasks
+# without firing their triggers, so its trigger covers them as well.
+_NULL_REFERENCES = {
+    'employ': ["UPDATE time_log SET employ_id=NULL WHERE employ_id=OLD.employ_id"],
+    'task': ["UPDATE time_log SET task_id=NULL WHERE task_id=OLD.task_id"],
+    'project': [
+        "UPDATE time_log SET task_id=NULL WHERE task_id IN (SELECT task_id FROM task WHERE project_no=OLD.project_no)",
+        "UPDATE time_log SET project_no=NULL WHERE project_no=OLD.project_no",
+    ],
+    'client': [
+        "UPDATE time_log SET task_id=NULL WHERE task_id IN (SELECT task_id FROM task WHERE client_id=OLD.client_id)",
+        "UPDATE time_log SET project_no=NULL "
+        "WHERE project_no IN (SELECT project_no FROM project WHERE client_id=OLD.client_id)",
+    ],
+}
+
+
+def rebuild_daily_rollup(cursor):
+    """Recomputes time_log_daily from time_log, e.g. after logs were changed with the triggers disabled."""
+    cursor.execute("DELETE FROM time_log_daily")
+    cursor.execute(f"""
+        INSERT INTO time_log_daily({_DAILY_KEY}, hours, amount, log_count)
+        SELECT tl.log_date, IFNULL(tl.project_no, ''), IFNULL(tl.task_id, 0), IFNULL(tl.employ_id, ''),
+               SUM(tl.hours), SUM(tl.hours * IFNULL(t.hourly_rate, 0)), COUNT(*)
+        FROM time_log tl
+        LEFT JOIN task t ON tl.task_id=t.task_id
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+# Ordered list of (version, description, steps). Each step is either a SQL string or a
+# callable taking a cursor. Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Baseline schema", [
+        """CREATE TABLE IF NOT EXISTS client (
+            client_id VARCHAR(255) PRIMARY KEY,
+            client_name VARCHAR(255) NOT NULL,
+            client_address VARCHAR(255),
+            state VARCHAR(50),
+            city VARCHAR(100),
+            zip_code VARCHAR(10),
+            notes TEXT DEFAULT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS project_manager (
+            pm_id INT AUTO_INCREMENT PRIMARY KEY,
+            client_id VARCHAR(255) NOT NULL,
+            manager_name VARCHAR(255) NOT NULL,
+            notes TEXT DEFAULT NULL,
+            FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS project (
+            project_no VARCHAR(255) PRIMARY KEY,
+            client_id VARCHAR(255) NOT NULL,
+            project_name VARCHAR(255) NOT NULL,
+            client_project_manager VARCHAR(255),
+            project_type VARCHAR(20),
+            project_status VARCHAR(20),
+            notes TEXT DEFAULT NULL,
+            FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS task (
+            task_id INT AUTO_INCREMENT PRIMARY KEY,
+            client_id VARCHAR(255) NOT NULL,
+            project_no VARCHAR(255) NOT NULL,
+            task_name VARCHAR(255) NOT NULL,
+            billable ENUM('Yes','No') NOT NULL,
+            hourly_rate DECIMAL(10,2) DEFAULT NULL,
+            lumpsum DECIMAL(10,2) DEFAULT NULL,
+            task_status VARCHAR(20),
+            notes TEXT DEFAULT NULL,
+            FOREIGN KEY(client_id) REFERENCES client(client_id) ON DELETE CASCADE,
+            FOREIGN KEY(project_no) REFERENCES project(project_no) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS employ (
+            employ_id VARCHAR(50) PRIMARY KEY,
+            employ_name VARCHAR(255) NOT NULL,
+            employ_contact_number VARCHAR(20) NOT NULL,
+            employ_email_address VARCHAR(255) NOT NULL,
+            hourly_rate DECIMAL(10,2) NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS subconsultant (
+            subconsultant_id VARCHAR(50) PRIMARY KEY,
+            subconsultant_name VARCHAR(255) NOT NULL,
+            subconsultant_contact_number VARCHAR(20) NOT NULL,
+            subconsultant_email_address VARCHAR(255) NOT NULL,
+            hourly_rate DECIMAL(10,2) NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS time_log (
+            log_id VARCHAR(512) PRIMARY KEY,
+            log_date DATE NOT NULL,
+            client_id VARCHAR(255),
+            project_no VARCHAR(255),
+            task_id INT,
+            employ_id VARCHAR(50),
+            hours DECIMAL(5,2) NOT NULL,
+            notes TEXT DEFAULT NULL,
+            FOREIGN KEY (client_id) REFERENCES client(client_id) ON DELETE SET NULL,
+            FOREIGN KEY (project_no) REFERENCES project(project_no) ON DELETE SET NULL,
+            FOREIGN KEY (task_id) REFERENCES task(task_id) ON DELETE SET NULL,
+            FOREIGN KEY (employ_id) REFERENCES employ(employ_id) ON DELETE SET NULL
+        )""",
+    ]),
+    (2, "Backfill columns added to task and employ after their first release", [
+        add_missing_columns('task', [
+            ('hourly_rate', "DECIMAL(10,2) DEFAULT NULL"),
+            ('lumpsum', "DECIMAL(10,2) DEFAULT NULL"),
+            ('notes', "TEXT DEFAULT NULL"),
+        ]),
+        add_missing_columns('employ', [
+            ('hourly_rate', "DECIMAL(10,2) NOT NULL DEFAULT 0"),
+        ]),
+    ]),
+    (3, "Index time_log by date, task+date and employee+date", [
+        add_missing_indexes('time_log', [
+            ('idx_time_log_date', "log_date"),
+            ('idx_time_log_task_date', "task_id, log_date"),
+            ('idx_time_log_employ_date', "employ_id, log_date"),
+        ]),
+    ]),
+    (4, "Index the ORDER BY keys of the paginated list views", [
+        add_missing_indexes('client', [('idx_client_name', "client_name")]),
+        add_missing_indexes('project_manager', [('idx_project_manager_client_name', "client_id, manager_name")]),
+        add_missing_indexes('employ', [('idx_employ_name', "employ_name")]),
+        add_missing_indexes('subconsultant', [('idx_subconsultant_name', "subconsultant_name")]),
+    ]),
+    (5, "Give time_log an integer surrogate key and keep the old string id as log_ref", [
+        surrogate_time_log_key,
+    ]),
+    (6, "Maintain the time_log_daily rollup with triggers", [
+        f"""CREATE TABLE IF NOT EXISTS time_log_daily (
+            log_date DATE NOT NULL,
+            project_no VARCHAR(255) NOT NULL DEFAULT '',
+            task_id INT NOT NULL DEFAULT 0,
+            employ_id VARCHAR(50) NOT NULL DEFAULT '',
+            hours DECIMAL(12,2) NOT NULL DEFAULT 0,
+            amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+            log_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY ({_DAILY_KEY}),
+            KEY idx_time_log_daily_task_date (task_id, log_date)
+        )""",
+        "DROP TRIGGER IF EXISTS trg_time_log_daily_insert",
+        "DROP TRIGGER IF EXISTS trg_time_log_daily_update",
+        "DROP TRIGGER IF EXISTS trg_time_log_daily_delete",
+        "DROP TRIGGER IF EXISTS trg_task_rate_daily",
+        f"CREATE TRIGGER trg_time_log_daily_insert AFTER INSERT ON time_log FOR EACH ROW BEGIN {_DAILY_ADD} END",
+        f"CREATE TRIGGER trg_time_log_daily_update AFTER UPDATE ON time_log FOR EACH ROW "
+        f"BEGIN {_DAILY_SUBTRACT} {_DAILY_ADD} END",
+        f"CREATE TRIGGER trg_time_log_daily_delete AFTER DELETE ON time_log FOR EACH ROW BEGIN {_DAILY_SUBTRACT} END",
+        # amount is always hours x the task's current rate, as view_task_data computes it
+        """CREATE TRIGGER trg_task_rate_daily AFTER UPDATE ON task FOR EACH ROW
+            UPDATE time_log_daily SET amount=hours*IFNULL(NEW.hourly_rate, 0)
+            WHERE task_id=NEW.task_id AND NOT (OLD.hourly_rate <=> NEW.hourly_rate)""",
+        rebuild_daily_rollup,
+    ]),
+    (7, "Full-text index the notes searched from the list views", [
+        add_missing_indexes('client', [('ft_client_notes', "notes")], kind="FULLTEXT INDEX"),
+        add_missing_indexes('project_manager', [('ft_project_manager_notes', "notes")], kind="FULLTEXT INDEX"),
+        add_missing_indexes('project', [('ft_project_notes', "notes")], kind="FULLTEXT INDEX"),
+        add_missing_indexes('task', [('ft_task_notes', "notes")], kind="FULLTEXT INDEX"),
+    ]),
+    (8, "Keep time_log_daily current when a referenced row is deleted", [
+        step
+        for table, updates in _NULL_REFERENCES.items()
+        for step in (f"DROP TRIGGER IF EXISTS trg_{table}_null_time_log",
+                     f"CREATE TRIGGER trg_{table}_null_time_log BEFORE DELETE ON {table} FOR EACH ROW "
+                     f"BEGIN {' '.join(u + ';' for u in updates)} END")
+    ] + [rebuild_daily_rollup]),  # repairs the hours earlier deletes left under their old keys
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+class MigrationRunner:
+    """
+    Applies pending MIGRATIONS once and records them in schema_version.
+    On an up-to-date database this costs a single SELECT of the version number.
+    """
+
+    def __init__(self, conn, migrations=MIGRATIONS):
+        self.conn = conn
+        self.migrations = migrations
+
+    def current_version(self, cursor):
+        try:
+            cursor.execute("SELECT MAX(version) FROM schema_version")
+        except mysql.connector.Error as e:
+            if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                raise
+            return 0
+        row = cursor.fetchone()
+        return (row[0] or 0) if row else 0
+
+    def run(self):
+        """Applies every pending migration and returns the list of versions applied."""
+        cursor = self.conn.cursor()
+        try:
+            if self.current_version(cursor) >= self.migrations[-1][0]:
+                return []
+            # Several desktops may start at once; only one of them migrates.
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+            if not cursor.fetchone()[0]:
+                raise mysql.connector.Error(msg="Timed out waiting for another client to finish migrating")
+            try:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INT PRIMARY KEY,
+                        description VARCHAR(255) NOT NULL,
+                        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                version = self.current_version(cursor)
+                applied = []
+                for number, description, steps in self.migrations:
+                    if number <= version:
+                        continue
+                    for step in steps:
+                        if callable(step):
+                            step(cursor)
+                        else:
+                            cursor.execute(step)
+                    cursor.execute("INSERT INTO schema_version(version,description) VALUES(%s,%s)",
+                                   (number, description))
+                    self.conn.commit()
+                    applied.append(number)
+                return applied
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+# Hot-path queries and the index each one is expected to use on time_log (alias tl).
+HOT_PATHS = [
+    ("populate_time_log_list(for_date)", queries.TIME_LOGS_FOR_DATE, lambda d, t, e: (d,), 'idx_time_log_date'),
+    ("view_logs_by_date", queries.VIEW_LOGS_BY_DATE, lambda d, t, e: (d,), 'idx_time_log_date'),
+    ("view_task_data", queries.TASK_LOGS_IN_RANGE, lambda d, t, e: (t, d.replace(day=1), d), 'idx_time_log_task_date'),
+    ("employee timesheet range", queries.EMPLOY_LOGS_IN_RANGE, lambda d, t, e: (e, d.replace(day=1), d),
+     'idx_time_log_employ_date'),
+    ("load_week", queries.EMPLOY_WEEK_LOGS, lambda d, t, e: (e, d - timedelta(days=6), d), 'idx_time_log_employ_date'),
+]
+
+
+def explain_hot_paths(cursor):
+    """Runs EXPLAIN on each hot-path query and returns (name, expected_index, chosen_index, ok) rows."""
+    cursor.execute("SELECT task_id, employ_id FROM time_log WHERE task_id IS NOT NULL LIMIT 1")
+    sample = cursor.fetchone() or (0, 0)
+    today = date.today()
+    results = []
+    for name, sql, params, expected in HOT_PATHS:
+        cursor.execute("EXPLAIN " + sql, params(today, sample[0], sample[1]))
+        cols = [d[0].lower() for d in cursor.description]
+        chosen = None
+        for row in cursor.fetchall():
+            plan = dict(zip(cols, row))
+            if plan.get('table') == 'tl':
+                chosen = plan.get('key')
+        results.append((name, expected, chosen, chosen == expected))
+    return results
+
+
+def ensure_schema(db_pool):
+    """Brings the database up to the latest schema version using a pooled connection."""
+    conn = db_pool.get_connection()
+    try:
+        return MigrationRunner(conn).run()
+    finally:
+        db_pool.release(conn)
+
+
+if __name__ == "__main__":
+    import sys
+    from db_pool import DatabasePool
+    pool = DatabasePool.from_config('config.ini')
+    if pool is None:
+        raise SystemExit("Database config file not found or invalid")
+    applied = ensure_schema(pool)
+    print(f"Applied migrations: {applied}" if applied else f"Schema is up to date (version {LATEST_VERSION})")
+    if '--rebuild-rollup' in sys.argv:
+        conn = pool.get_connection()
+        cur = conn.cursor()
+        rebuild_daily_rollup(cur)
+        conn.commit()
+        pool.release(conn)
+        print("Rebuilt time_log_daily")
+    if '--explain' in sys.argv:
+        conn = pool.get_connection()
+        cur = conn.cursor()
+        failures = 0
+        for name, expected, chosen, ok in explain_hot_paths(cur):
+            print(f"{'OK  ' if ok else 'MISS'} {name}: expected {expected}, plan uses {chosen or 'a full scan'}")
+            failures += not ok
+        pool.release(conn)
+        sys.exit(1 if failures else 0)
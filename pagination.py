@@ -0,0 +1,174 @@
+# pagination.py
+
+import configparser
+import os
+from tkinter import ttk
+
+from query_worker import fetch_rows
+
+DEFAULT_PAGE_SIZE = 100
+PAGE_SIZES = (50, 100, 250, 500, 1000)
+
+
+def load_page_size(config_file='config.ini'):
+    """Reads page_size from the optional [ui] section of config.ini."""
+    cfg = configparser.ConfigParser()
+    if os.path.exists(config_file):
+        cfg.read(config_file)
+    try:
+        return int(cfg['ui'].get('page_size', DEFAULT_PAGE_SIZE)) if 'ui' in cfg else DEFAULT_PAGE_SIZE
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+
+
+class KeysetPager:
+    """
+    Builds seek (keyset) queries for one list view. Pages are addressed by the ORDER BY
+    key values of their first and last rows rather than by OFFSET, so every page costs
+    one index range read of page_size rows however deep the user goes.
+
+    keys is a list of (column, row_index) pairs; the last key must be unique.
+    """
+
+    def __init__(self, select, keys, page_size=DEFAULT_PAGE_SIZE, descending=False):
+        self.select = select
+        self.keys = keys
+        self.page_size = page_size
+        self.descending = descending
+        self.where = ""
+        self.params = ()
+        self.page = 1
+        self.has_next = False
+        self.has_prev = False
+        self._first_key = None
+        self._last_key = None
+
+    def reset(self, where="", params=()):
+        """Starts over at page one with a new filter."""
+        self.where, self.params = where, tuple(params)
+        self.page = 1
+        self.has_next = self.has_prev = False
+        self._first_key = self._last_key = None
+
+    def query(self, direction):
+        """Returns (sql, params) for 'first', 'next', 'prev' or 'current' (reload this page)."""
+        backwards = direction == 'prev'
+        if direction == 'next' and self._last_key is not None:
+            seek, values = self._seek('<' if self.descending else '>', self._last_key)
+        elif direction == 'prev' and self._first_key is not None:
+            seek, values = self._seek('>' if self.descending else '<', self._first_key)
+        elif direction == 'current' and self._first_key is not None:
+            seek, values = self._seek('<' if self.descending else '>', self._first_key, inclusive=True)
+        else:
+            seek, values = "", ()
+        conditions = [c for c in (self.where, seek) if c]
+        sql = self.select
+        if conditions:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        order = 'ASC' if self.descending == backwards else 'DESC'
+        sql += " ORDER BY " + ",".join(f"{col} {order}" for col, _ in self.keys)
+        sql += f" LIMIT {int(self.page_size) + 1}"
+        return sql, self.params + values
+
+    def accept(self, rows, direction):
+        """Updates the page position from the rows query(direction) returned; returns the rows to show."""
+        more = len(rows) > self.page_size
+        rows = list(rows[:self.page_size])
+        if direction == 'prev':
+            rows.reverse()
+            self.page = max(1, self.page - 1)
+            self.has_prev, self.has_next = more, True
+        elif direction == 'next':
+            self.page += 1
+            self.has_prev, self.has_next = True, more
+        elif direction == 'first':
+            self.page = 1
+            self.has_prev, self.has_next = False, more
+        else:
+            self.has_next = more
+        if rows:
+            self._first_key = self._key(rows[0])
+            self._last_key = self._key(rows[-1])
+        elif direction == 'prev':
+            self.reset(self.where, self.params)
+        return rows
+
+    def row_query(self, column, value):
+        """Returns (sql, params) that re-reads one row through this pager's filter."""
+        conditions = [c for c in (self.where, f"{column}=%s") if c]
+        sql = self.select + " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        return sql, self.params + (value,)
+
+    def sort_key(self, row):
+        """Python ordering of a row that matches the ORDER BY of query() (case-insensitive text)."""
+        return self._fold(self._key(row))
+
+    @property
+    def first_key(self):
+        """sort_key() of the current page's first row, or None before a page is shown."""
+        return None if self._first_key is None else self._fold(self._first_key)
+
+    @property
+    def last_key(self):
+        """sort_key() of the current page's last row, or None before a page is shown."""
+        return None if self._last_key is None else self._fold(self._last_key)
+
+    @staticmethod
+    def _fold(key):
+        return tuple(v.casefold() if isinstance(v, str) else v for v in key)
+
+    def _key(self, row):
+        return tuple(row[i] for _, i in self.keys)
+
+    def _seek(self, op, key, inclusive=False):
+        # (k1 op v1) OR (k1 = v1 AND k2 op v2) OR ... -- expanded so MySQL can range-scan the index
+        terms, values = [], []
+        for n in range(len(self.keys)):
+            parts = [f"{self.keys[i][0]}=%s" for i in range(n)]
+            last_op = op + '=' if inclusive and n == len(self.keys) - 1 else op
+            parts.append(f"{self.keys[n][0]}{last_op}%s")
+            terms.append("(" + " AND ".join(parts) + ")")
+            values.extend(key[:n + 1])
+        return " OR ".join(terms), tuple(values)
+
+
+def load_page(executor, key, pager, direction, render, on_error, tree=None, bar=None):
+    """Fetches one page of pager in the background and hands the rows to render()."""
+    sql, params = pager.query(direction)
+
+    def done(rows):
+        render(pager.accept(rows, direction))
+        if bar is not None:
+            bar.refresh()
+
+    return executor.submit(key, fetch_rows(sql, params), done, on_error, tree=tree)
+
+
+class PagerBar(ttk.Frame):
+    """Previous/next controls, page indicator and page-size selector for a KeysetPager."""
+
+    def __init__(self, master, pager, load, **kw):
+        super().__init__(master, **kw)
+        self.pager = pager
+        self.load = load
+        self.prev_btn = ttk.Button(self, text="< Previous", command=lambda: self.load('prev'))
+        self.prev_btn.pack(side='left', padx=5)
+        self.page_label = ttk.Label(self, text="Page 1")
+        self.page_label.pack(side='left', padx=10)
+        self.next_btn = ttk.Button(self, text="Next >", command=lambda: self.load('next'))
+        self.next_btn.pack(side='left', padx=5)
+        self.size_combo = ttk.Combobox(self, values=PAGE_SIZES, state="readonly", width=6)
+        self.size_combo.set(pager.page_size)
+        self.size_combo.pack(side='right', padx=5)
+        self.size_combo.bind("<<ComboboxSelected>>", lambda e: self._on_size_changed())
+        ttk.Label(self, text="Rows per page:").pack(side='right')
+        self.refresh()
+
+    def refresh(self):
+        self.page_label.config(text=f"Page {self.pager.page}")
+        self.prev_btn.state(['!disabled'] if self.pager.has_prev else ['disabled'])
+        self.next_btn.state(['!disabled'] if self.pager.has_next else ['disabled'])
+
+    def _on_size_changed(self):
+        self.pager.page_size = int(self.size_combo.get())
+        self.load('current')
@@ -0,0 +1,90 @@
+# prepared.py
+
+import threading
+import weakref
+
+import queries
+from query_stats import TimedCursor
+
+# Named hot-path statements. Each runs as a server-side prepared statement that is parsed
+# once per pooled session and then only executed with new parameters.
+_REGISTRY = {
+    'time_logs_for_date': queries.TIME_LOGS_FOR_DATE,
+    'time_log_by_id': queries.TIME_LOG_BY_ID,
+    'view_logs_by_date': queries.VIEW_LOGS_BY_DATE,
+    'project_report': queries.PROJECT_REPORT,
+    'task_rate': queries.TASK_RATE,
+    'task_logs_in_range': queries.TASK_LOGS_IN_RANGE,
+    'task_totals_in_range': queries.TASK_TOTALS_IN_RANGE,
+    'employ_week_logs': queries.EMPLOY_WEEK_LOGS,
+}
+_lock = threading.Lock()
+# underlying connection -> (server connection id, {name: prepared cursor})
+_cursors = weakref.WeakKeyDictionary()
+
+
+def register(name, sql):
+    """Adds a named statement to the registry (modules register their own hot queries at import)."""
+    if _REGISTRY.get(name, sql) != sql:
+        raise ValueError(f"Query '{name}' is already registered with different SQL")
+    _REGISTRY[name] = sql
+    return name
+
+
+def names():
+    return sorted(_REGISTRY)
+
+
+def sql(name):
+    return _REGISTRY[name]
+
+
+def prepared_cursor(conn, name):
+    """
+    Returns the prepared cursor for name on conn's session, creating it on first use.
+    Cursors belong to the real connection behind the pool's wrapper, so they survive
+    checkouts; a reconnect (new connection id) discards them with the old session.
+    """
+    cnx = getattr(conn, '_cnx', conn)
+    with _lock:
+        entry = _cursors.get(cnx)
+        if entry is None or entry[0] != cnx.connection_id:
+            entry = _cursors[cnx] = (cnx.connection_id, {})
+        cursor = entry[1].get(name)
+        if cursor is None:
+            cursor = entry[1][name] = cnx.cursor(prepared=True)
+    return cursor
+
+
+def execute(cursor, name, params=()):
+    """
+    Runs the named statement on cursor's connection through its cached prepared cursor and
+    returns that cursor for fetching. Falls back to a plain execute on cursor when it does
+    not know its connection (it was not created through query_stats.instrument()).
+    """
+    conn = getattr(cursor, 'connection', None)
+    if conn is None:
+        cursor.execute(_REGISTRY[name], params)
+        return cursor
+    target = prepared_cursor(conn, name)
+    if isinstance(cursor, TimedCursor):
+        target = TimedCursor(target, cursor.stats, cursor.site, conn)
+    target.execute(_REGISTRY[name], params)
+    return target
+
+
+def fetch_all(cursor, name, params=()):
+    return execute(cursor, name, params).fetchall()
+
+
+def fetch_one(cursor, name, params=()):
+    # The result is always read to the end so the prepared cursor can be executed again.
+    rows = fetch_all(cursor, name, params)
+    return rows[0] if rows else None
+
+
+def fetch_named(name, params=()):
+    """fetch_rows() for a named statement: a unit of work for QueryExecutor."""
+    def work(cursor):
+        return fetch_all(cursor, name, params)
+    return work
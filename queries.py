@@ -0,0 +1,111 @@
+# queries.py
+
+# Time-log listing shared by the entry tab (for one date or everything) and the date view.
+TIME_LOG_SELECT = """
+    SELECT tl.log_id, tl.log_date, c.client_name, p.project_name, t.task_name, e.employ_name, tl.hours, tl.notes,
+           c.client_id, p.project_no, t.task_id, e.employ_id
+    FROM time_log tl
+    LEFT JOIN client c ON tl.client_id=c.client_id
+    LEFT JOIN project p ON tl.project_no=p.project_no
+    LEFT JOIN task t ON tl.task_id=t.task_id
+    LEFT JOIN employ e ON tl.employ_id=e.employ_id
+"""
+
+TIME_LOGS_FOR_DATE = TIME_LOG_SELECT + " WHERE tl.log_date=%s ORDER BY tl.log_id DESC"
+
+# Single row re-read after a write, applied to the lists in place.
+TIME_LOG_BY_ID = TIME_LOG_SELECT + " WHERE tl.log_id=%s"
+
+# Rows the write-behind journal has just inserted, by their log_ref (an IN list of placeholders).
+TIME_LOGS_BY_REF = TIME_LOG_SELECT + " WHERE tl.log_ref IN ({})"
+
+COUNT_TIME_LOGS = "SELECT COUNT(*) FROM time_log"
+
+# Windows over every time log, newest first, for the virtualized "Show All Logs" list.
+# The OFFSET form walks only the narrow date index before joining, and the seek form
+# continues directly after the last row of the previous window.
+ALL_TIME_LOGS_WINDOW = """
+    SELECT tl.log_id, tl.log_date, c.client_name, p.project_name, t.task_name, e.employ_name, tl.hours, tl.notes,
+           c.client_id, p.project_no, t.task_id, e.employ_id
+    FROM (SELECT log_id FROM time_log ORDER BY log_date DESC, log_id DESC LIMIT %s OFFSET %s) w
+    JOIN time_log tl ON tl.log_id=w.log_id
+    LEFT JOIN client c ON tl.client_id=c.client_id
+    LEFT JOIN project p ON tl.project_no=p.project_no
+    LEFT JOIN task t ON tl.task_id=t.task_id
+    LEFT JOIN employ e ON tl.employ_id=e.employ_id
+    ORDER BY tl.log_date DESC, tl.log_id DESC
+"""
+
+ALL_TIME_LOGS_AFTER = TIME_LOG_SELECT + """
+    WHERE tl.log_date < %s OR (tl.log_date = %s AND tl.log_id < %s)
+    ORDER BY tl.log_date DESC, tl.log_id DESC LIMIT %s
+"""
+
+# Every time log, oldest first, for exports.
+ALL_TIME_LOGS = TIME_LOG_SELECT + " ORDER BY tl.log_date, tl.log_id"
+
+VIEW_LOGS_BY_DATE = """
+    SELECT tl.log_id, tl.log_date, c.client_name, p.project_name, t.task_name, e.employ_name, tl.hours, tl.notes
+    FROM time_log tl
+    LEFT JOIN client c ON tl.client_id=c.client_id
+    LEFT JOIN project p ON tl.project_no=p.project_no
+    LEFT JOIN task t ON tl.task_id=t.task_id
+    LEFT JOIN employ e ON tl.employ_id=e.employ_id
+    WHERE tl.log_date=%s ORDER BY tl.log_id
+"""
+
+# Report totals come from the time_log_daily rollup (one row per date, task and employee),
+# so their cost grows with the number of days worked rather than the number of logs.
+PROJECT_REPORT = """
+    SELECT t.task_id, t.task_name,
+           MIN(d.log_date) AS start_date,
+           MAX(d.log_date) AS end_date,
+           SUM(d.hours) AS total_hours,
+           GROUP_CONCAT(DISTINCT e.employ_name SEPARATOR ', ') AS employees
+    FROM task t
+    LEFT JOIN time_log_daily d ON t.task_id=d.task_id
+    LEFT JOIN employ e ON d.employ_id=e.employ_id
+    WHERE t.project_no=%s
+    GROUP BY t.task_id,t.task_name ORDER BY t.task_name
+"""
+
+TASK_RATE = "SELECT hourly_rate, lumpsum FROM task WHERE task_id=%s"
+
+TASK_LOGS_IN_RANGE = """
+    SELECT tl.log_id, tl.log_date, e.employ_name, tl.hours, tl.notes
+    FROM time_log tl
+    LEFT JOIN employ e ON tl.employ_id=e.employ_id
+    WHERE tl.task_id=%s AND tl.log_date BETWEEN %s AND %s
+    ORDER BY tl.log_date
+"""
+
+TASK_TOTALS_IN_RANGE = """
+    SELECT COALESCE(SUM(hours), 0), COALESCE(SUM(amount), 0)
+    FROM time_log_daily
+    WHERE task_id=%s AND log_date BETWEEN %s AND %s
+"""
+
+# TASK_LOGS_IN_RANGE with the task's rates on every row, so an export needs a single streamed query.
+TASK_LOGS_WITH_RATE_IN_RANGE = """
+    SELECT tl.log_id, tl.log_date, e.employ_name, tl.hours, t.hourly_rate, t.lumpsum, tl.notes
+    FROM time_log tl
+    JOIN task t ON tl.task_id=t.task_id
+    LEFT JOIN employ e ON tl.employ_id=e.employ_id
+    WHERE tl.task_id=%s AND tl.log_date BETWEEN %s AND %s
+    ORDER BY tl.log_date
+"""
+
+# One employee's logs for a week, with the keys the week grid needs to add more logs to each task.
+EMPLOY_WEEK_LOGS = """
+    SELECT tl.log_id, tl.log_date, tl.task_id, tl.hours, tl.client_id, tl.project_no
+    FROM time_log tl
+    WHERE tl.employ_id=%s AND tl.log_date BETWEEN %s AND %s
+    ORDER BY tl.log_date, tl.log_id
+"""
+
+EMPLOY_LOGS_IN_RANGE = """
+    SELECT tl.log_id, tl.log_date, tl.task_id, tl.hours
+    FROM time_log tl
+    WHERE tl.employ_id=%s AND tl.log_date BETWEEN %s AND %s
+    ORDER BY tl.log_date
+"""
@@ -0,0 +1,280 @@
+# query_stats.py
+
+import json
+import re
+import sys
+import threading
+import time
+from collections import deque
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+RING_SIZE = 2000
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is everything slower.
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+SLOW_WINDOW_SECONDS = 60
+REFRESH_MS = 1000
+# Helper modules between a manager and its cursor; the call site is the first frame outside them.
+_HELPER_MODULES = {'query_stats', 'query_worker', 'lookup_cache', 'pagination', 'tree_model', 'prepared'}
+
+
+def call_site():
+    """Names the manager method that issued the current query, e.g. 'timelog.TimeLogManager.view_task_data'."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module not in _HELPER_MODULES:
+            code = frame.f_code
+            name = getattr(code, 'co_qualname', code.co_name).split('.<locals>')[0]
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def param_shape(params):
+    """Describes parameters by type only, so recorded queries never hold the values themselves."""
+    if params is None:
+        return ""
+    if isinstance(params, dict):
+        return "{" + ", ".join(sorted(params)) + "}"
+    if isinstance(params, (list, tuple)) and params and isinstance(params[0], (list, tuple)):
+        return f"{len(params)} x ({', '.join(type(p).__name__ for p in params[0])})"
+    return "(" + ", ".join(type(p).__name__ for p in params) + ")"
+
+
+class QueryRecord:
+    __slots__ = ('site', 'sql', 'params', 'rows', 'ms', 'at')
+
+    def __init__(self, site, sql, params, rows, ms):
+        self.site = site
+        self.sql = sql
+        self.params = params
+        self.rows = rows
+        self.ms = ms
+        self.at = time.time()
+
+    def as_dict(self):
+        return {'site': self.site, 'sql': self.sql, 'params': self.params, 'rows': self.rows,
+                'ms': round(self.ms, 2), 'at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.at))}
+
+
+class QueryStats:
+    """
+    Thread-safe record of executed queries: the last RING_SIZE of them (SQL, parameter
+    types, rows, latency including fetching) and a latency histogram per call site.
+    """
+
+    def __init__(self, ring_size=RING_SIZE):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=ring_size)
+        self._sites = {}
+
+    def add(self, record):
+        bucket = next((i for i, bound in enumerate(BUCKETS_MS) if record.ms < bound), len(BUCKETS_MS))
+        with self._lock:
+            self._recent.append(record)
+            site = self._sites.get(record.site)
+            if site is None:
+                site = self._sites[record.site] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                                                   'buckets': [0] * (len(BUCKETS_MS) + 1)}
+            site['calls'] += 1
+            site['total_ms'] += record.ms
+            site['max_ms'] = max(site['max_ms'], record.ms)
+            site['rows'] += record.rows
+            site['buckets'][bucket] += 1
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def sites(self):
+        with self._lock:
+            return {name: dict(s, buckets=list(s['buckets'])) for name, s in self._sites.items()}
+
+    def slowest(self, prefix="", seconds=SLOW_WINDOW_SECONDS):
+        """The slowest query of the last seconds whose call site starts with prefix, or None."""
+        since = time.time() - seconds
+        with self._lock:
+            return max((r for r in self._recent if r.at >= since and r.site.startswith(prefix)),
+                       key=lambda r: r.ms, default=None)
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._sites.clear()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'buckets_ms': list(BUCKETS_MS), 'sites': self.sites(),
+                       'recent': [r.as_dict() for r in self.recent()]}, f, indent=2)
+
+
+STATS = QueryStats()  # shared by every manager and the background workers
+
+
+class TimedCursor:
+    """
+    Cursor wrapper that times execute() and the fetches that follow it. A query is recorded
+    once its result is consumed (fetchall, an exhausted fetch, the next execute or close).
+    site fixes the call site, for work run on a QueryExecutor thread; otherwise it is
+    taken from the stack on every execute. connection is the cursor's connection, which
+    prepared.execute() needs to find the session's prepared statements.
+    """
+
+    def __init__(self, cursor, stats=STATS, site=None, connection=None):
+        self._wrapped = cursor
+        self._connection = connection
+        self.stats = stats
+        self.site = site
+        self._pending = None
+
+    @property
+    def _cursor(self):
+        """The cursor being timed; a subclass may resolve it on every use."""
+        return self._wrapped
+
+    @property
+    def connection(self):
+        return self._connection
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _start(self, method, operation, params, *args, **kwargs):
+        self._finish()
+        site = self.site or call_site()
+        started = time.perf_counter()
+        try:
+            return method(operation, params, *args, **kwargs)
+        finally:
+            rows = self._cursor.rowcount if self._cursor.rowcount and self._cursor.rowcount > 0 else 0
+            sql = re.sub(r"\s+", " ", operation).strip()
+            self._pending = QueryRecord(site, sql, param_shape(params), 0 if self._cursor.with_rows else rows,
+                                        (time.perf_counter() - started) * 1000)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._start(self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._start(self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._pending is not None:
+            self._pending.ms += (time.perf_counter() - started) * 1000
+            if isinstance(result, list):
+                self._pending.rows += len(result)
+            elif result is not None:
+                self._pending.rows += 1
+            if not result or method == self._cursor.fetchall:
+                self._finish()
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def _finish(self):
+        if self._pending is not None:
+            self.stats.add(self._pending)
+            self._pending = None
+
+
+def instrument(cursor, stats=STATS, site=None, connection=None):
+    return TimedCursor(cursor, stats, site, connection)
+
+
+class SlowQueryLabel(ttk.Label):
+    """Status-bar label showing the slowest query a manager issued in the last minute."""
+
+    def __init__(self, master, prefix, stats=STATS, **kwargs):
+        super().__init__(master, anchor='e', foreground='#808080', padding=(5, 0), **kwargs)
+        self.prefix = prefix
+        self.stats = stats
+        self._job = self.after(REFRESH_MS, self._refresh)
+
+    def _refresh(self):
+        record = self.stats.slowest(self.prefix)
+        if record is None:
+            self.configure(text="")
+        else:
+            site = record.site[len(self.prefix):].split('.')[-1]
+            self.configure(text=f"Slowest query (last min): {record.ms:.0f} ms in {site}, {record.rows} rows")
+        self._job = self.after(REFRESH_MS, self._refresh)
+
+    def destroy(self):
+        self.after_cancel(self._job)
+        super().destroy()
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Latency histogram per call site and the slowest recent queries, with a JSON dump."""
+
+    def __init__(self, master, stats=STATS):
+        super().__init__(master)
+        self.stats = stats
+        self.title("Query Diagnostics")
+        self.geometry("1000x600")
+
+        bucket_names = [f"<{b}ms" if b < 1000 else f"<{b // 1000}s" for b in BUCKETS_MS]
+        bucket_names.append(f">={BUCKETS_MS[-1] // 1000}s")
+        columns = ("Call Site", "Calls", "Mean ms", "Max ms", "Rows") + tuple(bucket_names)
+        ttk.Label(self, text="Latency by call site").pack(anchor='w', padx=10, pady=(10, 0))
+        self.site_tree = ttk.Treeview(self, columns=columns, show='headings', height=10)
+        for col in columns:
+            self.site_tree.heading(col, text=col)
+            self.site_tree.column(col, width=300 if col == "Call Site" else 60, anchor='w' if col == "Call Site" else 'e')
+        self.site_tree.pack(fill='both', expand=True, padx=10, pady=5)
+
+        ttk.Label(self, text="Slowest recent queries").pack(anchor='w', padx=10)
+        columns = ("ms", "Rows", "Call Site", "Parameters", "SQL")
+        self.recent_tree = ttk.Treeview(self, columns=columns, show='headings', height=10)
+        for col, width in zip(columns, (60, 60, 250, 120, 500)):
+            self.recent_tree.heading(col, text=col)
+            self.recent_tree.column(col, width=width, anchor='e' if col in ("ms", "Rows") else 'w')
+        self.recent_tree.pack(fill='both', expand=True, padx=10, pady=5)
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill='x', padx=10, pady=(0, 10))
+        ttk.Button(buttons, text="Refresh", command=self.refresh).pack(side='left')
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Save...", command=self.save).pack(side='right')
+        self.refresh()
+
+    def refresh(self):
+        for tree in (self.site_tree, self.recent_tree):
+            for i in tree.get_children():
+                tree.delete(i)
+        sites = sorted(self.stats.sites().items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for name, s in sites:
+            self.site_tree.insert("", tk.END, values=[name, s['calls'], f"{s['total_ms'] / s['calls']:.1f}",
+                                                      f"{s['max_ms']:.1f}", s['rows']] + s['buckets'])
+        for r in sorted(self.stats.recent(), key=lambda r: r.ms, reverse=True)[:100]:
+            self.recent_tree.insert("", tk.END, values=[f"{r.ms:.1f}", r.rows, r.site, r.params, r.sql])
+
+    def reset(self):
+        self.stats.reset()
+        self.refresh()
+
+    def save(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON file", "*.json")], title="Save Query Statistics")
+        if not path:
+            return
+        try:
+            self.stats.dump(path)
+        except OSError as e:
+            messagebox.showerror("Save Query Statistics", f"Could not save: {e}", parent=self)
@@ -0,0 +1,199 @@
+# query_worker.py
+
+import queue
+import threading
+
+import mysql.connector
+
+from query_stats import call_site, instrument
+
+POLL_INTERVAL_MS = 15
+
+
+def fetch_rows(query, params=()):
+    """Returns a unit of work that runs one SELECT and fetches every row."""
+    def work(cursor):
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    return work
+
+
+def show_loading(tree, text="Loading..."):
+    """Replaces a Treeview's rows with a single placeholder row while its query runs."""
+    for i in tree.get_children():
+        tree.delete(i)
+    tree.tag_configure('loading', foreground='#808080')
+    tree.insert("", "end", values=(text,), tags=('loading',))
+    tree.configure(cursor='watch')
+
+
+def clear_loading(tree):
+    for i in tree.tag_has('loading'):
+        tree.delete(i)
+    tree.configure(cursor='')
+
+
+class QueryRequest:
+    """A single queued unit of work; cancel() drops its result and interrupts it if running."""
+
+    def __init__(self, executor, key, work, on_done, on_error, tree, site):
+        self.executor = executor
+        self.key = key
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.tree = tree
+        self.site = site  # the method that submitted it, for query statistics
+        self.cancelled = False
+        self.connection_id = None
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        self.executor.cancel(self)
+
+
+class QueryExecutor:
+    """
+    Runs database work on background threads so the Tk mainloop never blocks on MySQL.
+    Each job borrows its own pooled connection; results are handed back to the UI
+    thread through master.after(). Submitting a new job under the same key cancels
+    the previous one, so a stale result never overwrites a newer one. KILL QUERY goes
+    through a connection of its own, so a cancel never waits for a busy pool.
+    """
+
+    def __init__(self, master, db_pool, workers=None):
+        self.master = master
+        self.db_pool = db_pool
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._active = {}
+        self._polling = False
+        self._kill_conn = None
+        self._kill_lock = threading.Lock()  # guards _kill_conn, which cancel threads share
+        self._threads = []
+        for n in range(workers or db_pool.query_workers):
+            t = threading.Thread(target=self._worker, name=f"query-worker-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, key, work, on_done, on_error, tree=None):
+        """Queues work(cursor) under key; on_done(result) or on_error(exc) runs on the Tk thread."""
+        previous = self._active.get(key)
+        if previous is not None:
+            self.cancel(previous)
+        request = QueryRequest(self, key, work, on_done, on_error, tree, call_site())
+        self._active[key] = request
+        if tree is not None:
+            show_loading(tree)
+        self._jobs.put(request)
+        self._ensure_polling()
+        return request
+
+    def cancel(self, request):
+        """Cancels a request (or the request active under a key) and interrupts its query."""
+        if not isinstance(request, QueryRequest):
+            request = self._active.get(request)
+            if request is None:
+                return
+        request.cancelled = True
+        if self._active.get(request.key) is request:
+            del self._active[request.key]
+            if request.tree is not None:
+                clear_loading(request.tree)
+        if request.connection_id is not None:
+            threading.Thread(target=self._kill_query, args=(request,), daemon=True).start()
+
+    def pending(self):
+        return len(self._active)
+
+    def shutdown(self):
+        for request in list(self._active.values()):
+            self.cancel(request)
+        for _ in self._threads:
+            self._jobs.put(None)
+        # A cancel still connecting must not hold up exit; its connection ends with the process
+        if not self._kill_lock.acquire(blocking=False):
+            return
+        try:
+            if self._kill_conn is not None:
+                try:
+                    self._kill_conn.close()
+                except mysql.connector.Error:
+                    pass
+                self._kill_conn = None
+        finally:
+            self._kill_lock.release()
+
+    def _kill_query(self, request):
+        with self._kill_lock:
+            if request.connection_id is None:
+                return  # already finished
+            # Connected before taking the request lock: over a dropped network this can take the
+            # whole connect timeout, and the worker needs that lock to move on once its query ends.
+            try:
+                if self._kill_conn is None or not self._kill_conn.is_connected():
+                    self._kill_conn = self.db_pool.connect()
+            except mysql.connector.Error:
+                return
+            # Holding the request lock guarantees the worker has not moved on to another job
+            # on the same session, so KILL QUERY can only ever interrupt this request.
+            with request.lock:
+                if request.connection_id is None:
+                    return
+                try:
+                    cur = self._kill_conn.cursor()
+                    cur.execute(f"KILL QUERY {int(request.connection_id)}")
+                    cur.close()
+                except mysql.connector.Error:
+                    pass
+
+    def _worker(self):
+        while True:
+            request = self._jobs.get()
+            if request is None:
+                return
+            if request.cancelled:
+                continue
+            conn = None
+            try:
+                conn = self.db_pool.get_connection()
+                with request.lock:
+                    request.connection_id = conn.connection_id
+                cursor = instrument(conn.cursor(), site=request.site, connection=conn)
+                try:
+                    result = request.work(cursor)
+                finally:
+                    with request.lock:
+                        request.connection_id = None
+                    cursor.close()
+                self._results.put((request, result, None))
+            except Exception as e:
+                self._results.put((request, None, e))
+            finally:
+                if conn is not None:
+                    self.db_pool.release(conn)
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.master.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                request, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if request.cancelled or self._active.get(request.key) is not request:
+                continue
+            del self._active[request.key]
+            if request.tree is not None:
+                clear_loading(request.tree)
+            if error is None:
+                request.on_done(result)
+            else:
+                request.on_error(error)
+        if self._active:
+            self.master.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,85 @@
+# report_export.py
+
+import csv
+import os
+
+import mysql.connector
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX export is optional; CSV always works
+    Workbook = None
+
+FETCH_SIZE = 2000
+FILE_TYPES = [("CSV file", "*.csv"), ("Excel workbook", "*.xlsx")]
+
+
+class CsvSink:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxSink:
+    """Write-only openpyxl workbook: rows are streamed to disk instead of being kept as cells in memory."""
+
+    def __init__(self, path):
+        if Workbook is None:
+            raise RuntimeError("Excel export needs the openpyxl package (pip install openpyxl); choose CSV instead")
+        self.path = path
+        self.book = Workbook(write_only=True)
+        self.sheet = self.book.create_sheet()
+
+    def write(self, row):
+        self.sheet.append(list(row))
+
+    def close(self):
+        self.book.save(self.path)
+
+
+def open_sink(path):
+    """Picks the writer from the file extension (.xlsx, otherwise CSV)."""
+    return XlsxSink(path) if path.lower().endswith('.xlsx') else CsvSink(path)
+
+
+def export_query(sql, params, path, headers, format_row=None, footer=None, fetch_size=FETCH_SIZE):
+    """
+    Returns a unit of work for QueryExecutor that streams the result of sql into path and
+    returns the number of rows written. The pool's cursors are unbuffered, so fetchmany()
+    pulls fetch_size rows at a time off the socket and memory stays constant however large
+    the result is. footer() may return one last row (e.g. totals) to append.
+    """
+    def work(cursor):
+        sink = open_sink(path)
+        count = 0
+        try:
+            sink.write(headers)
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    sink.write(format_row(row) if format_row else row)
+                count += len(rows)
+            last = footer() if footer else None
+            if last:
+                sink.write(last)
+        except BaseException:
+            # Drain the rest of the result so the pooled session stays usable, and drop the partial file
+            try:
+                cursor.fetchall()
+            except mysql.connector.Error:
+                pass
+            sink.close()
+            os.remove(path)
+            raise
+        sink.close()
+        return count
+    return work
@@ -0,0 +1,216 @@
+# schema_check.py
+
+import re
+import sys
+
+import mysql.connector
+
+# The columns each join key is stored in and the type the code's DDL gives it (migrations 1 and 6).
+# MySQL only uses an index for a join or foreign key when both sides have the same type and
+# collation; otherwise it converts every row, so all columns of a key must match exactly.
+KEY_COLUMNS = {
+    'client_id': ("varchar(255)", [('client', 'client_id'), ('project', 'client_id'),
+                                   ('project_manager', 'client_id'), ('task', 'client_id'),
+                                   ('time_log', 'client_id')]),
+    'project_no': ("varchar(255)", [('project', 'project_no'), ('task', 'project_no'),
+                                    ('time_log', 'project_no'), ('time_log_daily', 'project_no')]),
+    'task_id': ("int", [('task', 'task_id'), ('time_log', 'task_id'), ('time_log_daily', 'task_id')]),
+    'employ_id': ("varchar(50)", [('employ', 'employ_id'), ('time_log', 'employ_id'),
+                                  ('time_log_daily', 'employ_id')]),
+}
+
+_DISPLAY_WIDTH = re.compile(r"^(tinyint|smallint|mediumint|int|bigint)\(\d+\)")
+_VARCHAR = re.compile(r"^(?:var)?char\((\d+)\)$")
+
+
+def normalize_type(column_type):
+    """COLUMN_TYPE without the integer display width older servers report, e.g. 'int(11)' -> 'int'."""
+    return _DISPLAY_WIDTH.sub(r"\1", column_type.lower())
+
+
+def is_text(column_type):
+    return 'char' in column_type or 'text' in column_type
+
+
+def is_lossy(live, expected):
+    """True if converting a live column to the expected type may fail or truncate values."""
+    live_len, expected_len = _VARCHAR.match(live), _VARCHAR.match(expected)
+    if live_len and expected_len:
+        return int(expected_len.group(1)) < int(live_len.group(1))
+    return is_text(live) and not is_text(expected)
+
+
+class Column:
+    __slots__ = ('table', 'name', 'type', 'charset', 'collation', 'nullable', 'default', 'extra')
+
+    def __init__(self, table, name, column_type, charset, collation, nullable, default, extra):
+        self.table = table
+        self.name = name
+        self.type = normalize_type(column_type)
+        self.charset = charset
+        self.collation = collation
+        self.nullable = nullable == 'YES'
+        self.default = default
+        self.extra = (extra or "").lower()
+
+
+class Drift:
+    """One key column whose type or collation differs from what the key requires."""
+    __slots__ = ('key', 'column', 'expected_type', 'expected_collation', 'problems')
+
+    def __init__(self, key, column, expected_type, expected_collation, problems):
+        self.key = key
+        self.column = column
+        self.expected_type = expected_type
+        self.expected_collation = expected_collation
+        self.problems = problems
+
+    def __str__(self):
+        return f"{self.key}: {self.column.table}.{self.column.name} {'; '.join(self.problems)}"
+
+
+class SchemaInspector:
+    """
+    Reads the live column definitions and foreign keys from information_schema, reports
+    every join key column that does not match KEY_COLUMNS (or the other side of a foreign
+    key), and generates the ALTER TABLE statements that realign them.
+    """
+
+    def __init__(self, cursor, key_columns=KEY_COLUMNS):
+        self.cursor = cursor
+        self.key_columns = key_columns
+        cursor.execute("SELECT DEFAULT_CHARACTER_SET_NAME, DEFAULT_COLLATION_NAME FROM information_schema.SCHEMATA "
+                       "WHERE SCHEMA_NAME=DATABASE()")
+        self.charset, self.collation = cursor.fetchone()
+        cursor.execute("""
+            SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, CHARACTER_SET_NAME, COLLATION_NAME,
+                   IS_NULLABLE, COLUMN_DEFAULT, EXTRA
+            FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE()
+        """)
+        self.columns = {(r[0].lower(), r[1].lower()): Column(*r) for r in cursor.fetchall()}
+        cursor.execute("""
+            SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME,
+                   k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE
+            FROM information_schema.KEY_COLUMN_USAGE k
+            JOIN information_schema.REFERENTIAL_CONSTRAINTS r
+              ON r.CONSTRAINT_SCHEMA=k.CONSTRAINT_SCHEMA AND r.TABLE_NAME=k.TABLE_NAME
+             AND r.CONSTRAINT_NAME=k.CONSTRAINT_NAME
+            WHERE k.TABLE_SCHEMA=DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL
+            ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        """)
+        self.foreign_keys = cursor.fetchall()
+
+    def drift(self):
+        """Every key column whose type or collation differs from its key's expected definition."""
+        found = []
+        for key, (expected_type, columns) in self.key_columns.items():
+            expected_collation = self.collation if is_text(expected_type) else None
+            for table, name in columns:
+                column = self.columns.get((table, name))
+                if column is None:
+                    continue
+                problems = []
+                if column.type != expected_type:
+                    problems.append(f"is {column.type}, expected {expected_type}")
+                if column.collation != expected_collation and column.type == expected_type:
+                    problems.append(f"collation {column.collation}, expected {expected_collation}")
+                if problems:
+                    found.append(Drift(key, column, expected_type, expected_collation, problems))
+        return found
+
+    def foreign_key_mismatches(self):
+        """(constraint, child column, parent column) for every foreign key whose two sides differ."""
+        mismatches = []
+        for table, constraint, column, ref_table, ref_column, _, _ in self.foreign_keys:
+            child = self.columns.get((table.lower(), column.lower()))
+            parent = self.columns.get((ref_table.lower(), ref_column.lower()))
+            if child and parent and (child.type, child.collation) != (parent.type, parent.collation):
+                mismatches.append((constraint, child, parent))
+        return mismatches
+
+    def _modify(self, d):
+        c = d.column
+        parts = [f"MODIFY `{c.name}` {d.expected_type.upper()}"]
+        if d.expected_collation:
+            parts.append(f"CHARACTER SET {self.charset} COLLATE {d.expected_collation}")
+        parts.append("NULL" if c.nullable else "NOT NULL")
+        if c.default is not None and 'auto_increment' not in c.extra:
+            parts.append("DEFAULT '{}'".format(c.default.replace("'", "''")))
+        if 'auto_increment' in c.extra and not is_text(d.expected_type):
+            parts.append("AUTO_INCREMENT")
+        return " ".join(parts)
+
+    def alter_statements(self, drift=None):
+        """
+        The statements that give every drifted column its expected definition: the foreign
+        keys on those columns are dropped first and recreated afterwards, since MySQL will not
+        change the type of a column while a constraint ties it to another.
+        """
+        drift = self.drift() if drift is None else drift
+        changed = {(d.column.table.lower(), d.column.name.lower()) for d in drift}
+        constraints = {}
+        for table, constraint, column, ref_table, ref_column, on_update, on_delete in self.foreign_keys:
+            if (table.lower(), column.lower()) in changed or (ref_table.lower(), ref_column.lower()) in changed:
+                fk = constraints.setdefault((table, constraint), [table, [], ref_table, [], on_update, on_delete])
+                fk[1].append(column)
+                fk[3].append(ref_column)
+        statements = [f"ALTER TABLE `{table}` DROP FOREIGN KEY `{constraint}`" for table, constraint in constraints]
+        by_table = {}
+        for d in drift:
+            by_table.setdefault(d.column.table, []).append(self._modify(d))
+        for table, modifies in by_table.items():
+            statements.append(f"ALTER TABLE `{table}` {', '.join(modifies)}")
+        for (table, constraint), (_, cols, ref_table, ref_cols, on_update, on_delete) in constraints.items():
+            statements.append(
+                f"ALTER TABLE `{table}` ADD CONSTRAINT `{constraint}` FOREIGN KEY ({', '.join(f'`{c}`' for c in cols)}) "
+                f"REFERENCES `{ref_table}` ({', '.join(f'`{c}`' for c in ref_cols)}) "
+                f"ON DELETE {on_delete} ON UPDATE {on_update}")
+        return statements
+
+
+def check_schema(cursor):
+    """Returns (drift, foreign key mismatches, ALTER statements) for the current database."""
+    inspector = SchemaInspector(cursor)
+    drift = inspector.drift()
+    return drift, inspector.foreign_key_mismatches(), inspector.alter_statements(drift)
+
+
+if __name__ == "__main__":
+    import argparse
+    from db_pool import load_db_config
+
+    parser = argparse.ArgumentParser(description="Compare the join key columns with the schema the code expects.")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--sql", action="store_true", help="print the ALTER statements that realign the columns")
+    parser.add_argument("--apply", action="store_true", help="run the ALTER statements")
+    parser.add_argument("--yes", action="store_true", help="do not ask before altering tables")
+    args = parser.parse_args()
+
+    db_config = load_db_config(args.config)
+    if not db_config:
+        raise SystemExit("Database config file not found or invalid")
+    conn = mysql.connector.connect(**db_config)
+    cur = conn.cursor()
+    drift, mismatches, statements = check_schema(cur)
+    for d in drift:
+        lossy = " (may truncate or reject existing values)" if is_lossy(d.column.type, d.expected_type) else ""
+        print(f"DRIFT {d}{lossy}")
+    for constraint, child, parent in mismatches:
+        print(f"FK    {constraint}: {child.table}.{child.name} {child.type} {child.collation or ''} -> "
+              f"{parent.table}.{parent.name} {parent.type} {parent.collation or ''}")
+    if not drift and not mismatches:
+        print("Join key columns match the expected schema")
+    if args.sql or args.apply:
+        for statement in statements:
+            print(statement + ";")
+    if args.apply and statements:
+        if not args.yes:
+            answer = input(f"Alter {len(statements)} table definitions in '{db_config['database']}'? [y/N] ")
+            if answer.strip().lower() != 'y':
+                raise SystemExit("Cancelled")
+        for statement in statements:
+            cur.execute(statement)
+        print("Realigned the key columns; run 'python migrations.py --explain' to check the plans")
+        drift, mismatches = [], []
+    conn.close()
+    sys.exit(1 if drift or mismatches else 0)
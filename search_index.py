@@ -0,0 +1,155 @@
+# search_index.py
+
+import re
+from bisect import bisect_left, insort
+from tkinter import ttk
+
+SEARCH_DELAY_MS = 250   # after the last keystroke
+MAX_MATCHES = 500       # ids passed to the list query; refine the search beyond this
+MIN_FULLTEXT_TERM = 3   # InnoDB's default innodb_ft_min_token_size
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(*texts):
+    return [t for text in texts if text is not None for t in _TOKEN.findall(str(text).casefold())]
+
+
+class SearchIndex:
+    """
+    Prefix index over the words of a few columns per row, for as-you-type filtering. Every
+    (word, row) pair is kept in one sorted list, so the rows with a word starting with a
+    term are a single bisect range; a search returns the rows matching all of its terms, in
+    the order the rows were given. add() and remove() keep it current after writes.
+    """
+
+    def __init__(self, rows=(), columns=(0, 1)):
+        self._entries = []   # sorted (word, position)
+        self._keys = []      # position -> row key
+        self._words = {}     # str(row key) -> (position, words); Treeviews hand numeric ids back as int
+        for row in rows:
+            position, words = self._insert(row[0], [row[c] for c in columns])
+            self._entries.extend((w, position) for w in words)
+        self._entries.sort()
+
+    def __len__(self):
+        return len(self._words)
+
+    def _insert(self, key, texts):
+        position = len(self._keys)
+        self._keys.append(key)
+        words = set(tokenize(*texts))
+        self._words[str(key)] = (position, words)
+        return position, words
+
+    def add(self, key, *texts):
+        """Indexes a new or changed row; it sorts after the rows the index was built from."""
+        self.remove(key)
+        position, words = self._insert(key, texts)
+        for w in words:
+            insort(self._entries, (w, position))
+
+    def remove(self, key):
+        position, words = self._words.pop(str(key), (None, ()))
+        for w in words:
+            i = bisect_left(self._entries, (w, position))
+            if i < len(self._entries) and self._entries[i] == (w, position):
+                del self._entries[i]
+
+    def search(self, text, limit=None):
+        """Keys of the rows that have, for every term of text, a word starting with it."""
+        terms = sorted(set(tokenize(text)), key=len, reverse=True)  # longer terms usually match fewer rows
+        matched = None
+        for term in terms:
+            lo = bisect_left(self._entries, (term,))
+            hi = bisect_left(self._entries, (term + '\uffff',), lo)
+            positions = {p for _, p in self._entries[lo:hi]}
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                return []
+        keys = [self._keys[p] for p in sorted(matched or ())]
+        return keys[:limit] if limit else keys
+
+
+def search_filter(index, text, id_column, notes_column=None, limit=MAX_MATCHES):
+    """
+    Returns (where, params, matches) for KeysetPager.reset(): the rows whose ids the index
+    matches, or failing that a FULLTEXT search of notes_column; matches is the number of
+    index hits, or None when the filter went to the server.
+    """
+    keys = index.search(text, limit + 1)
+    if keys:
+        shown = keys[:limit]
+        return f"{id_column} IN ({', '.join(['%s'] * len(shown))})", tuple(shown), len(keys)
+    terms = [t for t in tokenize(text) if len(t) >= MIN_FULLTEXT_TERM]
+    if notes_column and terms:
+        return f"MATCH({notes_column}) AGAINST (%s IN BOOLEAN MODE)", (" ".join(f"+{t}*" for t in terms),), None
+    return "1=0", (), 0
+
+
+class SearchBox(ttk.Frame):
+    """
+    Search entry for a paged list. Typing filters the list through search_filter() once the
+    user pauses; clearing the box calls show_all() to restore the unfiltered list. index is
+    called with (on_ready, on_error) and returns the SearchIndex, or None while it is built.
+    """
+
+    def __init__(self, master, pager, load, index, id_column, show_all, notes_column=None, **kw):
+        super().__init__(master, **kw)
+        self.pager = pager
+        self.load = load
+        self.index = index
+        self.id_column = id_column
+        self.show_all = show_all
+        self.notes_column = notes_column
+        self._after = None
+        ttk.Label(self, text="Search:").pack(side='left')
+        self.entry = ttk.Entry(self)
+        self.entry.pack(side='left', fill='x', expand=True, padx=5)
+        self.result_label = ttk.Label(self, foreground='#808080')
+        self.result_label.pack(side='right')
+        self.entry.bind("<KeyRelease>", lambda e: self._schedule())
+        self.entry.bind("<Escape>", lambda e: (self.clear(), self.show_all()))
+
+    def text(self):
+        return self.entry.get().strip()
+
+    def clear(self):
+        """Empties the box without reloading the list (the caller is about to)."""
+        if self._after is not None:
+            self.after_cancel(self._after)
+            self._after = None
+        self.entry.delete(0, 'end')
+        self.result_label.config(text="")
+
+    def _schedule(self):
+        if self._after is not None:
+            self.after_cancel(self._after)
+        self._after = self.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        self._after = None
+        text = self.text()
+        if not text:
+            self.result_label.config(text="")
+            return self.show_all()
+        index = self.index(self._index_ready, self._index_failed)
+        if index is None:
+            self.result_label.config(text="Indexing...")
+            return
+        where, params, matches = search_filter(index, text, self.id_column, self.notes_column)
+        if matches is None:
+            self.result_label.config(text="Matching notes")
+        elif matches > MAX_MATCHES:
+            self.result_label.config(text=f"First {MAX_MATCHES} matches, refine the search")
+        else:
+            self.result_label.config(text=f"{matches} match{'es' if matches != 1 else ''}")
+        self.pager.reset(where, params)
+        self.load('first')
+
+    def _index_ready(self, index):
+        if self.text():
+            self.search()
+
+    def _index_failed(self, error):
+        self.result_label.config(text=f"Search unavailable: {error}")
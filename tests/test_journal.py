@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+import mysql.connector
+
+from journal import TimeLogJournal
+
+
+class OfflinePool:
+    """A pool whose server cannot be reached, so the flusher keeps every entry."""
+
+    def get_connection(self, timeout=None):
+        raise mysql.connector.Error("server unreachable")
+
+
+def entry(ref):
+    return {'log_ref': ref, 'log_date': '2024-03-04', 'client_id': 'C1', 'project_no': 'P1',
+            'task_id': 10, 'employ_id': 'E1', 'hours': 1.5, 'notes': None}
+
+
+class RecoverTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "journal.jsonl")
+
+    def open(self):
+        journal = TimeLogJournal(OfflinePool(), self.path)
+        self.addCleanup(journal.close)
+        return journal
+
+    def records(self):
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_replays_only_unsent_entries(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for ref in ('a', 'b', 'c', 'd'):
+                f.write(json.dumps({'op': 'add', 'entry': entry(ref)}) + "\n")
+            f.write(json.dumps({'op': 'done', 'log_refs': ['a', 'c']}) + "\n")
+            f.write(json.dumps({'op': 'rejected', 'log_refs': ['d'], 'entry': entry('d'), 'error': 'x'}) + "\n")
+            f.write('{"op": "add", "entry": {"log_ref": "e"')  # torn by a crash mid-write
+        journal = self.open()
+        self.assertEqual(journal.pending(), 1)
+        self.assertEqual(self.records(), [{'op': 'add', 'entry': entry('b')}])
+
+    def test_missing_file_starts_empty(self):
+        self.assertEqual(self.open().pending(), 0)
+        self.assertEqual(self.records(), [])
+
+    def test_added_entries_survive_a_restart(self):
+        journal = self.open()
+        ref = journal.add('2024-03-04', 'C1', 'P1', 10, 'E1', 1.5)
+        self.assertTrue(ref.startswith("20240304-10-E1-"))
+        journal.close()
+        self.assertEqual(self.open().pending(), 1)
+        self.assertEqual([r['entry']['log_ref'] for r in self.records()], [ref])
+
+
+if __name__ == '__main__':
+    unittest.main()
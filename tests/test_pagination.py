@@ -0,0 +1,94 @@
+import unittest
+
+from pagination import KeysetPager
+
+SELECT = "SELECT client_id, client_name FROM client"
+KEYS = [("client_name", 1), ("client_id", 0)]
+
+
+def rows(*names):
+    return [(n, name) for n, name in enumerate(names, start=1)]
+
+
+class KeysetPagerTest(unittest.TestCase):
+
+    def test_first_page(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        sql, params = pager.query('first')
+        self.assertEqual(sql, SELECT + " ORDER BY client_name ASC,client_id ASC LIMIT 3")
+        self.assertEqual(params, ())
+        shown = pager.accept(rows("Ann", "Bob", "Cal"), 'first')
+        self.assertEqual(shown, rows("Ann", "Bob"))
+        self.assertEqual((pager.page, pager.has_prev, pager.has_next), (1, False, True))
+        self.assertEqual((pager.first_key, pager.last_key), (("ann", 1), ("bob", 2)))
+
+    def test_next_seeks_after_last_key(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        pager.accept(rows("Ann", "Bob", "Cal"), 'first')
+        sql, params = pager.query('next')
+        self.assertEqual(sql, SELECT + " WHERE ((client_name>%s) OR (client_name=%s AND client_id>%s))"
+                                       " ORDER BY client_name ASC,client_id ASC LIMIT 3")
+        self.assertEqual(params, ("Bob", "Bob", 2))
+        pager.accept([(3, "Cal")], 'next')
+        self.assertEqual((pager.page, pager.has_prev, pager.has_next), (2, True, False))
+
+    def test_prev_seeks_before_first_key_and_reverses(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        pager.accept(rows("Ann", "Bob", "Cal"), 'first')
+        pager.accept([(3, "Cal"), (4, "Dee"), (5, "Eve")], 'next')
+        sql, params = pager.query('prev')
+        self.assertEqual(sql, SELECT + " WHERE ((client_name<%s) OR (client_name=%s AND client_id<%s))"
+                                       " ORDER BY client_name DESC,client_id DESC LIMIT 3")
+        self.assertEqual(params, ("Cal", "Cal", 3))
+        shown = pager.accept([(2, "Bob"), (1, "Ann")], 'prev')
+        self.assertEqual(shown, rows("Ann", "Bob"))
+        self.assertEqual((pager.page, pager.has_prev, pager.has_next), (1, False, True))
+
+    def test_current_reloads_from_first_key_inclusive(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        pager.accept(rows("Ann", "Bob"), 'first')
+        sql, params = pager.query('current')
+        self.assertIn("((client_name>%s) OR (client_name=%s AND client_id>=%s))", sql)
+        self.assertEqual(params, ("Ann", "Ann", 1))
+
+    def test_descending_flips_the_seek(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2, descending=True)
+        sql, _ = pager.query('first')
+        self.assertTrue(sql.endswith("ORDER BY client_name DESC,client_id DESC LIMIT 3"))
+        pager.accept([(3, "Cal"), (2, "Bob"), (1, "Ann")], 'first')
+        sql, params = pager.query('next')
+        self.assertIn("((client_name<%s) OR (client_name=%s AND client_id<%s))", sql)
+        self.assertTrue(sql.endswith("ORDER BY client_name DESC,client_id DESC LIMIT 3"))
+        self.assertEqual(params, ("Bob", "Bob", 2))
+        sql, _ = pager.query('prev')
+        self.assertIn("(client_name>%s)", sql)
+        self.assertTrue(sql.endswith("ORDER BY client_name ASC,client_id ASC LIMIT 3"))
+
+    def test_filter_comes_before_the_seek(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        pager.reset("client_id IN (%s, %s)", (1, 2))
+        pager.accept(rows("Ann", "Bob", "Cal"), 'first')
+        sql, params = pager.query('next')
+        self.assertIn(" WHERE (client_id IN (%s, %s)) AND ((client_name>%s)", sql)
+        self.assertEqual(params, (1, 2, "Bob", "Bob", 2))
+
+    def test_empty_prev_page_starts_over(self):
+        pager = KeysetPager(SELECT, KEYS, page_size=2)
+        pager.accept(rows("Ann", "Bob", "Cal"), 'first')
+        pager.accept([], 'prev')
+        self.assertEqual((pager.page, pager.first_key, pager.last_key), (1, None, None))
+        self.assertEqual(pager.query('next'), pager.query('first'))
+
+    def test_sort_key_ignores_case(self):
+        pager = KeysetPager(SELECT, KEYS)
+        self.assertLess(pager.sort_key((2, "apple")), pager.sort_key((1, "Banana")))
+
+    def test_row_query_keeps_the_filter(self):
+        pager = KeysetPager(SELECT, KEYS)
+        pager.reset("state=%s", ("NY",))
+        self.assertEqual(pager.row_query("client_id", 7),
+                         (SELECT + " WHERE (state=%s) AND (client_id=%s)", ("NY", 7)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from restore import TableDump, dependency_levels, iter_statements
+
+CREATE_TASK = """CREATE TABLE `task` (
+  `task_id` int NOT NULL AUTO_INCREMENT,
+  `project_no` varchar(255) DEFAULT NULL,
+  `task_name` varchar(255) NOT NULL,
+  `notes` text,
+  PRIMARY KEY (`task_id`),
+  KEY `idx_task_project` (`project_no`),
+  FULLTEXT KEY `ft_task_notes` (`notes`),
+  CONSTRAINT `task_ibfk_1` FOREIGN KEY (`project_no`) REFERENCES `project` (`project_no`) ON DELETE CASCADE
+) ENGINE=InnoDB"""
+
+
+def write_dump(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+class IterStatementsTest(unittest.TestCase):
+
+    def test_splits_on_semicolons_and_skips_comments(self):
+        lines = ["-- dump header\n", "\n", "DROP TABLE IF EXISTS `t`;\n",
+                 "INSERT INTO `t` VALUES\n", "(1,'a;b');\n"]
+        self.assertEqual(list(iter_statements(lines)),
+                         ["DROP TABLE IF EXISTS `t`", "INSERT INTO `t` VALUES\n(1,'a;b')"])
+
+    def test_delimiter_blocks(self):
+        lines = ["DELIMITER ;;\n",
+                 "CREATE TRIGGER trg BEFORE DELETE ON t FOR EACH ROW BEGIN\n",
+                 "  UPDATE u SET x=NULL;\n",
+                 "END ;;\n",
+                 "DELIMITER ;\n",
+                 "SELECT 1;\n"]
+        self.assertEqual(list(iter_statements(lines)), [
+            "CREATE TRIGGER trg BEFORE DELETE ON t FOR EACH ROW BEGIN\n  UPDATE u SET x=NULL;\nEND",
+            "SELECT 1",
+        ])
+
+    def test_unterminated_last_statement(self):
+        self.assertEqual(list(iter_statements(["SELECT 1;\n", "SELECT 2\n"])), ["SELECT 1", "SELECT 2"])
+
+
+class TableDumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_reads_table_and_references(self):
+        dump = TableDump(write_dump(self.dir.name, "task.sql", CREATE_TASK + ";\nINSERT INTO `task` VALUES (1);\n"))
+        self.assertEqual((dump.table, dump.references), ("task", {"project"}))
+
+    def test_split_create_defers_keys_and_constraints(self):
+        dump = TableDump(write_dump(self.dir.name, "task.sql", CREATE_TASK + ";\n"))
+        create = dump.split_create(CREATE_TASK)
+        self.assertEqual(create.splitlines()[-2:], ["  PRIMARY KEY (`task_id`)", ") ENGINE=InnoDB"])
+        self.assertNotIn("KEY `idx_task_project`", create)
+        self.assertEqual(dump.deferred_keys, ["KEY `idx_task_project` (`project_no`)",
+                                              "FULLTEXT KEY `ft_task_notes` (`notes`)"])
+        self.assertEqual(len(dump.deferred_constraints), 1)
+        self.assertTrue(dump.deferred_constraints[0].startswith("CONSTRAINT `task_ibfk_1` FOREIGN KEY"))
+
+    def test_file_without_create_table(self):
+        with self.assertRaises(ValueError):
+            TableDump(write_dump(self.dir.name, "empty.sql", "SELECT 1;\n"))
+
+    def test_dependency_levels(self):
+        dumps = [TableDump(write_dump(self.dir.name, f"{t}.sql", f"CREATE TABLE `{t}` ({refs});\n"))
+                 for t, refs in (("task", "REFERENCES `project`"), ("project", "REFERENCES `client`"),
+                                 ("client", "id int"), ("employ", "id int"))]
+        self.assertEqual([[d.table for d in level] for level in dependency_levels(dumps)],
+                         [["client", "employ"], ["project"], ["task"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from search_index import SearchIndex, search_filter, tokenize
+
+ROWS = [
+    ("C1", "Acme Building Corp"),
+    ("C2", "Bolt & Sons"),
+    ("C3", "Acme Bolt Supply"),
+    (4, "Building 4 Partners"),
+]
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex(ROWS)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Acme-Building", None, 42), ["acme", "building", "42"])
+
+    def test_prefixes_of_every_term_must_match(self):
+        self.assertEqual(self.index.search("acme bui"), ["C1"])
+        self.assertEqual(self.index.search("BOL"), ["C2", "C3"])
+        self.assertEqual(self.index.search("acme nothing"), [])
+
+    def test_results_keep_row_order_and_limit(self):
+        self.assertEqual(self.index.search("b"), ["C1", "C2", "C3", 4])
+        self.assertEqual(self.index.search("b", limit=2), ["C1", "C2"])
+
+    def test_ids_are_searchable(self):
+        self.assertEqual(self.index.search("c3"), ["C3"])
+        self.assertEqual(self.index.search("4"), [4])
+
+    def test_add_and_remove(self):
+        self.index.add("C2", "C2", "Zenith Ltd")
+        self.assertEqual(self.index.search("bolt"), ["C3"])
+        self.assertEqual(self.index.search("zen"), ["C2"])
+        self.index.remove("4")  # Treeviews hand numeric ids back as strings or ints
+        self.assertEqual(self.index.search("partners"), [])
+        self.assertEqual(len(self.index), 3)
+
+
+class SearchFilterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex(ROWS)
+
+    def test_index_hits_filter_by_id(self):
+        where, params, matches = search_filter(self.index, "acme", "client_id")
+        self.assertEqual((where, params, matches), ("client_id IN (%s, %s)", ("C1", "C3"), 2))
+
+    def test_more_hits_than_the_limit(self):
+        where, params, matches = search_filter(self.index, "b", "client_id", limit=2)
+        self.assertEqual((params, matches), (("C1", "C2"), 3))
+
+    def test_falls_back_to_fulltext_notes(self):
+        where, params, matches = search_filter(self.index, "roof leak", "client_id", "notes")
+        self.assertEqual((where, params, matches), ("MATCH(notes) AGAINST (%s IN BOOLEAN MODE)", ("+roof* +leak*",), None))
+
+    def test_no_match_without_notes(self):
+        self.assertEqual(search_filter(self.index, "zz", "client_id"), ("1=0", (), 0))
+        self.assertEqual(search_filter(self.index, "zz", "client_id", "notes"), ("1=0", (), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
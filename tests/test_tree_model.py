@@ -0,0 +1,134 @@
+import unittest
+
+from pagination import KeysetPager
+from tree_model import TreeModel
+
+
+class FakeTree:
+    """The part of the Treeview interface TreeModel uses."""
+
+    def __init__(self):
+        self.items = []
+        self.values = {}
+
+    def get_children(self):
+        return tuple(self.items)
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid, values):
+        self.items.insert(index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values=None, tags=None):
+        if values is not None:
+            self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+    def delete(self, iid):
+        self.items.remove(iid)
+        del self.values[iid]
+
+
+def paged_model(shown, direction, descending=False, page_size=3):
+    """A model showing a page of (id, name) rows as accept() left it after direction."""
+    pager = KeysetPager("SELECT id, name FROM t", [("name", 1), ("id", 0)], page_size, descending)
+    fetched = list(shown) + [(99, "~more")] if direction != 'prev' else list(reversed(shown)) + [(99, "~more")]
+    model = TreeModel(FakeTree(), pager=pager)
+    model.load(pager.accept(fetched, direction))
+    return model
+
+
+def keys(model):
+    return [row[0] for row in model.rows()]
+
+
+class UnpagedTest(unittest.TestCase):
+
+    def test_upsert_inserts_in_order_and_moves_on_update(self):
+        model = TreeModel(FakeTree(), sort_key=lambda row: row[1])
+        model.load([(1, "a"), (2, "c")])
+        self.assertTrue(model.upsert((3, "b")))
+        self.assertEqual(keys(model), [1, 3, 2])
+        model.upsert((1, "d"))
+        self.assertEqual(keys(model), [3, 2, 1])
+
+    def test_descending(self):
+        model = TreeModel(FakeTree(), sort_key=lambda row: row[1], descending=True)
+        model.load([(2, "c"), (1, "a")])
+        model.upsert((3, "b"))
+        self.assertEqual(keys(model), [2, 3, 1])
+
+    def test_load_keeps_existing_items(self):
+        model = TreeModel(FakeTree())
+        model.load([(1, "a"), (2, "b")])
+        model.load([(2, "b2"), (3, "c")])
+        self.assertEqual(model.tree.items, ["row:2", "row:3"])
+        self.assertEqual(model.tree.values["row:2"], (2, "b2"))
+
+    def test_remove(self):
+        model = TreeModel(FakeTree())
+        model.load([(1, "a"), (2, "b")])
+        model.remove(1)
+        model.remove(5)
+        self.assertEqual(keys(model), [2])
+
+
+class PageBoundsTest(unittest.TestCase):
+
+    def setUp(self):
+        # A middle page (Cal..Eve): there are pages before and after it
+        self.model = paged_model([(3, "Cal"), (4, "Dee"), (5, "Eve")], 'next')
+
+    def test_updating_the_first_and_last_rows_keeps_them(self):
+        self.assertTrue(self.model.upsert((3, "Cal")))
+        self.assertTrue(self.model.upsert((5, "Eve")))
+        self.assertEqual(keys(self.model), [3, 4, 5])
+
+    def test_row_within_the_bounds_is_inserted(self):
+        self.assertTrue(self.model.upsert((6, "Dan")))
+        self.assertEqual(keys(self.model), [3, 6, 4, 5])
+
+    def test_row_before_the_first_key_is_dropped(self):
+        self.assertFalse(self.model.upsert((7, "Bob")))
+        self.assertFalse(self.model.upsert((2, "cal")))  # same name, lower id: still before (Cal, 3)
+        self.assertEqual(keys(self.model), [3, 4, 5])
+
+    def test_row_after_the_last_key_is_dropped(self):
+        self.assertFalse(self.model.upsert((8, "Fay")))
+        self.assertEqual(keys(self.model), [3, 4, 5])
+
+    def test_row_moved_off_the_page_is_removed(self):
+        self.assertFalse(self.model.upsert((4, "Zed")))
+        self.assertEqual(keys(self.model), [3, 5])
+
+    def test_first_page_takes_rows_before_its_first_key(self):
+        model = paged_model([(3, "Cal"), (4, "Dee"), (5, "Eve")], 'first')
+        self.assertTrue(model.upsert((1, "Ann")))
+        self.assertFalse(model.upsert((8, "Fay")))
+        self.assertEqual(keys(model), [1, 3, 4, 5])
+
+    def test_last_page_takes_rows_after_its_last_key(self):
+        pager = KeysetPager("SELECT id, name FROM t", [("name", 1), ("id", 0)], 3)
+        model = TreeModel(FakeTree(), pager=pager)
+        pager.accept([(1, "Ann"), (2, "Bob"), (3, "Cal"), (4, "Dee")], 'first')
+        model.load(pager.accept([(4, "Dee"), (5, "Eve")], 'next'))
+        self.assertTrue(model.upsert((8, "Fay")))
+        self.assertFalse(model.upsert((9, "Abe")))
+        self.assertEqual(keys(model), [4, 5, 8])
+
+    def test_descending_bounds(self):
+        model = paged_model([(5, "Eve"), (4, "Dee"), (3, "Cal")], 'next', descending=True)
+        self.assertTrue(model.upsert((5, "Eve")))
+        self.assertTrue(model.upsert((6, "Dan")))
+        self.assertFalse(model.upsert((7, "Fay")))  # sorts before Eve
+        self.assertFalse(model.upsert((8, "Bob")))  # sorts after Cal
+        self.assertEqual(keys(model), [5, 4, 6, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
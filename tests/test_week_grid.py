@@ -0,0 +1,98 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from week_grid import StaleWeekError, WeekSheet, format_hours, parse_hours, save_week, week_start
+
+MONDAY = date(2024, 3, 4)
+
+
+class HoursTest(unittest.TestCase):
+
+    def test_week_start(self):
+        self.assertEqual(week_start(date(2024, 3, 10)), MONDAY)
+        self.assertEqual(week_start(MONDAY), MONDAY)
+
+    def test_parse_hours(self):
+        self.assertEqual(parse_hours(""), Decimal(0))
+        self.assertEqual(parse_hours(" 7.5 "), Decimal("7.50"))
+        self.assertEqual(parse_hours("1.005"), Decimal("1.00"))
+        for text in ("abc", "nan", "inf", "-1", "24.01"):
+            with self.assertRaises(ValueError):
+                parse_hours(text)
+
+    def test_format_hours(self):
+        self.assertEqual(format_hours(Decimal("7.50")), "7.5")
+        self.assertEqual(format_hours(Decimal("8.00")), "8")
+        self.assertEqual(format_hours(Decimal(0)), "")
+
+
+class WeekSheetTest(unittest.TestCase):
+
+    def setUp(self):
+        # (log_id, log_date, task_id, hours, client_id, project_no)
+        self.sheet = WeekSheet("E1", MONDAY, [
+            (1, date(2024, 3, 4), 10, Decimal("8.00"), "C1", "P1"),
+            (2, date(2024, 3, 5), 10, Decimal("4.00"), "C1", "P1"),
+            (3, date(2024, 3, 5), 10, Decimal("2.00"), "C1", "P1"),
+            (4, date(2024, 3, 6), 20, Decimal("1.00"), "C2", "P2"),
+        ])
+
+    def test_cells(self):
+        self.assertEqual(list(self.sheet.tasks), [10, 20])
+        self.assertEqual(self.sheet.hours(10, 1), Decimal("6.00"))
+        self.assertTrue(self.sheet.is_locked(10, 1))
+        self.assertFalse(self.sheet.is_locked(10, 0))
+        self.assertTrue(self.sheet.is_locked(None, 0))
+        self.assertFalse(self.sheet.add_task(10, "C1", "P1"))
+
+    def test_diff(self):
+        self.assertTrue(self.sheet.add_task(30, "C3", "P3"))
+        inserts, updates, deletes = self.sheet.diff({
+            (10, 0): Decimal("7.00"),   # changed
+            (10, 2): Decimal("0"),      # still empty
+            (20, 2): Decimal("0"),      # cleared
+            (30, 4): Decimal("3.00"),   # new
+            (20, 3): Decimal("1.00"),   # new on an existing task
+        })
+        self.assertEqual(inserts, [("C3", "P3", 30, date(2024, 3, 8), Decimal("3.00")),
+                                   ("C2", "P2", 20, date(2024, 3, 7), Decimal("1.00"))])
+        self.assertEqual(updates, [(1, Decimal("8.00"), Decimal("7.00"))])
+        self.assertEqual(deletes, [(4, Decimal("1.00"))])
+
+    def test_unchanged_hours_make_no_writes(self):
+        self.assertEqual(self.sheet.diff({(10, 0): Decimal("8.00")}), ([], [], []))
+
+
+class FakeCursor:
+
+    def __init__(self, rowcount=1):
+        self.rowcount = rowcount
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql.split()[0])
+
+    def executemany(self, sql, rows):
+        self.statements.append(("INSERT", len(rows)))
+
+
+class SaveWeekTest(unittest.TestCase):
+
+    def test_one_transaction(self):
+        cursor = FakeCursor()
+        work = save_week("E1", [("C1", "P1", 10, MONDAY, Decimal(1))] * 2,
+                         [(1, Decimal(8), Decimal(7))], [(4, Decimal(1))])
+        self.assertEqual(work(cursor), 4)
+        self.assertEqual(cursor.statements, ["UPDATE", "DELETE", ("INSERT", 2), "COMMIT"])
+
+    def test_changed_log_rolls_back(self):
+        cursor = FakeCursor(rowcount=0)
+        work = save_week("E1", [("C1", "P1", 10, MONDAY, Decimal(1))], [(1, Decimal(8), Decimal(7))], [])
+        with self.assertRaises(StaleWeekError):
+            work(cursor)
+        self.assertEqual(cursor.statements, ["UPDATE", "ROLLBACK"])
+
+
+if __name__ == '__main__':
+    unittest.main()
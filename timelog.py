@@ -1,45 +1,70 @@
 # timelog.py
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import mysql.connector
-import configparser
+from tkinter import ttk, messagebox, filedialog
 import os
-from datetime import datetime
+import mysql.connector
+from datetime import datetime, timedelta
 from tkcalendar import DateEntry
+from db_pool import DatabasePool, TkSession
+from migrations import ensure_schema
+from query_worker import QueryExecutor, fetch_rows
+import prepared
+from lookup_cache import LookupCache
+import queries
+from virtual_tree import VirtualTreeview
+from tree_model import TreeModel
+from timelog_import import NameResolver, import_time_logs
+from report_export import FILE_TYPES, export_query
+from query_stats import SlowQueryLabel
+from autocomplete import AutocompleteCombobox, label
+from journal import JournalLabel, open_journal
+from week_grid import StaleWeekError, WeekGrid, WeekSheet, save_week, week_start
 
 class TimeLogManager:
     """
     A GUI application to manage time logs for clients, projects, and tasks.
     It connects to a MySQL database to store and retrieve data.
     """
-    DROP_TABLE_FIRST = False
 
-    def __init__(self, master, status_callback=None):
+    def __init__(self, master, status_callback=None, db_pool=None, executor=None, lookups=None):
         self.master = master
         # Status bar setup
         self.status_var = tk.StringVar()
         self.status_bar = ttk.Label(master, textvariable=self.status_var,
                                     relief=tk.SUNKEN, anchor='w', padding=(5, 2))
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.slow_query_label = SlowQueryLabel(master, prefix=f"{__name__}.")
+        self.slow_query_label.pack(side=tk.BOTTOM, fill=tk.X)
 
-        # Database connection
-        self.db_config = self.load_db_config('config.ini')
-        if not self.db_config:
-            self.show_status_message("Config file not found or invalid", error=True)
-            master.after(5000, master.destroy)
-            return
+        # Database connection (shared pool when embedded in MainApplication)
         try:
-            self.conn = mysql.connector.connect(**self.db_config)
+            self.db_pool = db_pool or DatabasePool.from_config('config.ini')
+            if not self.db_pool:
+                self.show_status_message("Config file not found or invalid", error=True)
+                master.after(5000, master.destroy)
+                return
+            if db_pool is None:
+                ensure_schema(self.db_pool)  # MainApplication migrates once at startup otherwise
+            self.conn = TkSession(self.db_pool, master)
             self.cursor = self.conn.cursor()
             self.show_status_message("Database connection successful", error=False)
         except mysql.connector.Error as e:
             self.show_status_message(f"Database connection error: {e}", error=True)
             master.after(5000, master.destroy)
             return
+        self.executor = executor or QueryExecutor(master, self.db_pool)
+        self.lookups = lookups or LookupCache(self.db_pool)
+        # New entries go through the local journal, so they survive a dropped connection
+        try:
+            self.journal = open_journal(self.db_pool)
+            self.journal_label = JournalLabel(master, self.journal, self._on_journal_flushed, self._on_journal_rejected)
+            self.journal_label.pack(side=tk.BOTTOM, fill=tk.X)
+        except OSError as e:
+            self.journal = None
+            self.show_status_message(f"Could not open the time log journal, saving directly: {e}", error=True)
 
         # Initialize components
-        self.create_tables()
         self.create_styles()
         self.create_gui()
         self.populate_dropdowns()
@@ -49,59 +74,7 @@ class TimeLogManager:
         self.populate_time_log_list(for_date=today)
         self.filter_date_entry.set_date(today)
         self.view_logs_by_date()
-
-    def create_tables(self):
-        if self.DROP_TABLE_FIRST:
-            try:
-                self.cursor.execute("DROP TABLE IF EXISTS time_log")
-                self.conn.commit()
-            except mysql.connector.Error as err:
-                self.show_status_message(f"Error dropping time_log table: {err}", error=True)
-        tables = {
-            'client': """CREATE TABLE IF NOT EXISTS client (
-                client_id VARCHAR(255) PRIMARY KEY,
-                client_name VARCHAR(255) NOT NULL
-            )""",
-            'project': """CREATE TABLE IF NOT EXISTS project (
-                project_no VARCHAR(255) PRIMARY KEY,
-                client_id VARCHAR(255) NOT NULL,
-                project_name VARCHAR(255) NOT NULL,
-                FOREIGN KEY (client_id) REFERENCES client(client_id) ON DELETE CASCADE
-            )""",
-            'task': """CREATE TABLE IF NOT EXISTS task (
-                task_id INT AUTO_INCREMENT PRIMARY KEY,
-                project_no VARCHAR(255) NOT NULL,
-                task_name VARCHAR(255) NOT NULL,
-                billable ENUM('Yes', 'No'),
-                hourly_rate DECIMAL(10,2) DEFAULT NULL,
-                lumpsum DECIMAL(10,2) DEFAULT NULL,
-                FOREIGN KEY (project_no) REFERENCES project(project_no) ON DELETE CASCADE
-            )""",
-            'employ': """CREATE TABLE IF NOT EXISTS employ (
-                employ_id VARCHAR(50) PRIMARY KEY,
-                employ_name VARCHAR(255) NOT NULL
-            )""",
-            'time_log': """CREATE TABLE IF NOT EXISTS time_log (
-                log_id VARCHAR(512) PRIMARY KEY,
-                log_date DATE NOT NULL,
-                client_id VARCHAR(255),
-                project_no VARCHAR(255),
-                task_id INT,
-                employ_id VARCHAR(50),
-                hours DECIMAL(5,2) NOT NULL,
-                notes TEXT DEFAULT NULL,
-                FOREIGN KEY (client_id) REFERENCES client(client_id) ON DELETE SET NULL,
-                FOREIGN KEY (project_no) REFERENCES project(project_no) ON DELETE SET NULL,
-                FOREIGN KEY (task_id) REFERENCES task(task_id) ON DELETE SET NULL,
-                FOREIGN KEY (employ_id) REFERENCES employ(employ_id) ON DELETE SET NULL
-            )"""
-        }
-        for name, ddl in tables.items():
-            try:
-                self.cursor.execute(ddl)
-            except mysql.connector.Error as err:
-                self.show_status_message(f"Error creating {name} table: {err}", error=True)
-        self.conn.commit()
+        self.week_date_entry.set_date(today)
 
     def create_styles(self):
         self.master.option_add('*Font', ('Segoe UI', 10))
@@ -127,16 +100,19 @@ class TimeLogManager:
         self.view_date_tab = ttk.Frame(self.notebook)
         self.project_report_tab = ttk.Frame(self.notebook)
         self.task_data_tab = ttk.Frame(self.notebook)
+        self.week_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.entry_tab, text="Time Log Entry")
         self.notebook.add(self.view_date_tab, text="View by Date")
         self.notebook.add(self.project_report_tab, text="Project Report")
         self.notebook.add(self.task_data_tab, text="Task Data")
+        self.notebook.add(self.week_tab, text="Week Grid")
 
         # Build each
         self._build_entry_tab()
         self._build_view_by_date_tab()
         self._build_project_report_tab()
         self._build_task_data_tab()
+        self._build_week_tab()
 
     def _build_entry_tab(self):
         frm = ttk.LabelFrame(self.entry_tab, text="Time Log Entry", padding=15)
@@ -153,10 +129,10 @@ class TimeLogManager:
         labels = ["Client:", "Project:", "Task:", "Employee:", "Hours:"]
         attr_names = ["client_combobox", "project_combobox", "task_combobox", "employ_combobox", "hours_entry"]
         widgets = [
-            ttk.Combobox(frm, state='readonly', width=40),
-            ttk.Combobox(frm, state='readonly', width=40),
-            ttk.Combobox(frm, state='readonly', width=40),
-            ttk.Combobox(frm, state='readonly', width=40),
+            AutocompleteCombobox(frm, width=40),
+            AutocompleteCombobox(frm, width=40),
+            AutocompleteCombobox(frm, width=40),
+            AutocompleteCombobox(frm, width=40),
             ttk.Entry(frm, width=18)
         ]
         for i, (lbl, name, w) in enumerate(zip(labels, attr_names, widgets), start=1):
@@ -175,23 +151,30 @@ class TimeLogManager:
         # Buttons
         btn_frm = ttk.Frame(self.entry_tab, padding=15)
         btn_frm.pack(fill='x', padx=10, pady=10)
-        btn_frm.columnconfigure((0,1,2,3), weight=1)
+        btn_frm.columnconfigure((0,1,2,3,4,5), weight=1)
         ttk.Button(btn_frm, text="Add Entry", command=self.add_time_log, style='Accent.TButton').grid(row=0, column=0, padx=5, pady=5, sticky="ew")
         ttk.Button(btn_frm, text="Update Entry", command=self.update_time_log, style='Accent.TButton').grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         ttk.Button(btn_frm, text="Delete Entry", command=self.delete_time_log, style='Accent.TButton').grid(row=0, column=2, padx=5, pady=5, sticky="ew")
         ttk.Button(btn_frm, text="Show All Logs", command=self.show_all_logs, style='Accent.TButton').grid(row=0, column=3, padx=5, pady=5, sticky="ew")
+        ttk.Button(btn_frm, text="Import CSV...", command=self.import_time_logs_csv, style='Accent.TButton').grid(row=0, column=4, padx=5, pady=5, sticky="ew")
+        ttk.Button(btn_frm, text="Export...", command=self.export_time_logs, style='Accent.TButton').grid(row=0, column=5, padx=5, pady=5, sticky="ew")
 
         # Treeview
         tv_frm = ttk.LabelFrame(self.entry_tab, text="Time Log List", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
         cols = ("Log ID","Date","Client","Project","Task","Employee","Hours","Notes")
-        self.time_log_tree = ttk.Treeview(tv_frm, columns=cols, show="headings", style='Treeview')
+        self.time_log_tree = VirtualTreeview(tv_frm, columns=cols, show="headings", style='Treeview')
         widths = {"Log ID":120,"Date":100,"Client":150,"Project":150,"Task":150,"Employee":120,"Hours":80,"Notes":200}
         for c in cols:
             self.time_log_tree.heading(c, text=c)
             self.time_log_tree.column(c, width=widths[c], anchor='center')
-        self.time_log_tree.pack(expand=True, fill="both")
-        self.time_log_tree.bind("<<TreeviewSelect>>", lambda e: self._on_time_log_select())
+        self.time_log_tree.pack(side='left', expand=True, fill="both")
+        scrollbar = ttk.Scrollbar(tv_frm, orient='vertical')
+        scrollbar.pack(side='right', fill='y')
+        self.time_log_tree.attach_scrollbar(scrollbar)
+        self.time_log_tree.bind("<<TreeviewSelect>>", lambda e: self._on_time_log_select(), add='+')
+        self.time_log_model = TreeModel(self.time_log_tree, descending=True, format_row=self._format_time_log_row)
+        self._time_log_date = None  # date shown in the entry list; None while showing all logs
 
     def _build_view_by_date_tab(self):
         frm = ttk.LabelFrame(self.view_date_tab, text="Select Date", padding=10)
@@ -202,6 +185,7 @@ class TimeLogManager:
         ttk.Button(frm, text="View", command=self.view_logs_by_date, style='Accent.TButton').grid(row=0, column=2, padx=10, pady=5, sticky='w')
         self.total_hours_label = ttk.Label(frm, text="Total Hours: 0.00", font=('Segoe UI', 10, 'bold'))
         self.total_hours_label.grid(row=0, column=3, padx=10, pady=5, sticky='w')
+        ttk.Button(frm, text="Export...", command=self.export_logs_by_date, style='Accent.TButton').grid(row=0, column=4, padx=10, pady=5, sticky='w')
 
         tv_frm = ttk.LabelFrame(self.view_date_tab, text="Time Logs for Selected Date", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
@@ -211,19 +195,23 @@ class TimeLogManager:
             self.view_date_tree.heading(c, text=c)
             self.view_date_tree.column(c, width=100, anchor='center')
         self.view_date_tree.pack(expand=True, fill="both")
+        self.view_date_model = TreeModel(self.view_date_tree, format_row=self._format_view_date_row)
+        self._view_date = None
 
     def _build_project_report_tab(self):
         frm = ttk.LabelFrame(self.project_report_tab, text="Select Project", padding=10)
         frm.pack(fill='x', padx=10, pady=10)
         ttk.Label(frm, text="Client:").grid(row=0, column=0, padx=5, pady=5, sticky='w')
-        self.report_client_combobox = ttk.Combobox(frm, state='readonly', width=40)
+        self.report_client_combobox = AutocompleteCombobox(frm, width=40)
         self.report_client_combobox.grid(row=0, column=1, padx=5, pady=5, sticky='w')
         self.report_client_combobox.bind("<<ComboboxSelected>>", lambda e: self._on_report_client_selected())
         ttk.Label(frm, text="Project:").grid(row=1, column=0, padx=5, pady=5, sticky='w')
-        self.report_project_combobox = ttk.Combobox(frm, state='readonly', width=40)
+        self.report_project_combobox = AutocompleteCombobox(frm, width=40)
         self.report_project_combobox.grid(row=1, column=1, padx=5, pady=5, sticky='w')
         ttk.Button(frm, text="Generate Report", command=self.generate_project_report, style='Accent.TButton')\
             .grid(row=1, column=2, padx=10, pady=5, sticky='w')
+        ttk.Button(frm, text="Export...", command=self.export_project_report, style='Accent.TButton')\
+            .grid(row=1, column=3, padx=10, pady=5, sticky='w')
 
         tv_frm = ttk.LabelFrame(self.project_report_tab, text="Project Tasks Report", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
@@ -239,15 +227,15 @@ class TimeLogManager:
         frm = ttk.LabelFrame(self.task_data_tab, text="Select Date Range and Task", padding=10)
         frm.pack(fill='x', padx=10, pady=10)
         ttk.Label(frm, text="Client:").grid(row=0, column=0, padx=5, pady=5, sticky='w')
-        self.task_data_client_cb = ttk.Combobox(frm, state='readonly', width=32)
+        self.task_data_client_cb = AutocompleteCombobox(frm, width=32)
         self.task_data_client_cb.grid(row=0, column=1, padx=5, pady=5, sticky='w')
         self.task_data_client_cb.bind("<<ComboboxSelected>>", lambda e: self._on_task_data_client_selected())
         ttk.Label(frm, text="Project:").grid(row=1, column=0, padx=5, pady=5, sticky='w')
-        self.task_data_project_cb = ttk.Combobox(frm, state='readonly', width=32)
+        self.task_data_project_cb = AutocompleteCombobox(frm, width=32)
         self.task_data_project_cb.grid(row=1, column=1, padx=5, pady=5, sticky='w')
         self.task_data_project_cb.bind("<<ComboboxSelected>>", lambda e: self._on_task_data_project_selected())
         ttk.Label(frm, text="Task:").grid(row=2, column=0, padx=5, pady=5, sticky='w')
-        self.task_data_task_cb = ttk.Combobox(frm, state='readonly', width=32)
+        self.task_data_task_cb = AutocompleteCombobox(frm, width=32)
         self.task_data_task_cb.grid(row=2, column=1, padx=5, pady=5, sticky='w')
         ttk.Label(frm, text="Start Date:").grid(row=0, column=2, padx=5, pady=5, sticky='w')
         self.task_start_date_entry = DateEntry(frm, width=18, date_pattern='y-mm-dd')
@@ -257,6 +245,8 @@ class TimeLogManager:
         self.task_end_date_entry.grid(row=1, column=3, padx=5, pady=5, sticky='w')
         ttk.Button(frm, text="View Task Data", command=self.view_task_data, style='Accent.TButton')\
             .grid(row=2, column=2, columnspan=2, padx=5, pady=5, sticky='ew')
+        ttk.Button(frm, text="Export...", command=self.export_task_data, style='Accent.TButton')\
+            .grid(row=2, column=4, padx=5, pady=5, sticky='ew')
 
         tv_frm = ttk.LabelFrame(self.task_data_tab, text="Task Logs", padding=10)
         tv_frm.pack(expand=True, fill='both', padx=10, pady=10)
@@ -275,134 +265,151 @@ class TimeLogManager:
         self.task_total_amount_label = ttk.Label(tot_frm, text="Total Amount: $0.00", font=('Segoe UI', 10, 'bold'))
         self.task_total_amount_label.pack(side='left', padx=10)
 
-    # Utility methods
-    def load_db_config(self, config_file):
-        cfg = configparser.ConfigParser()
-        if not os.path.exists(config_file): return None
-        cfg.read(config_file)
-        if 'mysql' not in cfg: return None
-        sec = cfg['mysql']
-        for k in ('host','user','password','database'):
-            if k not in sec: return None
-        return {k: sec[k] for k in ('host','user','password','database')}
+    def _build_week_tab(self):
+        frm = ttk.LabelFrame(self.week_tab, text="Select Employee and Week", padding=10)
+        frm.pack(fill='x', padx=10, pady=10)
+        ttk.Label(frm, text="Employee:").grid(row=0, column=0, padx=5, pady=5, sticky='w')
+        self.week_employ_cb = AutocompleteCombobox(frm, width=32)
+        self.week_employ_cb.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+        self.week_employ_cb.bind("<<ComboboxSelected>>", lambda e: self.load_week())
+        ttk.Label(frm, text="Week of:").grid(row=0, column=2, padx=5, pady=5, sticky='w')
+        self.week_date_entry = DateEntry(frm, width=18, date_pattern='y-mm-dd')
+        self.week_date_entry.grid(row=0, column=3, padx=5, pady=5, sticky='w')
+        self.week_date_entry.bind("<<DateEntrySelected>>", lambda e: self.load_week())
+        ttk.Button(frm, text="< Prev", command=lambda: self._shift_week(-7)).grid(row=0, column=4, padx=5, pady=5)
+        ttk.Button(frm, text="Next >", command=lambda: self._shift_week(7)).grid(row=0, column=5, padx=5, pady=5)
+        ttk.Label(frm, text="Client:").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.week_client_cb = AutocompleteCombobox(frm, width=32)
+        self.week_client_cb.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        self.week_client_cb.bind("<<ComboboxSelected>>", lambda e: self._on_week_client_selected())
+        ttk.Label(frm, text="Project:").grid(row=1, column=2, padx=5, pady=5, sticky='w')
+        self.week_project_cb = AutocompleteCombobox(frm, width=32)
+        self.week_project_cb.grid(row=1, column=3, columnspan=3, padx=5, pady=5, sticky='w')
+        self.week_project_cb.bind("<<ComboboxSelected>>",
+                                  lambda e: self.populate_task_dropdown(self.week_project_cb.get_id(), self.week_task_cb))
+        ttk.Label(frm, text="Task:").grid(row=2, column=0, padx=5, pady=5, sticky='w')
+        self.week_task_cb = AutocompleteCombobox(frm, width=32)
+        self.week_task_cb.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+        ttk.Button(frm, text="Add Task Row", command=self.add_week_task, style='Accent.TButton')\
+            .grid(row=2, column=2, padx=5, pady=5, sticky='ew')
+        ttk.Button(frm, text="Save Week", command=self.save_week, style='Accent.TButton')\
+            .grid(row=2, column=3, padx=5, pady=5, sticky='ew')
+        ttk.Button(frm, text="Reload", command=self.load_week, style='Accent.TButton')\
+            .grid(row=2, column=4, columnspan=2, padx=5, pady=5, sticky='ew')
+
+        grid_frm = ttk.LabelFrame(self.week_tab, text="Hours", padding=10)
+        grid_frm.pack(expand=True, fill='both', padx=10, pady=10)
+        ttk.Label(grid_frm, text="A day with several entries for a task shows their total; change those in the entry list.",
+                  foreground='#808080').pack(side='bottom', anchor='w')
+        self.week_grid = WeekGrid(grid_frm, self._week_task_label)
+        self.week_grid.pack(anchor='nw')
+        self._week_saving = False
 
+    # Utility methods
     def show_status_message(self, message, error=False):
         self.status_var.set(message)
         self.status_bar.configure(foreground='red' if error else 'green')
 
-    def _extract_id(self, text):
-        if '(' in text and text.endswith(')'):
-            return text.split('(')[-1][:-1]
-        return None
-
     # Populate dropdowns & lists
     def populate_dropdowns(self):
         try:
             # Clients
-            self.cursor.execute("SELECT client_id, client_name FROM client ORDER BY client_name")
-            clients = [f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            for cb in (self.client_combobox, self.report_client_combobox, self.task_data_client_cb):
-                cb['values'] = clients
-                if clients and not cb.get(): cb.set(clients[0])
+            clients = self.lookups.rows('client')
+            for cb in (self.client_combobox, self.report_client_combobox, self.task_data_client_cb, self.week_client_cb):
+                cb.set_rows(clients)
+                if cb.get_id() is None: cb.select_first()
             # Employees
-            self.cursor.execute("SELECT employ_id, employ_name FROM employ ORDER BY employ_name")
-            employs = [f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            self.employ_combobox['values'] = employs
-            if employs and not self.employ_combobox.get(): self.employ_combobox.set(employs[0])
+            self.employ_combobox.set_rows(self.lookups.rows('employ'))
+            if self.employ_combobox.get_id() is None: self.employ_combobox.select_first()
+            self.week_employ_cb.set_rows(self.lookups.rows('employ'))
             # Trigger cascading
             self._on_client_selected()
             self._on_report_client_selected()
             self._on_task_data_client_selected()
+            self._on_week_client_selected()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error populating dropdowns: {e}", error=True)
 
     def populate_time_log_list(self, for_date=None):
-        for i in self.time_log_tree.get_children():
-            self.time_log_tree.delete(i)
-        base = """
-            SELECT tl.log_id, tl.log_date, c.client_name, p.project_name, t.task_name, e.employ_name, tl.hours, tl.notes,
-                   c.client_id, p.project_no, t.task_id, e.employ_id
-            FROM time_log tl
-            LEFT JOIN client c ON tl.client_id=c.client_id
-            LEFT JOIN project p ON tl.project_no=p.project_no
-            LEFT JOIN task t ON tl.task_id=t.task_id
-            LEFT JOIN employ e ON tl.employ_id=e.employ_id
-        """
-        params = ()
-        if for_date:
-            query = base + " WHERE tl.log_date=%s ORDER BY tl.log_id DESC"
-            params = (for_date,)
-            self.show_status_message(f"Showing logs for {for_date}", error=False)
-        else:
-            query = base + " ORDER BY tl.log_date DESC, tl.log_id DESC"
-        try:
-            self.cursor.execute(query, params)
-            for row in self.cursor.fetchall():
-                disp = [
-                    row[0],
-                    row[1].strftime("%Y-%m-%d") if row[1] else "",
-                    f"{row[2]} ({row[8]})" if row[2] else row[8] or "",
-                    f"{row[3]} ({row[9]})" if row[3] else row[9] or "",
-                    f"{row[4]} ({row[10]})" if row[4] else row[10] or "",
-                    f"{row[5]} ({row[11]})" if row[5] else row[11] or "",
-                    f"{float(row[6]):.2f}" if row[6] else "0.00",
-                    row[7] or ""
-                ]
-                self.time_log_tree.insert("", tk.END, values=disp)
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error loading logs: {e}", error=True)
+        if not for_date:
+            return self.show_all_logs()
+        self.time_log_tree.clear_source()
+        self._time_log_date = for_date
+        self.show_status_message(f"Showing logs for {for_date}", error=False)
+        self.executor.submit('time_log_list', prepared.fetch_named('time_logs_for_date', (for_date,)),
+                             self._render_time_log_list,
+                             lambda e: self.show_status_message(f"Error loading logs: {e}", error=True),
+                             tree=self.time_log_tree)
+
+    def _render_time_log_list(self, rows):
+        self.time_log_model.load(rows)
+
+    def _format_time_log_row(self, row):
+        return [
+            row[0],
+            row[1].strftime("%Y-%m-%d") if row[1] else "",
+            f"{row[2]} ({row[8]})" if row[2] else row[8] or "",
+            f"{row[3]} ({row[9]})" if row[3] else row[9] or "",
+            f"{row[4]} ({row[10]})" if row[4] else row[10] or "",
+            f"{row[5]} ({row[11]})" if row[5] else row[11] or "",
+            f"{float(row[6]):.2f}" if row[6] else "0.00",
+            row[7] or ""
+        ]
 
     def populate_project_dropdown(self, client_id, cb):
-        if not client_id:
-            cb['values']=(); cb.set(''); return
+        if client_id is None:
+            cb.set_rows(()); return
         try:
-            self.cursor.execute("SELECT project_no, project_name FROM project WHERE client_id=%s ORDER BY project_name", (client_id,))
-            vals = [f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            cb['values'] = vals
-            if vals: cb.set(vals[0])
+            cb.set_rows(self.lookups.rows('project', client_id))
+            cb.select_first()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error loading projects: {e}", error=True)
 
     def populate_task_dropdown(self, project_no, cb):
-        if not project_no:
-            cb['values']=(); cb.set(''); return
+        if project_no is None:
+            cb.set_rows(()); return
         try:
-            self.cursor.execute("SELECT task_id, task_name FROM task WHERE project_no=%s ORDER BY task_name", (project_no,))
-            vals = [f"{r[1]} ({r[0]})" for r in self.cursor.fetchall()]
-            cb['values']=vals
-            if vals: cb.set(vals[0])
+            cb.set_rows(self.lookups.rows('task', project_no))
+            cb.select_first()
         except mysql.connector.Error as e:
             self.show_status_message(f"Error loading tasks: {e}", error=True)
 
     # Event handlers
     def _on_client_selected(self):
-        cid = self._extract_id(self.client_combobox.get())
+        cid = self.client_combobox.get_id()
         self.populate_project_dropdown(cid, self.project_combobox)
         self._on_project_selected()
 
     def _on_project_selected(self):
-        pno = self._extract_id(self.project_combobox.get())
+        pno = self.project_combobox.get_id()
         self.populate_task_dropdown(pno, self.task_combobox)
 
     def _on_report_client_selected(self):
-        cid = self._extract_id(self.report_client_combobox.get())
+        cid = self.report_client_combobox.get_id()
         self.populate_project_dropdown(cid, self.report_project_combobox)
+        self.executor.cancel('project_report')
         for i in self.report_tree.get_children(): self.report_tree.delete(i)
 
     def _on_task_data_client_selected(self):
-        cid = self._extract_id(self.task_data_client_cb.get())
+        cid = self.task_data_client_cb.get_id()
         self.populate_project_dropdown(cid, self.task_data_project_cb)
         self._on_task_data_project_selected()
 
     def _on_task_data_project_selected(self):
-        pno = self._extract_id(self.task_data_project_cb.get())
+        pno = self.task_data_project_cb.get_id()
         self.populate_task_dropdown(pno, self.task_data_task_cb)
+        self.executor.cancel('task_data')
         for i in self.task_data_tree.get_children(): self.task_data_tree.delete(i)
 
+    def _on_week_client_selected(self):
+        self.populate_project_dropdown(self.week_client_cb.get_id(), self.week_project_cb)
+        self.populate_task_dropdown(self.week_project_cb.get_id(), self.week_task_cb)
+
     def _on_time_log_select(self):
         sel = self.time_log_tree.selection()
         if not sel: return
         vals = self.time_log_tree.item(sel[0])['values']
+        if len(vals) < 8: return  # placeholder row still loading
         # Restore date
         try:
             self.date_entry.set_date(vals[1])
@@ -414,7 +421,7 @@ class TimeLogManager:
             vals[2:7]
         ):
             w = getattr(self, attr)
-            if isinstance(w, ttk.Entry):
+            if not isinstance(w, AutocompleteCombobox):
                 w.delete(0,tk.END); w.insert(0, v)
             else:
                 w.set(v)
@@ -426,10 +433,10 @@ class TimeLogManager:
     # CRUD operations
     def add_time_log(self):
         date = self.date_entry.get()
-        cid = self._extract_id(self.client_combobox.get())
-        pno = self._extract_id(self.project_combobox.get())
-        tid = self._extract_id(self.task_combobox.get())
-        eid = self._extract_id(self.employ_combobox.get())
+        cid = self.client_combobox.get_id()
+        pno = self.project_combobox.get_id()
+        tid = self.task_combobox.get_id()
+        eid = self.employ_combobox.get_id()
         hrs = self.hours_entry.get().strip()
         notes = self.notes_text.get('1.0',tk.END).strip()
         if not all([date,cid,pno,tid,eid,hrs]):
@@ -440,19 +447,39 @@ class TimeLogManager:
         except:
             return self.show_status_message("Hours must be a positive number", error=True)
 
-        log_id = f"{date.replace('-','')}-{tid}-{eid}-{datetime.now().strftime('%H%M%S%f')}"
+        if self.journal is None:
+            return self._insert_time_log(date, cid, pno, tid, eid, hrs_f, notes)
+        try:
+            self.journal.add(date, cid, pno, tid, eid, hrs_f, notes or None)
+        except OSError as e:
+            return self.show_status_message(f"Error saving time log: {e}", error=True)
+        if self.journal.last_error:
+            self.show_status_message("Time log entry saved; it will be sent once the database is reachable")
+        else:
+            self.show_status_message("Time log entry added successfully")
+        # The row appears in the lists once the journal has written it (_on_journal_flushed)
+        self.populate_dropdowns()
+        if self._time_log_date != date:
+            self.populate_time_log_list(for_date=date)
+        # Restore date, clear others
+        self.date_entry.set_date(date)
+        self.hours_entry.delete(0,tk.END)
+        self.notes_text.delete('1.0',tk.END)
+
+    def _insert_time_log(self, date, cid, pno, tid, eid, hrs_f, notes):
+        """Writes an entry straight to the server, for when the journal file could not be opened."""
         try:
             self.cursor.execute(
-                "INSERT INTO time_log(log_id,log_date,client_id,project_no,task_id,employ_id,hours,notes) "
-                "VALUES(%s,%s,%s,%s,%s,%s,%s,%s)",
-                (log_id,date,cid,pno,tid,eid,hrs_f, notes or None)
+                "INSERT INTO time_log(log_date,client_id,project_no,task_id,employ_id,hours,notes) "
+                "VALUES(%s,%s,%s,%s,%s,%s,%s)",
+                (date,cid,pno,tid,eid,hrs_f, notes or None)
             )
+            log_id = self.cursor.lastrowid
             self.conn.commit()
             self.show_status_message("Time log entry added successfully")
             # Refresh lists and dropdowns
             self.populate_dropdowns()
-            self.populate_time_log_list(for_date=date)
-            self.view_logs_by_date()
+            self._apply_time_log_write(date, added=log_id)
             # Restore date, clear others
             self.date_entry.set_date(date)
             self.hours_entry.delete(0,tk.END)
@@ -460,15 +487,40 @@ class TimeLogManager:
         except mysql.connector.Error as e:
             self.show_status_message(f"Error adding time log: {e}", error=True)
 
+    def _on_journal_flushed(self, entries):
+        """Adds the entries the journal has written to the lists showing their dates."""
+        refs = [e['log_ref'] for e in entries if e['log_date'] in (self._time_log_date, self._view_date)]
+        if not refs:
+            return
+        query = queries.TIME_LOGS_BY_REF.format(', '.join(['%s'] * len(refs)))
+        self.executor.submit(('journal_rows', refs[0]), fetch_rows(query, tuple(refs)), self._show_journal_rows,
+                             lambda e: self.show_status_message(f"Error loading saved logs: {e}", error=True))
+
+    def _show_journal_rows(self, rows):
+        for row in rows:
+            date = row[1].strftime("%Y-%m-%d")
+            if date == self._time_log_date:
+                self.time_log_model.upsert(row)
+            if date == self._view_date:
+                self.view_date_model.upsert(row)
+        if self._view_date is not None:
+            self._update_total_hours()
+
+    def _on_journal_rejected(self, rejected):
+        details = "\n".join(f"{e['log_date']}, task {e['task_id']}, employee {e['employ_id']}, {e['hours']:.2f} h: {error}"
+                            for e, error in rejected[:20])
+        self.show_status_message(f"The database refused {len(rejected)} saved time log(s)", error=True)
+        messagebox.showwarning("Time Log Journal", f"These entries could not be saved and need to be entered again:\n\n{details}")
+
     def update_time_log(self):
         sel = self.time_log_tree.selection()
         if not sel: return self.show_status_message("Please select a log to update", error=True)
-        old_id = self.time_log_tree.item(sel[0])['values'][0]
+        log_id = self.time_log_tree.item(sel[0])['values'][0]
         date = self.date_entry.get()
-        cid = self._extract_id(self.client_combobox.get())
-        pno = self._extract_id(self.project_combobox.get())
-        tid = self._extract_id(self.task_combobox.get())
-        eid = self._extract_id(self.employ_combobox.get())
+        cid = self.client_combobox.get_id()
+        pno = self.project_combobox.get_id()
+        tid = self.task_combobox.get_id()
+        eid = self.employ_combobox.get_id()
         hrs = self.hours_entry.get().strip()
         notes = self.notes_text.get('1.0',tk.END).strip()
         if not all([date,cid,pno,tid,eid,hrs]):
@@ -479,18 +531,17 @@ class TimeLogManager:
         except:
             return self.show_status_message("Hours must be a positive number", error=True)
 
-        new_id = f"{date.replace('-','')}-{tid}-{eid}-{datetime.now().strftime('%H%M%S%f')}"
         try:
+            # The key never changes, so the row is updated in place
             self.cursor.execute(
-                "UPDATE time_log SET log_id=%s,log_date=%s,client_id=%s,project_no=%s,task_id=%s,employ_id=%s,hours=%s,notes=%s "
+                "UPDATE time_log SET log_date=%s,client_id=%s,project_no=%s,task_id=%s,employ_id=%s,hours=%s,notes=%s "
                 "WHERE log_id=%s",
-                (new_id,date,cid,pno,tid,eid,hrs_f, notes or None, old_id)
+                (date,cid,pno,tid,eid,hrs_f, notes or None, log_id)
             )
             self.conn.commit()
             self.show_status_message("Time log updated successfully")
             self.populate_dropdowns()
-            self.populate_time_log_list(for_date=date)
-            self.view_logs_by_date()
+            self._apply_time_log_write(date, removed=log_id, added=log_id)
             self.date_entry.set_date(date)
             self.hours_entry.delete(0,tk.END)
             self.notes_text.delete('1.0',tk.END)
@@ -508,116 +559,301 @@ class TimeLogManager:
             self.cursor.execute("DELETE FROM time_log WHERE log_id=%s", (log_id,))
             self.conn.commit()
             self.show_status_message("Time log deleted successfully")
-            self.populate_time_log_list(for_date=date)
-            self.view_logs_by_date()
+            self._apply_time_log_write(date, removed=log_id)
         except mysql.connector.Error as e:
             self.show_status_message(f"Error deleting time log: {e}", error=True)
 
-    def view_logs_by_date(self):
-        date = self.filter_date_entry.get()
-        for i in self.view_date_tree.get_children():
-            self.view_date_tree.delete(i)
+    def _apply_time_log_write(self, date, removed=None, added=None):
+        """Applies one written log to the entry and date lists with a single row read instead of reloading both."""
+        row = None
+        if added is not None:
+            row = prepared.fetch_one(self.cursor, 'time_log_by_id', (added,))
+        if self._time_log_date == date:
+            if removed is not None: self.time_log_model.remove(removed)
+            if row is not None: self.time_log_model.upsert(row)
+        elif self._time_log_date is None and self.time_log_tree.is_virtual():
+            self._apply_virtual_write(removed, row)
+        else:
+            self.populate_time_log_list(for_date=date)
+        if self._view_date is not None:
+            if removed is not None: self.view_date_model.remove(removed)
+            if row is not None and row[1].strftime("%Y-%m-%d") == self._view_date:
+                self.view_date_model.upsert(row)
+            self._update_total_hours()
+
+    def _apply_virtual_write(self, removed, row):
+        # Show All Logs is ordered by date and id, so an edit that keeps the date keeps its place and
+        # is patched into the cached rows; otherwise only the rows in view are read again.
+        tree = self.time_log_tree
+        if row is not None and removed == row[0] and \
+                tree.replace_row(lambda r: r[0] == row[0] and r[1] == row[1], row):
+            return
+        tree.reload(tree.row_count() + (row is not None) - (removed is not None))
+
+    def import_time_logs_csv(self):
+        """Bulk-loads an offline timesheet (date, client, project, task, employee, hours[, notes])."""
+        path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                                          title="Import Time Logs")
+        if not path:
+            return
         try:
-            self.cursor.execute("""
-                SELECT tl.log_id, tl.log_date, c.client_name, p.project_name, t.task_name, e.employ_name, tl.hours, tl.notes
-                FROM time_log tl
-                LEFT JOIN client c ON tl.client_id=c.client_id
-                LEFT JOIN project p ON tl.project_no=p.project_no
-                LEFT JOIN task t ON tl.task_id=t.task_id
-                LEFT JOIN employ e ON tl.employ_id=e.employ_id
-                WHERE tl.log_date=%s ORDER BY tl.log_id
-            """, (date,))
-            rows = self.cursor.fetchall()
-            total = 0.0
-            for r in rows:
-                total += float(r[6] or 0)
-                disp = [
-                    r[0], r[1].strftime("%Y-%m-%d"), r[2] or "", r[3] or "",
-                    r[4] or "", r[5] or "", f"{float(r[6]):.2f}" if r[6] else "0.00", r[7] or ""
-                ]
-                self.view_date_tree.insert("", tk.END, values=disp)
-            self.total_hours_label.config(text=f"Total Hours: {total:.2f}")
-            self.show_status_message(f"Displaying logs for {date}")
+            resolver = NameResolver(self.lookups)
         except mysql.connector.Error as e:
-            self.show_status_message(f"Error loading logs: {e}", error=True)
+            return self.show_status_message(f"Error loading lookups for import: {e}", error=True)
+        self.show_status_message(f"Importing {os.path.basename(path)}...")
+        self.executor.submit('time_log_import', import_time_logs(path, resolver), self._on_import_done,
+                             lambda e: self.show_status_message(f"Error importing time logs: {e}", error=True))
+
+    def _on_import_done(self, result):
+        # One refresh for the whole file
+        self.populate_time_log_list(for_date=self._time_log_date)
+        self.view_logs_by_date()
+        msg = f"Imported {result.imported} time log(s)"
+        if result.rejected:
+            msg += f", skipped {len(result.rejected)} invalid row(s)"
+        if result.error:
+            msg += f"; stopped: {result.error}"
+        self.show_status_message(msg, error=bool(result.error or result.rejected))
+        if result.rejected:
+            details = "\n".join(f"Line {line}: {reason}" for line, reason in result.rejected[:20])
+            if len(result.rejected) > 20:
+                details += f"\n... and {len(result.rejected) - 20} more"
+            messagebox.showwarning("Import Time Logs", f"{msg}.\n\n{details}")
+
+    def view_logs_by_date(self, date=None):
+        date = date or self.filter_date_entry.get()
+        work = prepared.fetch_named('view_logs_by_date', (date,))
+        self.executor.submit('view_date', work, lambda rows: self._render_logs_by_date(date, rows),
+                             lambda e: self.show_status_message(f"Error loading logs: {e}", error=True),
+                             tree=self.view_date_tree)
+
+    def _render_logs_by_date(self, date, rows):
+        self._view_date = date
+        self.view_date_model.load(rows)
+        self._update_total_hours()
+        self.show_status_message(f"Displaying logs for {date}")
+
+    def _format_view_date_row(self, r):
+        return [
+            r[0], r[1].strftime("%Y-%m-%d"), r[2] or "", r[3] or "",
+            r[4] or "", r[5] or "", f"{float(r[6]):.2f}" if r[6] else "0.00", r[7] or ""
+        ]
+
+    def _update_total_hours(self):
+        total = sum(float(r[6] or 0) for r in self.view_date_model.rows())
+        self.total_hours_label.config(text=f"Total Hours: {total:.2f}")
 
     def generate_project_report(self):
         proj = self.report_project_combobox.get()
-        if not proj: return self.show_status_message("Please select a project first", error=True)
-        pno = self._extract_id(proj)
+        pno = self.report_project_combobox.get_id()
+        if pno is None: return self.show_status_message("Please select a project first", error=True)
+        work = prepared.fetch_named('project_report', (pno,))
+        self.executor.submit('project_report', work, lambda rows: self._render_project_report(proj, rows),
+                             lambda e: self.show_status_message(f"Error generating report: {e}", error=True),
+                             tree=self.report_tree)
+
+    def _render_project_report(self, proj, rows):
         for i in self.report_tree.get_children(): self.report_tree.delete(i)
-        try:
-            self.cursor.execute("""
-                SELECT t.task_id, t.task_name,
-                       MIN(tl.log_date) AS start_date,
-                       MAX(tl.log_date) AS end_date,
-                       SUM(tl.hours) AS total_hours,
-                       GROUP_CONCAT(DISTINCT e.employ_name SEPARATOR ', ') AS employees
-                FROM task t
-                LEFT JOIN time_log tl ON t.task_id=tl.task_id
-                LEFT JOIN employ e ON tl.employ_id=e.employ_id
-                WHERE t.project_no=%s
-                GROUP BY t.task_id,t.task_name ORDER BY t.task_name
-            """, (pno,))
-            rows = self.cursor.fetchall()
-            total=0.0
-            if not rows:
-                return self.show_status_message("No tasks/logs for this project")
-            for r in rows:
-                sh = r[2].strftime("%Y-%m-%d") if r[2] else "N/A"
-                eh = r[3].strftime("%Y-%m-%d") if r[3] else "N/A"
-                hrs = float(r[4] or 0)
-                total+=hrs
-                self.report_tree.insert("", tk.END, values=[
-                    r[0], r[1], sh, eh, f"{hrs:.2f}", r[5] or ""
-                ])
-            self.report_tree.insert("", tk.END, values=["","PROJECT TOTAL","","",f"{total:.2f}",""], tags=('total',))
-            self.show_status_message(f"Report generated for project {proj}")
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error generating report: {e}", error=True)
+        total=0.0
+        if not rows:
+            return self.show_status_message("No tasks/logs for this project")
+        for r in rows:
+            sh = r[2].strftime("%Y-%m-%d") if r[2] else "N/A"
+            eh = r[3].strftime("%Y-%m-%d") if r[3] else "N/A"
+            hrs = float(r[4] or 0)
+            total+=hrs
+            self.report_tree.insert("", tk.END, values=[
+                r[0], r[1], sh, eh, f"{hrs:.2f}", r[5] or ""
+            ])
+        self.report_tree.insert("", tk.END, values=["","PROJECT TOTAL","","",f"{total:.2f}",""], tags=('total',))
+        self.show_status_message(f"Report generated for project {proj}")
 
     def view_task_data(self):
-        task = self.task_data_task_cb.get()
-        if not task: return self.show_status_message("Please select a task first", error=True)
-        tid = self._extract_id(task)
+        tid = self.task_data_task_cb.get_id()
+        if tid is None: return self.show_status_message("Please select a task first", error=True)
         sd = self.task_start_date_entry.get()
         ed = self.task_end_date_entry.get()
+
+        def work(cursor):
+            rate = prepared.fetch_one(cursor, 'task_rate', (tid,)) or (0,0)
+            rows = prepared.fetch_all(cursor, 'task_logs_in_range', (tid, sd, ed))
+            return rate, rows, prepared.fetch_one(cursor, 'task_totals_in_range', (tid, sd, ed))
+
+        self.executor.submit('task_data', work, self._render_task_data,
+                             lambda e: self.show_status_message(f"Error loading task data: {e}", error=True),
+                             tree=self.task_data_tree)
+
+    def _render_task_data(self, result):
+        (hr, lump), rows, (th, amt) = result
         for i in self.task_data_tree.get_children():
             self.task_data_tree.delete(i)
+        if not rows:
+            self.task_total_hours_label.config(text="Total Hours: 0.00")
+            self.task_total_amount_label.config(text="Total Amount: $0.00")
+            return self.show_status_message("No logs in selected range")
+        for r in rows:
+            hrs = float(r[3] or 0)
+            la = hrs * float(hr or 0)
+            self.task_data_tree.insert("", tk.END, values=[
+                r[0], r[1].strftime("%Y-%m-%d"), r[2] or "", f"{hrs:.2f}",
+                f"${float(hr or 0):.2f}", f"${float(lump or 0):.2f}", f"${la:.2f}", r[4] or ""
+            ])
+        total_amt = float(lump if lump and lump>0 else amt)
+        self.task_total_hours_label.config(text=f"Total Hours: {float(th):.2f}")
+        self.task_total_amount_label.config(text=f"Total Amount: ${total_amt:.2f}")
+        self.show_status_message(f"Displaying {len(rows)} logs for task")
+
+    # Week grid: a week of one employee's hours, saved as one transaction
+    def load_week(self):
+        sheet = self.week_grid.sheet
+        if sheet is not None and self.week_grid.changed() and \
+                not messagebox.askyesno("Week Grid", "Discard the hours you have not saved?"):
+            self.week_employ_cb.set_id(sheet.employ_id)
+            self.week_date_entry.set_date(sheet.monday)
+            return
+        eid = self.week_employ_cb.get_id()
+        if eid is None: return self.show_status_message("Please select an employee", error=True)
+        self._load_week(eid, week_start(self.week_date_entry.get_date()))
+
+    def _load_week(self, eid, monday):
+        work = prepared.fetch_named('employ_week_logs', (eid, monday, monday + timedelta(days=6)))
+        self.executor.submit('week_grid', work, lambda rows: self.week_grid.show(WeekSheet(eid, monday, rows)),
+                             lambda e: self.show_status_message(f"Error loading the week: {e}", error=True))
+
+    def _shift_week(self, days):
+        self.week_date_entry.set_date(self.week_date_entry.get_date() + timedelta(days=days))
+        self.load_week()
+
+    def _week_task_label(self, task_id):
+        if task_id is None:
+            return "(no task)"
+        return label(task_id, self.lookups.name('task', task_id, "?"))
+
+    def add_week_task(self):
+        if self.week_grid.sheet is None: return self.show_status_message("Please select an employee first", error=True)
+        tid = self.week_task_cb.get_id()
+        if tid is None: return self.show_status_message("Please select a task", error=True)
+        self.week_grid.add_task(tid, self.week_client_cb.get_id(), self.week_project_cb.get_id())
+
+    def save_week(self):
+        """Writes only the changed cells, in one transaction, then refreshes the week and the lists showing its days."""
+        sheet = self.week_grid.sheet
+        if sheet is None or self._week_saving:
+            return
         try:
-            self.cursor.execute("SELECT hourly_rate,lumpsum FROM task WHERE task_id=%s", (tid,))
-            hr, lump = self.cursor.fetchone() or (0,0)
-            self.cursor.execute("""
-                SELECT tl.log_id, tl.log_date, e.employ_name, tl.hours, tl.notes
-                FROM time_log tl
-                LEFT JOIN employ e ON tl.employ_id=e.employ_id
-                WHERE tl.task_id=%s AND tl.log_date BETWEEN %s AND %s
-                ORDER BY tl.log_date
-            """, (tid, sd, ed))
-            rows = self.cursor.fetchall()
-            if not rows:
-                self.task_total_hours_label.config(text="Total Hours: 0.00")
-                self.task_total_amount_label.config(text="Total Amount: $0.00")
-                return self.show_status_message("No logs in selected range")
-            th, amt = 0.0, 0.0
-            for r in rows:
-                hrs = float(r[3] or 0)
-                la = hrs * float(hr or 0)
-                th += hrs; amt += la
-                self.task_data_tree.insert("", tk.END, values=[
-                    r[0], r[1].strftime("%Y-%m-%d"), r[2] or "", f"{hrs:.2f}",
-                    f"${float(hr or 0):.2f}", f"${float(lump or 0):.2f}", f"${la:.2f}", r[4] or ""
-                ])
-            total_amt = lump if lump and lump>0 else amt
-            self.task_total_hours_label.config(text=f"Total Hours: {th:.2f}")
-            self.task_total_amount_label.config(text=f"Total Amount: ${total_amt:.2f}")
-            self.show_status_message(f"Displaying {len(rows)} logs for task")
-        except mysql.connector.Error as e:
-            self.show_status_message(f"Error loading task data: {e}", error=True)
+            hours = self.week_grid.hours()
+        except ValueError as e:
+            return self.show_status_message(f"Invalid hours: {e}", error=True)
+        inserts, updates, deletes = sheet.diff(hours)
+        if not (inserts or updates or deletes):
+            return self.show_status_message("No changes to save")
+        self._week_saving = True  # a second save of the same diff would insert its new logs twice
+        self.executor.submit('week_save', save_week(sheet.employ_id, inserts, updates, deletes),
+                             lambda count: self._on_week_saved(sheet, count), self._on_week_save_failed)
+
+    def _on_week_saved(self, sheet, count):
+        self._week_saving = False
+        if self.week_grid.sheet is sheet:  # unless another week was opened meanwhile
+            self._load_week(sheet.employ_id, sheet.monday)
+        week = {sheet.day(i).strftime('%Y-%m-%d') for i in range(7)}
+        if self._time_log_date in week:
+            self.populate_time_log_list(for_date=self._time_log_date)
+        if self._view_date in week:
+            self.view_logs_by_date(self._view_date)
+        self.show_status_message(f"Saved {count} change(s) to the week of {sheet.monday}")
+
+    def _on_week_save_failed(self, error):
+        self._week_saving = False
+        if isinstance(error, StaleWeekError):
+            return self.show_status_message(f"Nothing was saved: {error}. Reload the week and enter the hours again",
+                                            error=True)
+        self.show_status_message(f"Error saving the week: {error}", error=True)
+
+    # Exports (streamed on a worker thread, so a year of logs never sits in memory)
+    def _export(self, key, title, sql, params, headers, format_row=None, footer=None):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES, title=title)
+        if not path:
+            return
+        self.show_status_message(f"Exporting to {os.path.basename(path)}...")
+        self.executor.submit(key, export_query(sql, params, path, headers, format_row, footer),
+                             lambda n: self.show_status_message(f"Exported {n} rows to {os.path.basename(path)}"),
+                             lambda e: self.show_status_message(f"Error exporting: {e}", error=True))
+
+    def export_time_logs(self):
+        """Exports the logs shown in the entry list: the selected date, or every log after Show All Logs."""
+        headers = ["Log ID","Date","Client ID","Client","Project No","Project","Task ID","Task",
+                   "Employee ID","Employee","Hours","Notes"]
+        def fmt(r):
+            return [r[0], r[1], r[8], r[2], r[9], r[3], r[10], r[4], r[11], r[5], r[6], r[7]]
+        if self._time_log_date:
+            self._export('export_time_logs', f"Export Time Logs for {self._time_log_date}",
+                         queries.TIME_LOGS_FOR_DATE, (self._time_log_date,), headers, fmt)
+        else:
+            self._export('export_time_logs', "Export All Time Logs", queries.ALL_TIME_LOGS, (), headers, fmt)
+
+    def export_logs_by_date(self):
+        date = self.filter_date_entry.get()
+        self._export('export_view_date', f"Export Time Logs for {date}", queries.VIEW_LOGS_BY_DATE, (date,),
+                     ["Log ID","Date","Client","Project","Task","Employee","Hours","Notes"])
+
+    def export_project_report(self):
+        proj = self.report_project_combobox.get()
+        pno = self.report_project_combobox.get_id()
+        if pno is None: return self.show_status_message("Please select a project first", error=True)
+        total = [0.0]
+        def fmt(r):
+            total[0] += float(r[4] or 0)
+            return [r[0], r[1], r[2], r[3], r[4] or 0, r[5] or ""]
+        self._export('export_project_report', f"Export Report for {proj}", queries.PROJECT_REPORT,
+                     (pno,),
+                     ["Task ID","Task Name","Start Date","End Date","Total Hours","Employees"], fmt,
+                     lambda: ["", "PROJECT TOTAL", "", "", round(total[0], 2), ""])
+
+    def export_task_data(self):
+        task = self.task_data_task_cb.get()
+        tid = self.task_data_task_cb.get_id()
+        if tid is None: return self.show_status_message("Please select a task first", error=True)
+        sd = self.task_start_date_entry.get()
+        ed = self.task_end_date_entry.get()
+        totals = {'hours': 0.0, 'amount': 0.0, 'lumpsum': 0.0}
+        def fmt(r):
+            hrs = float(r[3] or 0)
+            amount = hrs * float(r[4] or 0)
+            totals['hours'] += hrs; totals['amount'] += amount; totals['lumpsum'] = float(r[5] or 0)
+            return [r[0], r[1], r[2] or "", r[3], r[4] or 0, r[5] or 0, round(amount, 2), r[6] or ""]
+        def footer():
+            total = totals['lumpsum'] if totals['lumpsum'] > 0 else totals['amount']
+            return ["", "TOTAL", "", round(totals['hours'], 2), "", "", round(total, 2), ""]
+        self._export('export_task_data', f"Export Task Data for {task}", queries.TASK_LOGS_WITH_RATE_IN_RANGE,
+                     (tid, sd, ed),
+                     ["Log ID","Date","Employee","Hours","Hourly Rate","Lumpsum","Log Amount","Notes"], fmt, footer)
 
     def show_all_logs(self):
-        self.populate_time_log_list(for_date=None)
-        self.show_status_message("Showing all time logs")
+        """Shows every time log in the virtualized list; only the visible window is ever fetched."""
+        self._time_log_date = None
+        def work(cursor):
+            cursor.execute(queries.COUNT_TIME_LOGS)
+            return cursor.fetchone()[0]
+
+        def show(total):
+            self.time_log_tree.set_source(total, self._fetch_time_log_block, self._format_time_log_row)
+            self.show_status_message(f"Showing all {total} time logs")
+
+        self.time_log_tree.clear_source()
+        self.executor.submit('time_log_list', work, show,
+                             lambda e: self.show_status_message(f"Error loading logs: {e}", error=True),
+                             tree=self.time_log_tree)
+
+    def _fetch_time_log_block(self, offset, limit, previous_row, deliver, fail):
+        if previous_row is not None:
+            log_date, log_id = previous_row[1], previous_row[0]
+            work = fetch_rows(queries.ALL_TIME_LOGS_AFTER, (log_date, log_date, log_id, limit))
+        else:
+            work = fetch_rows(queries.ALL_TIME_LOGS_WINDOW, (limit, offset))
+        def failed(e):
+            fail()
+            self.show_status_message(f"Error loading logs: {e}", error=True)
+        self.executor.submit(('time_log_block', offset), work, deliver, failed)
 
 if __name__ == "__main__":
     root = tk.Tk()
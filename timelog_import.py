@@ -0,0 +1,166 @@
+# timelog_import.py
+
+import csv
+import hashlib
+import uuid
+from datetime import datetime
+
+import mysql.connector
+
+BATCH_SIZE = 1000
+REQUIRED_COLUMNS = ('date', 'client', 'project', 'task', 'employee', 'hours')
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y')
+INSERT_TIME_LOG = ("INSERT INTO time_log(log_ref,log_date,client_id,project_no,task_id,employ_id,hours,notes) "
+                   "VALUES(%s,%s,%s,%s,%s,%s,%s,%s)")
+# log_ref is unique and an imported line's log_ref depends only on the line, so importing a
+# file again after a partial failure skips the rows that were already written.
+IMPORT_TIME_LOGS = INSERT_TIME_LOG + " ON DUPLICATE KEY UPDATE log_ref=log_ref"
+
+
+def new_log_ref(log_date, task_id, employ_id):
+    """A unique log_ref for a time log entered in the application, in the form the imports use."""
+    return f"{str(log_date).replace('-', '')}-{task_id}-{employ_id}-{uuid.uuid4().hex}"
+
+
+class ImportResult:
+    """Outcome of one import: rows written, rejected lines and the error that stopped it, if any."""
+
+    def __init__(self):
+        self.imported = 0
+        self.rejected = []  # (line number, reason)
+        self.error = None
+
+
+class NameResolver:
+    """
+    Resolves the client, project, task and employee cells of a timesheet to ids using the
+    LookupCache rows. A cell may hold the id, the name, or the "Name (id)" form the dropdowns
+    show; projects are matched within their client and tasks within their project.
+    Build it on the Tk thread, then use it from any thread.
+    """
+
+    def __init__(self, lookups):
+        self.clients = self._index(lookups.rows('client'))
+        self.employs = self._index(lookups.rows('employ'))
+        self.projects = self._index(lookups.rows('project'), scoped=True)
+        self.tasks = self._index(lookups.rows('task'), scoped=True)
+
+    @staticmethod
+    def _index(rows, scoped=False):
+        index = {}
+        for r in rows:
+            scope = str(r[2]) if scoped else None
+            for text in (str(r[0]), str(r[1]), f"{r[1]} ({r[0]})"):
+                index.setdefault((scope, text.strip().casefold()), str(r[0]))
+        return index
+
+    @staticmethod
+    def _find(index, what, text, scope=None):
+        found = index.get((scope, text.strip().casefold()))
+        if found is None:
+            raise ValueError(f"unknown {what} '{text}'")
+        return found
+
+    def parse(self, row, log_ref_suffix):
+        """Returns the INSERT parameters for one CSV row, or raises ValueError with the reason."""
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            raise ValueError(f"empty {', '.join(missing)}")
+        log_date = None
+        for fmt in DATE_FORMATS:
+            try:
+                log_date = datetime.strptime(row['date'], fmt).strftime('%Y-%m-%d')
+                break
+            except ValueError:
+                pass
+        if log_date is None:
+            raise ValueError(f"invalid date '{row['date']}'")
+        try:
+            hours = float(row['hours'])
+        except ValueError:
+            raise ValueError(f"hours '{row['hours']}' is not a number")
+        if not 0 < hours < 1000:
+            raise ValueError(f"hours {hours} out of range")
+        cid = self._find(self.clients, 'client', row['client'])
+        pno = self._find(self.projects, 'project', row['project'], cid)
+        tid = self._find(self.tasks, 'task', row['task'], pno)
+        eid = self._find(self.employs, 'employee', row['employee'])
+        # log_ref keeps the legacy string id, so an imported line can be traced back to its file
+        log_ref = f"{log_date.replace('-','')}-{tid}-{eid}-{log_ref_suffix}"
+        return (log_ref, log_date, cid, pno, tid, eid, hours, row.get('notes') or None)
+
+
+def line_ref(line, raw):
+    """The log_ref suffix of a CSV line: its number and a digest of its cells, the same on every import."""
+    digest = hashlib.sha1("\x1f".join(str(v) for v in raw.values()).encode('utf-8')).hexdigest()[:12]
+    return f"{digest}-{line}"
+
+
+def read_time_logs(path, resolver, result):
+    """Streams (line number, INSERT parameters) from a CSV file, recording rejected lines in result."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        headers = {(h or '').strip().lower() for h in reader.fieldnames or ()}
+        missing = [c for c in REQUIRED_COLUMNS if c not in headers]
+        if missing:
+            raise ValueError(f"CSV file is missing column(s): {', '.join(missing)}")
+        for line, raw in enumerate(reader, start=2):
+            row = {(k or '').strip().lower(): (v or '').strip() for k, v in raw.items() if isinstance(v, str)}
+            try:
+                values = resolver.parse(row, line_ref(line, raw))
+            except ValueError as e:
+                result.rejected.append((line, str(e)))
+                continue
+            yield line, values
+
+
+
+def import_time_logs(path, resolver, batch_size=BATCH_SIZE):
+    """
+    Returns a unit of work for QueryExecutor that loads a timesheet CSV into time_log.
+    Rows are inserted batch_size at a time with executemany (sent as one multi-row INSERT)
+    and committed per batch, so memory stays flat and a failure keeps the earlier batches.
+    A batch the server refuses is retried row by row and the refused lines are rejected.
+    """
+    def work(cursor):
+        result = ImportResult()
+        batch = []
+        try:
+            for line, values in read_time_logs(path, resolver, result):
+                batch.append((line, values))
+                if len(batch) >= batch_size:
+                    _insert_batch(cursor, batch, result)
+            _insert_batch(cursor, batch, result)
+        except (mysql.connector.Error, OSError, ValueError, csv.Error) as e:
+            result.error = str(e)
+        result.rejected.sort()  # refused batches are reported after the lines that failed to parse
+        return result
+    return work
+
+
+def _insert_batch(cursor, batch, result):
+    if not batch:
+        return
+    try:
+        cursor.executemany(IMPORT_TIME_LOGS, [values for _, values in batch])
+        cursor.execute("COMMIT")
+        result.imported += len(batch)
+    except (mysql.connector.IntegrityError, mysql.connector.DataError):
+        # A row the server refuses (e.g. its task was deleted meanwhile) must not hold back the rest
+        cursor.execute("ROLLBACK")
+        _insert_singly(cursor, batch, result)
+    except mysql.connector.Error:
+        cursor.execute("ROLLBACK")
+        raise
+    batch.clear()
+
+
+def _insert_singly(cursor, batch, result):
+    for line, values in batch:
+        try:
+            cursor.execute(IMPORT_TIME_LOGS, values)
+            cursor.execute("COMMIT")
+            result.imported += 1
+        except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+            cursor.execute("ROLLBACK")
+            result.rejected.append((line, str(e)))
@@ -0,0 +1,103 @@
+# tree_model.py
+
+
+class TreeModel:
+    """
+    Row-keyed model of a plain Treeview. Each item's iid is derived from its row's primary
+    key, so one inserted, updated or deleted row is applied to the widget in place; the
+    other items are left alone and keep their selection and scroll position.
+
+    With a KeysetPager the rows are ordered like the pager's query and a row that sorts
+    outside the current page is dropped rather than shown.
+    """
+
+    def __init__(self, tree, key_index=0, sort_key=None, descending=False,
+                 format_row=tuple, pager=None, striped=False):
+        self.tree = tree
+        self.key_index = key_index
+        self.pager = pager
+        self.sort_key = sort_key or (pager.sort_key if pager else (lambda row: row[key_index]))
+        self.descending = pager.descending if pager else descending
+        self.format_row = format_row
+        self.striped = striped
+        self._rows = {}
+
+    def iid(self, key):
+        # Prefixed so keys never collide with Tk's generated "I001"-style iids.
+        return f"row:{key}"
+
+    def rows(self):
+        """The shown rows in display order."""
+        return [self._rows[i] for i in self.tree.get_children() if i in self._rows]
+
+    def load(self, rows):
+        """Shows exactly rows, reusing items whose key is already present."""
+        wanted = {self.iid(row[self.key_index]): row for row in rows}
+        for iid in self.tree.get_children():
+            if iid not in wanted:
+                self.tree.delete(iid)
+        for index, (iid, row) in enumerate(wanted.items()):
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self.format_row(row))
+                self.tree.move(iid, '', index)
+            else:
+                self.tree.insert('', index, iid=iid, values=self.format_row(row))
+        self._rows = wanted
+        self._restripe()
+
+    def upsert(self, row):
+        """Inserts row at its sorted position or updates it in place; returns False if it belongs to another page."""
+        iid = self.iid(row[self.key_index])
+        key = self.sort_key(row)
+        others = [self.sort_key(self._rows[i]) for i in self.tree.get_children() if i in self._rows and i != iid]
+        index = next((n for n, k in enumerate(others) if self._after(k, key)), len(others))
+        if self._off_page(key):
+            self.remove(row[self.key_index])
+            return False
+        self._rows[iid] = row
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self.format_row(row))
+            self.tree.move(iid, '', index)
+        else:
+            self.tree.insert('', index, iid=iid, values=self.format_row(row))
+        self._restripe()
+        return True
+
+    def _after(self, a, b):
+        """Whether sort key a comes after b in display order."""
+        return a < b if self.descending else a > b
+
+    def _off_page(self, key):
+        # Only a row strictly outside the page's bounds belongs to a neighbouring page; one that
+        # sorts first or last among the shown rows but within the bounds stays.
+        pager = self.pager
+        if pager is None:
+            return False
+        return ((pager.has_prev and pager.first_key is not None and self._after(pager.first_key, key)) or
+                (pager.has_next and pager.last_key is not None and self._after(key, pager.last_key)))
+
+    def remove(self, key):
+        iid = self.iid(key)
+        self._rows.pop(iid, None)
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+            self._restripe()
+
+    def apply(self, key, row):
+        """Applies the current database row for key; row is None when it was deleted or no longer matches."""
+        if row is None:
+            self.remove(key)
+        else:
+            self.upsert(row)
+
+    def refresh(self, cursor, column, key):
+        """Re-reads the row whose column equals key through the pager's filter and applies it."""
+        sql, params = self.pager.row_query(column, key)
+        cursor.execute(sql, params)
+        self.apply(key, cursor.fetchone())
+
+    def _restripe(self):
+        if not self.striped:
+            return
+        for n, iid in enumerate(self.tree.get_children()):
+            self.tree.item(iid, tags=('evenrow' if n % 2 == 0 else 'oddrow',))
@@ -0,0 +1,278 @@
+# virtual_tree.py
+
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+BLOCK_SIZE = 200
+MAX_CACHED_BLOCKS = 20
+PLACEHOLDER = "..."
+FETCH_DELAY_MS = 60
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Treeview that can scroll through millions of rows while only materializing the
+    rows in its viewport. After set_source() the widget keeps one item per visible
+    line and rewrites their values as the user scrolls; rows are pulled in blocks
+    through the fetch callback and kept in a small LRU cache. clear_source() turns
+    it back into an ordinary Treeview.
+    """
+
+    def __init__(self, master, **kw):
+        super().__init__(master, **kw)
+        self._scrollbar = None
+        self._source = None
+        self._generation = 0
+        self._total = 0
+        self._first = 0
+        self._slots = []
+        self._selected_index = None
+        self._rendered_first = 0        # _first and the selected slot as of the last _render()
+        self._rendered_selection = None
+        self._blocks = OrderedDict()
+        self._stale = set()  # cached blocks shown until reload() has fetched them again
+        self._requested = set()
+        self._fetch_after = None
+        self.bind('<Configure>', lambda e: self._render(), add='+')
+        self.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.bind('<MouseWheel>', self._on_wheel, add='+')
+        self.bind('<Button-4>', lambda e: self._scroll_by(-3), add='+')
+        self.bind('<Button-5>', lambda e: self._scroll_by(3), add='+')
+        for key, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', 'page-'), ('<Next>', 'page+'),
+                          ('<Home>', 'home'), ('<End>', 'end')):
+            self.bind(key, lambda e, s=step: self._on_key(s), add='+')
+
+    # --- Public API ---
+    def attach_scrollbar(self, scrollbar):
+        """Connects a vertical scrollbar that works in both plain and virtual mode."""
+        self._scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+        self.configure(yscrollcommand=self._on_native_scroll)
+
+    def set_source(self, total, fetch_block, format_row):
+        """
+        Switches to virtual mode over total rows. fetch_block(offset, limit, previous_row, deliver, fail)
+        must eventually call deliver(rows), or fail() if the fetch did not succeed, on the Tk thread;
+        previous_row is the last row of the preceding block when it is cached, so the caller can
+        seek instead of using OFFSET.
+        """
+        self.clear_source()
+        self._source = (fetch_block, format_row)
+        self._total = total
+        self._render()
+
+    def clear_source(self):
+        """Leaves virtual mode and empties the widget."""
+        self._generation += 1
+        self._source = None
+        self._total = 0
+        self._first = 0
+        self._selected_index = None
+        self._rendered_first = 0
+        self._rendered_selection = None
+        self._blocks.clear()
+        self._stale.clear()
+        self._requested.clear()
+        if self._fetch_after is not None:
+            self.after_cancel(self._fetch_after)
+            self._fetch_after = None
+        self._slots = []
+        for i in self.get_children():
+            self.delete(i)
+
+    def is_virtual(self):
+        return self._source is not None
+
+    def row_count(self):
+        return self._total
+
+    def replace_row(self, match, row):
+        """Replaces the cached row for which match(row) is true, keeping its place; returns False if none is cached."""
+        for block in self._blocks.values():
+            for n, cached in enumerate(block):
+                if match(cached):
+                    block[n] = row
+                    self._render()
+                    return True
+        return False
+
+    def reload(self, total=None):
+        """
+        Fetches the rows in view again after rows were written, optionally with a new total,
+        keeping the scroll position and selection. The cached rows stay on screen until
+        their replacements arrive.
+        """
+        if self._source is None:
+            return
+        self._generation += 1  # results of fetches already under way may predate the write
+        self._requested.clear()
+        self._stale = set(self._blocks)
+        if total is not None:
+            self._total = total
+        self._render()
+
+    def yview(self, *args):
+        if self._source is None:
+            return super().yview(*args)
+        if not args:
+            return self._fractions()
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * self._total)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self._first += amount * self._visible_count() if args[2] == 'pages' else amount
+        self._render()
+
+    # --- Internals ---
+    def _on_native_scroll(self, first, last):
+        if self._source is None and self._scrollbar is not None:
+            self._scrollbar.set(first, last)
+
+    def _fractions(self):
+        if not self._total:
+            return 0.0, 1.0
+        return self._first / self._total, min(1.0, (self._first + self._visible_count()) / self._total)
+
+    def _visible_count(self):
+        style = ttk.Style()
+        row_height = int(style.lookup(self.cget('style') or 'Treeview', 'rowheight') or 20)
+        header = row_height
+        if self._slots:
+            box = self.bbox(self._slots[0])
+            if box:
+                header = box[1]
+        return max(1, (self.winfo_height() - header) // row_height)
+
+    def _on_wheel(self, event):
+        if self._source is None:
+            return None
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def _scroll_by(self, rows):
+        if self._source is None:
+            return None
+        self._first += rows
+        self._render()
+        return 'break'
+
+    def _on_key(self, step):
+        if self._source is None or not self._total:
+            return None
+        visible = self._visible_count()
+        current = self._selected_index if self._selected_index is not None else self._first
+        if step == 'page-':
+            target = current - visible
+        elif step == 'page+':
+            target = current + visible
+        elif step == 'home':
+            target = 0
+        elif step == 'end':
+            target = self._total - 1
+        else:
+            target = current + step
+        target = max(0, min(self._total - 1, target))
+        if target < self._first:
+            self._first = target
+        elif target >= self._first + visible:
+            self._first = target - visible + 1
+        self._selected_index = target
+        self._render()
+        return 'break'
+
+    def _on_select(self, event):
+        if self._source is None:
+            return
+        self._sync_selection()
+
+    def _sync_selection(self):
+        # A selection other than the one the last render made came from the user (a click, or
+        # the class bindings), so it names the row shown in that slot at that render.
+        sel = self.selection()
+        if sel and sel[0] in self._slots:
+            if sel[0] != self._rendered_selection:
+                self._selected_index = self._rendered_first + self._slots.index(sel[0])
+        elif self._rendered_selection is not None:
+            self._selected_index = None
+
+    def _render(self):
+        if self._source is None:
+            return
+        self._sync_selection()  # before the slots are rewritten, without relying on our binding
+        visible = self._visible_count()
+        self._first = max(0, min(self._first, self._total - visible))
+        count = min(visible, self._total)
+        while len(self._slots) < count:
+            self._slots.append(self.insert("", tk.END, values=()))
+        while len(self._slots) > count:
+            self.delete(self._slots.pop())
+
+        _, format_row = self._source
+        for n, slot in enumerate(self._slots):
+            row = self._row_at(self._first + n)
+            self.item(slot, values=format_row(row) if row is not None else (PLACEHOLDER,))
+
+        selected = None
+        if self._selected_index is not None and self._first <= self._selected_index < self._first + count:
+            selected = self._slots[self._selected_index - self._first]
+        if selected is None and self.selection():
+            self.selection_set(())
+        elif selected is not None and self.selection() != (selected,):
+            self.selection_set(selected)
+            self.see(selected)
+        self._rendered_first = self._first
+        self._rendered_selection = selected
+
+        if self._scrollbar is not None:
+            self._scrollbar.set(*self._fractions())
+        # Fetch only once scrolling settles, so dragging the scrollbar does not queue a query per step.
+        if self._fetch_after is not None:
+            self.after_cancel(self._fetch_after)
+        self._fetch_after = self.after(FETCH_DELAY_MS, self._fetch_visible)
+
+    def _fetch_visible(self):
+        self._fetch_after = None
+        if self._source is None:
+            return
+        visible = self._visible_count()
+        # Keep a one-screen buffer loaded above and below the viewport.
+        for index in (self._first - visible, self._first, self._first + visible, self._first + 2 * visible):
+            if 0 <= index < self._total:
+                self._request_block(index // BLOCK_SIZE)
+
+    def _row_at(self, index):
+        block = self._blocks.get(index // BLOCK_SIZE)
+        if block is None:
+            return None
+        self._blocks.move_to_end(index // BLOCK_SIZE)
+        offset = index % BLOCK_SIZE
+        return block[offset] if offset < len(block) else None
+
+    def _request_block(self, number):
+        if (number in self._blocks and number not in self._stale) or number in self._requested:
+            return
+        self._requested.add(number)
+        # A stale block's last row may no longer end the block before this one
+        previous = self._blocks.get(number - 1) if number - 1 not in self._stale else None
+        previous_row = previous[-1] if previous else None
+        generation = self._generation
+        fetch_block, _ = self._source
+        fetch_block(number * BLOCK_SIZE, BLOCK_SIZE, previous_row,
+                    lambda rows: self._block_loaded(generation, number, rows),
+                    lambda: self._block_failed(generation, number))
+
+    def _block_failed(self, generation, number):
+        # Requested again the next time it is scrolled into view
+        if generation == self._generation:
+            self._requested.discard(number)
+
+    def _block_loaded(self, generation, number, rows):
+        if generation != self._generation:
+            return
+        self._requested.discard(number)
+        self._stale.discard(number)
+        self._blocks[number] = list(rows)
+        while len(self._blocks) > MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        self._render()
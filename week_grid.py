@@ -0,0 +1,226 @@
+# week_grid.py
+
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from tkinter import ttk
+
+import mysql.connector
+
+from timelog_import import INSERT_TIME_LOG, new_log_ref
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MAX_DAY_HOURS = Decimal(24)
+_CENTS = Decimal("0.01")  # time_log.hours is DECIMAL(5,2)
+# Updates and deletes only match the hours the grid loaded, so a log changed elsewhere is never overwritten.
+UPDATE_HOURS = "UPDATE time_log SET hours=%s WHERE log_id=%s AND hours=%s"
+DELETE_LOG = "DELETE FROM time_log WHERE log_id=%s AND hours=%s"
+
+
+class StaleWeekError(Exception):
+    """A log in the week was changed or deleted elsewhere after the grid loaded it."""
+
+
+def week_start(day):
+    """The Monday of day's week."""
+    return day - timedelta(days=day.weekday())
+
+
+def parse_hours(text):
+    """The hours typed into a cell (0 when empty) to two places; raises ValueError."""
+    text = text.strip()
+    if not text:
+        return Decimal(0)
+    try:
+        hours = Decimal(text).quantize(_CENTS)
+    except InvalidOperation:
+        hours = None
+    if hours is None or not hours.is_finite():
+        raise ValueError(f"'{text}' is not a number")
+    if not 0 <= hours <= MAX_DAY_HOURS:
+        raise ValueError(f"{text} hours is not between 0 and {MAX_DAY_HOURS}")
+    return hours
+
+
+def format_hours(hours):
+    return f"{hours:.2f}".rstrip('0').rstrip('.') if hours else ""
+
+
+class WeekSheet:
+    """
+    One employee's time logs for one week, as cells of (task_id, day index) -> [(log_id, hours)].
+    A cell with several logs shows their total and cannot be edited in the grid; diff() turns
+    the hours of the other cells into the inserts, updates and deletes that store them.
+    """
+
+    def __init__(self, employ_id, monday, rows=()):
+        self.employ_id = employ_id
+        self.monday = monday
+        self.cells = {}
+        self.tasks = {}  # task_id -> (client_id, project_no), in the order the rows appear
+        for log_id, log_date, task_id, hours, client_id, project_no in rows:
+            self.add_task(task_id, client_id, project_no)
+            self.cells.setdefault((task_id, (log_date - monday).days), []).append((log_id, hours))
+
+    def add_task(self, task_id, client_id, project_no):
+        """Adds a row for task_id; returns False if the week already has one."""
+        if task_id in self.tasks:
+            return False
+        self.tasks[task_id] = (client_id, project_no)
+        return True
+
+    def day(self, index):
+        return self.monday + timedelta(days=index)
+
+    def hours(self, task_id, index):
+        return sum((hours for _, hours in self.cells.get((task_id, index), ())), Decimal(0))
+
+    def is_locked(self, task_id, index):
+        # Logs without a task cannot take new hours either
+        return task_id is None or len(self.cells.get((task_id, index), ())) > 1
+
+    def diff(self, hours):
+        """
+        Compares hours, {(task_id, day index): Decimal} for the editable cells, with the loaded
+        logs. Returns (inserts, updates, deletes): (client_id, project_no, task_id, date, hours),
+        (log_id, old hours, new hours) and (log_id, old hours).
+        """
+        inserts, updates, deletes = [], [], []
+        for (task_id, index), new in hours.items():
+            logs = self.cells.get((task_id, index), [])
+            if not logs:
+                if new:
+                    inserts.append(self.tasks[task_id] + (task_id, self.day(index), new))
+            elif len(logs) == 1:
+                log_id, old = logs[0]
+                if not new:
+                    deletes.append((log_id, old))
+                elif new != old:
+                    updates.append((log_id, old, new))
+        return inserts, updates, deletes
+
+
+def save_week(employ_id, inserts, updates, deletes):
+    """
+    Returns a unit of work for QueryExecutor that applies a WeekSheet.diff() in one
+    transaction: the inserts go as one multi-row INSERT. If any log changed since the week
+    was loaded, nothing is written and StaleWeekError is raised.
+    """
+    def work(cursor):
+        try:
+            for log_id, old, new in updates:
+                cursor.execute(UPDATE_HOURS, (new, log_id, old))
+                if cursor.rowcount != 1:
+                    raise StaleWeekError(f"time log {log_id} was changed elsewhere")
+            for log_id, old in deletes:
+                cursor.execute(DELETE_LOG, (log_id, old))
+                if cursor.rowcount != 1:
+                    raise StaleWeekError(f"time log {log_id} was changed elsewhere")
+            if inserts:
+                cursor.executemany(INSERT_TIME_LOG, [
+                    (new_log_ref(day, task_id, employ_id), day, client_id, project_no, task_id, employ_id, hours, None)
+                    for client_id, project_no, task_id, day, hours in inserts])
+            cursor.execute("COMMIT")
+        except (mysql.connector.Error, StaleWeekError):
+            cursor.execute("ROLLBACK")
+            raise
+        return len(inserts) + len(updates) + len(deletes)
+    return work
+
+
+class WeekGrid(ttk.Frame):
+    """
+    Spreadsheet-like entry for a WeekSheet: a row per task with an entry per day, and the
+    row and day totals kept current while typing. Tab moves along the row.
+    """
+
+    def __init__(self, master, task_label, **kw):
+        super().__init__(master, **kw)
+        self.task_label = task_label  # task_id -> row heading
+        self.sheet = None
+        self._entries = {}  # (task_id, day index) -> editable Entry
+        self._loaded = {}   # (task_id, day index) -> text shown when loaded
+        self._row_totals = {}
+        self._day_totals = []
+
+    def show(self, sheet):
+        self.sheet = sheet
+        self._build({})
+
+    def add_task(self, task_id, client_id, project_no):
+        """Adds an empty row for a task (keeping what was typed) and puts the cursor in it."""
+        if self.sheet is None:
+            return
+        if self.sheet.add_task(task_id, client_id, project_no):
+            self._build({key: e.get() for key, e in self._entries.items()})
+        entry = self._entries.get((task_id, 0))
+        if entry is not None:
+            entry.focus_set()
+
+    def _build(self, texts):
+        for child in self.winfo_children():
+            child.destroy()
+        self._entries, self._loaded, self._row_totals = {}, {}, {}
+        sheet = self.sheet
+        ttk.Label(self, text="Task", font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky='w', padx=5)
+        for i, name in enumerate(DAYS):
+            ttk.Label(self, text=f"{name} {sheet.day(i):%m-%d}", font=('Segoe UI', 10, 'bold'))\
+                .grid(row=0, column=i + 1, padx=2)
+        ttk.Label(self, text="Total", font=('Segoe UI', 10, 'bold')).grid(row=0, column=8, padx=5)
+        for row, task_id in enumerate(sheet.tasks, start=1):
+            ttk.Label(self, text=self.task_label(task_id)).grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            for i in range(len(DAYS)):
+                entry = ttk.Entry(self, width=7, justify='right')
+                entry.grid(row=row, column=i + 1, padx=2, pady=2)
+                loaded = format_hours(sheet.hours(task_id, i))
+                entry.insert(0, texts.get((task_id, i), loaded))
+                if sheet.is_locked(task_id, i):
+                    entry.configure(state='readonly', takefocus=0)
+                else:
+                    entry.bind("<KeyRelease>", lambda e: self._update_totals())
+                    self._entries[(task_id, i)] = entry
+                    self._loaded[(task_id, i)] = loaded
+            self._row_totals[task_id] = ttk.Label(self, width=7, anchor='e')
+            self._row_totals[task_id].grid(row=row, column=8, padx=5)
+        total_row = len(sheet.tasks) + 1
+        ttk.Label(self, text="Total", font=('Segoe UI', 10, 'bold')).grid(row=total_row, column=0, sticky='w', padx=5)
+        self._day_totals = []
+        for i in range(len(DAYS) + 1):
+            label = ttk.Label(self, width=7, anchor='e', font=('Segoe UI', 10, 'bold'))
+            label.grid(row=total_row, column=i + 1, padx=2)
+            self._day_totals.append(label)
+        self._update_totals()
+
+    def _cell_hours(self, task_id, index):
+        entry = self._entries.get((task_id, index))
+        if entry is None:
+            return self.sheet.hours(task_id, index)
+        try:
+            hours = parse_hours(entry.get())
+            entry.configure(foreground='')
+        except ValueError:
+            hours = Decimal(0)
+            entry.configure(foreground='red')
+        return hours
+
+    def _update_totals(self):
+        days = [Decimal(0)] * len(DAYS)
+        for task_id in self.sheet.tasks:
+            row = [self._cell_hours(task_id, i) for i in range(len(DAYS))]
+            days = [a + b for a, b in zip(days, row)]
+            self._row_totals[task_id].configure(text=f"{sum(row):.2f}")
+        for label, total in zip(self._day_totals, days + [sum(days)]):
+            label.configure(text=f"{total:.2f}")
+
+    def changed(self):
+        return any(e.get().strip() != self._loaded[key] for key, e in self._entries.items())
+
+    def hours(self):
+        """The hours of every editable cell; raises ValueError for the first invalid one, which gets the focus."""
+        result = {}
+        for (task_id, index), entry in self._entries.items():
+            try:
+                result[(task_id, index)] = parse_hours(entry.get())
+            except ValueError as e:
+                entry.focus_set()
+                raise ValueError(f"{self.task_label(task_id)}, {DAYS[index]}: {e}")
+        return result